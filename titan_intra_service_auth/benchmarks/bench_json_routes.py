@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: CPU por request do codec JSON das rotas de mint.
+Compara o handler anterior (request.json() → dict + .get(); dict devolvido passa pelo
+jsonable_encoder/JSONResponse) com o atual (read_json com teto → dataclass tipada;
+json_response com bytes prontos). O use case é um stub que devolve um token fixo, então
+a diferença medida é só parse + validação + serialização + roteamento.
+Chama o app ASGI direto (sem httpx nem rede) e mede time.process_time por request.
+
+Uso:
+  python benchmarks/bench_json_routes.py [requests]
+
+Elias Andrade — Replika AI Solutions
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_SRC_DIR = os.path.join(_THIS_DIR, "..", "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+
+from titan_intra_service_auth.application.dtos.mint_request import MintRequestDTO
+from titan_intra_service_auth.application.dtos.mint_response import MintResponseDTO
+from titan_intra_service_auth.infrastructure.http.routes.auth_routes import register_auth_routes
+from titan_intra_service_auth.infrastructure.observability import create_local_metrics_adapter
+
+# Token ES256 de tamanho real (~480 bytes)
+_TOKEN = "eyJhbGciOiJFUzI1NiIsInR5cCI6IkpXVCJ9." + "e" * 350 + "." + "s" * 86
+
+
+class _StubMintUseCase:
+    async def execute(self, dto: MintRequestDTO) -> MintResponseDTO:
+        return MintResponseDTO(access_token=_TOKEN, token_type="Bearer", expires_in_seconds=86400, engine_version="6.0.0-DDD")
+
+
+def _register_legacy_auth_routes(router: APIRouter, use_case, metrics) -> None:
+    """Handler anterior (baseline do benchmark)."""
+
+    @router.post("/v6/auth/mint", status_code=201)
+    async def mint_token(request: Request):
+        try:
+            body = await request.json()
+            dto = MintRequestDTO(
+                user=body.get("user", "guest_user"),
+                scope=body.get("scope"),
+                entropy=body.get("entropy"),
+            )
+            response_dto = await use_case.execute(dto)
+            return {
+                "access_token": response_dto.access_token,
+                "token_type": response_dto.token_type,
+                "expires_in": response_dto.expires_in_seconds,
+                "engine": response_dto.engine_version,
+            }
+        except Exception as e:
+            metrics.record_mint_failure()
+            raise HTTPException(status_code=422, detail=f"Minting Failure: {str(e)}")
+
+
+def _build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+    router = APIRouter()
+    metrics = create_local_metrics_adapter("bench", 1)
+    register = _register_legacy_auth_routes if legacy else register_auth_routes
+    register(router, _StubMintUseCase(), metrics)
+    app.include_router(router)
+    return app
+
+
+async def _call(app: FastAPI, body: bytes) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/v6/auth/mint",
+        "raw_path": b"/v6/auth/mint",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _bench(app: FastAPI, n: int, body: bytes) -> float:
+    for _ in range(200):
+        assert await _call(app, body) == 201
+    t0 = time.process_time()
+    for _ in range(n):
+        await _call(app, body)
+    return (time.process_time() - t0) / n * 1_000_000
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    body = json.dumps({"user": "svc-payments", "scope": "access_root", "entropy": "a1b2c3d4"}).encode()
+    legacy_us = asyncio.run(_bench(_build_app(True), n, body))
+    current_us = asyncio.run(_bench(_build_app(False), n, body))
+
+    print(f"requests: {n}  (POST /v6/auth/mint, use case stub)")
+    print(f"anterior (request.json + dict):      {legacy_us:>8.1f} us CPU/request")
+    print(f"atual (read_json + json_response):   {current_us:>8.1f} us CPU/request")
+    print(f"economia:                            {legacy_us - current_us:>8.1f} us/request ({(1 - current_us / legacy_us) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
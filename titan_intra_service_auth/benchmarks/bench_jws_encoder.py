@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark: assinaturas ES256 por segundo por core.
+Compara EcdsaSignerAdapter legado (jwt.encode com PEM) vs fast path (Es256JwsEncoder)
+e confere que os tokens do fast path verificam no PyJWT.
+
+Uso:
+  python benchmarks/bench_jws_encoder.py [iteracoes]
+
+Elias Andrade — Replika AI Solutions
+"""
+
+import os
+import sys
+import time
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_SRC_DIR = os.path.join(_THIS_DIR, "..", "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+import jwt
+
+from titan_intra_service_auth.domain import TokenMintingDomainService
+from titan_intra_service_auth.infrastructure.crypto import EcdsaSignerAdapter
+
+
+def _bench(adapter: EcdsaSignerAdapter, payloads) -> float:
+    t0 = time.perf_counter()
+    for p in payloads:
+        adapter.sign(p)
+    return len(payloads) / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    domain = TokenMintingDomainService(issuer="titan-intra-service-auth-v6", exp_hours=24)
+    payloads = [domain.build_claim(user=f"svc-{i % 200}").to_jwt_payload() for i in range(n)]
+
+    legacy = EcdsaSignerAdapter(fast_path=False)
+    fast = EcdsaSignerAdapter(fast_path=True)
+
+    # Compatibilidade: PyJWT verifica o token do fast path com a chave pública
+    token = fast.sign(payloads[0])
+    claims = jwt.decode(token, fast.public_key_pem, algorithms=["ES256"], options={"verify_aud": False})
+    assert claims["sub"] == payloads[0]["sub"] and claims["jti"] == payloads[0]["jti"]
+    assert jwt.get_unverified_header(token) == jwt.get_unverified_header(legacy.sign(payloads[0]))
+
+    _bench(legacy, payloads[:200])
+    _bench(fast, payloads[:200])
+    legacy_ops = _bench(legacy, payloads)
+    fast_ops = _bench(fast, payloads)
+
+    print(f"iteracoes:           {n}")
+    print(f"legado (jwt.encode): {legacy_ops:>10.0f} assinaturas/s/core")
+    print(f"fast path ES256:     {fast_ops:>10.0f} assinaturas/s/core")
+    print(f"ganho:               {fast_ops / legacy_ops:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
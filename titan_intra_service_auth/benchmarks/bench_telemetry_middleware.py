@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: TelemetryMiddleware ASGI puro vs implementação anterior (BaseHTTPMiddleware).
+Mede requests/s in-process (httpx + ASGITransport, sem rede) em /health e /v6/zkp/mint.
+No mint, challenges e assinaturas ZKP são preparados antes da medição.
+
+Uso:
+  python benchmarks/bench_telemetry_middleware.py [requests] [concorrencia]
+
+Elias Andrade — Replika AI Solutions
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_SRC_DIR = os.path.join(_THIS_DIR, "..", "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+# CA descartável: não toca data/ca_zkp.db
+_TMP_DIR = tempfile.mkdtemp(prefix="titan-bench-")
+os.environ.setdefault("TITAN_CA_DB_PATH", os.path.join(_TMP_DIR, "ca.db"))
+os.environ.setdefault("TITAN_CHALLENGE_STORE", "memory")
+
+import httpx
+from fastapi import Request
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from titan_intra_service_auth.infrastructure.http.fastapi_app import build_app_for_worker
+from titan_intra_service_auth.infrastructure.http.middleware import TelemetryMiddleware
+from titan_intra_service_auth.infrastructure.zkp_client import generate_identity_keys, sign_nonce
+
+
+class _BaseHTTPTelemetryMiddleware(BaseHTTPMiddleware):
+    """Implementação anterior (baseline do benchmark)."""
+
+    async def dispatch(self, request: Request, call_next):
+        metrics = getattr(request.app.state, "metrics", None)
+        if not metrics:
+            return await call_next(request)
+        rid = str(uuid.uuid4())[:8]
+        t_start = time.perf_counter()
+        metrics.increment_active_connections()
+        try:
+            response = await call_next(request)
+            sc = response.status_code
+            duration_ms = (time.perf_counter() - t_start) * 1000
+            status_class = "2xx" if sc < 400 else ("4xx" if sc < 500 else "5xx")
+            metrics.record_http_request(status_class=status_class, latency_ms=duration_ms)
+            metrics.decrement_active_connections()
+            if response.headers.get("x-request-id") is None:
+                response.headers["X-Request-ID"] = rid
+            if "X-Engine-Lat" not in response.headers:
+                response.headers["X-Engine-Lat"] = f"{duration_ms:.2f}ms"
+            return response
+        except Exception:
+            metrics.record_http_request(status_class="5xx", latency_ms=(time.perf_counter() - t_start) * 1000)
+            metrics.decrement_active_connections()
+            raise
+
+
+def _build_app(legacy: bool):
+    app = build_app_for_worker()
+    if legacy:
+        app.user_middleware = [
+            Middleware(_BaseHTTPTelemetryMiddleware) if m.cls is TelemetryMiddleware else m
+            for m in app.user_middleware
+        ]
+    return app
+
+
+async def _run(client: httpx.AsyncClient, requests, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(method, url, body):
+        async with sem:
+            r = await client.request(method, url, json=body)
+            assert r.status_code < 300, r.text
+            assert "x-request-id" in r.headers and "x-engine-lat" in r.headers
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(*req) for req in requests))
+    return len(requests) / (time.perf_counter() - t0)
+
+
+async def _bench(legacy: bool, n: int, concurrency: int):
+    app = _build_app(legacy)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        _, priv, pub = generate_identity_keys()
+        r = await client.post("/v6/zkp/identity", json={"pubkey_pem": pub})
+        identity_id = r.json()["identity_id"]
+
+        health_rps = await _run(client, [("GET", "/health", None)] * n, concurrency)
+
+        mints = []
+        for _ in range(n):
+            ch = (await client.get("/v6/zkp/challenge", params={"identity_id": identity_id})).json()
+            mints.append(("POST", "/v6/zkp/mint", {
+                "challenge_id": ch["challenge_id"],
+                "identity_id": identity_id,
+                "nonce": ch["nonce"],
+                "signature": sign_nonce(priv, ch["nonce"]),
+            }))
+        mint_rps = await _run(client, mints, concurrency)
+    return health_rps, mint_rps
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    asyncio.run(_bench(False, 200, concurrency))  # aquecimento
+    before = asyncio.run(_bench(True, n, concurrency))
+    after = asyncio.run(_bench(False, n, concurrency))
+
+    print(f"requests por rota: {n}  concorrencia: {concurrency}")
+    print(f"{'rota':<16}{'BaseHTTP (req/s)':>18}{'ASGI puro (req/s)':>20}{'ganho':>9}")
+    for name, b, a in (("/health", before[0], after[0]), ("/v6/zkp/mint", before[1], after[1])):
+        print(f"{name:<16}{b:>18.0f}{a:>20.0f}{a / b:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+🏛️ TITAN CA — Reconciliação dos contadores de identidades
+=========================================================
+Recalcula identity_counters (total / revogadas) com um scan completo da tabela
+identities. Os contadores são mantidos por triggers; use após restaurar backup,
+editar o banco à mão ou se o stats divergir de um COUNT(*).
+
+Uso:
+  python run_ca_reconcile.py
+
+Variáveis:
+  TITAN_CA_DB_PATH  (banco do CA; default data/ca_zkp.db)
+
+Criado por: Elias Andrade — Replika AI Solutions
+"""
+
+import os
+import sys
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_SRC_DIR = os.path.join(_THIS_DIR, "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from titan_intra_service_auth.infrastructure.ca.ca_repository import CARepository
+
+if __name__ == "__main__":
+    repo = CARepository(pool_size=1)
+    result = repo.reconcile_counters()
+    repo.close()
+    print(
+        f"[CA] identities total={result['total']} revoked={result['revoked']} "
+        f"(divergência corrigida: total {result['drift_total']:+d}, revoked {result['drift_revoked']:+d})"
+    )
@@ -3,6 +3,20 @@
 
 from .crypto_port import CryptoPort
 from .metrics_port import MetricsPort
-from .concurrency_port import ConcurrencyPort
+from .concurrency_port import ConcurrencyPort, OverloadedError
+from .challenge_store_port import ChallengeStorePort
+from .sign_batcher_port import SignBatcherPort
+from .stage_trace_port import StageTrace, mark_stage
+from .token_cache_port import TokenCachePort
 
-__all__ = ["CryptoPort", "MetricsPort", "ConcurrencyPort"]
+__all__ = [
+    "CryptoPort",
+    "MetricsPort",
+    "ConcurrencyPort",
+    "OverloadedError",
+    "ChallengeStorePort",
+    "SignBatcherPort",
+    "StageTrace",
+    "mark_stage",
+    "TokenCachePort",
+]
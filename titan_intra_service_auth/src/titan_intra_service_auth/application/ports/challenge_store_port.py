@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Port: ChallengeStorePort (Interface for ZKP challenge storage).
+Routes emit challenge_id -> (identity_id, nonce) and redeem it exactly once on mint.
+Implementations: in-process dict (1 worker) or shared store (N workers no mesmo host).
+put_many: lote de challenges de uma identity numa só aquisição de lock/transação, limitado
+pelos pendentes daquela identity.
+Elias Andrade — Replika AI Solutions
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+class ChallengeStorePort(ABC):
+    """
+    Interface for outstanding ZKP challenges.
+    pop() must be atomic pop-once: a challenge is redeemed by at most one request,
+    whichever worker process receives it. Expired challenges are never returned.
+    """
+
+    @abstractmethod
+    async def put(self, challenge_id: str, identity_id: str, nonce: str) -> None:
+        """Store a freshly issued challenge."""
+        ...
+
+    @abstractmethod
+    async def put_many(
+        self,
+        identity_id: str,
+        challenges: Sequence[Tuple[str, str]],
+        max_outstanding: int,
+    ) -> int:
+        """
+        Store (challenge_id, nonce) pairs for one identity in one lock/transaction, keeping at
+        most max_outstanding unexpired challenges for it. Return how many were stored (a prefix).
+        """
+        ...
+
+    @abstractmethod
+    async def pop(self, challenge_id: str) -> Optional[Tuple[str, str]]:
+        """Atomically remove and return (identity_id, nonce); None if unknown, used or expired."""
+        ...
+
+    @abstractmethod
+    async def sweep_expired(self) -> int:
+        """Remove expired challenges (background sweep); return how many were removed."""
+        ...
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Return store counters/gauges (for /stats endpoint)."""
+        ...
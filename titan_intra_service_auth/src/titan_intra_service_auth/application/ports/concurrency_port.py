@@ -11,6 +11,18 @@ from typing import Any, Callable, TypeVar
 T = TypeVar("T")
 
 
+class OverloadedError(Exception):
+    """
+    Raised by run_with_slot when admission control sheds the request instead of queueing it.
+    retry_after_sec: hint for the Retry-After header; reason: queue_full, queue_delay or queue_timeout.
+    """
+
+    def __init__(self, retry_after_sec: int, reason: str) -> None:
+        super().__init__(f"Overloaded ({reason}), retry after {retry_after_sec}s")
+        self.retry_after_sec = retry_after_sec
+        self.reason = reason
+
+
 class ConcurrencyPort(ABC):
     """
     Interface for running work with limited concurrency (e.g. semaphore + thread pool).
@@ -22,5 +34,6 @@ class ConcurrencyPort(ABC):
         """
         Acquire a concurrency slot, run fn (possibly in executor), return result.
         Used to cap concurrent mints and offload CPU-bound sign to threads.
+        May raise OverloadedError when the implementation sheds load (fail fast).
         """
         ...
@@ -6,16 +6,20 @@ Elias Andrade — Replika AI Solutions
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 
 class CryptoPort(ABC):
     """
     Interface for signing a JWT payload. Implementations: ECDSA ES256 (default), RSA (legado).
-    Single method (Interface Segregation).
+    Single method (Interface Segregation); sign_many tem default e pode ser especializado.
     """
 
     @abstractmethod
     def sign(self, payload: Dict[str, Any]) -> str:
         """Returns a signed JWT string (e.g. ES256, RS256)."""
         ...
+
+    def sign_many(self, payloads: List[Dict[str, Any]]) -> List[str]:
+        """Signs a batch in order (used by the mint batcher). Default: one sign() per payload."""
+        return [self.sign(p) for p in payloads]
@@ -6,7 +6,7 @@ Elias Andrade — Replika AI Solutions
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class MetricsPort(ABC):
@@ -16,8 +16,18 @@ class MetricsPort(ABC):
     """
 
     @abstractmethod
-    def record_http_request(self, status_class: str, latency_ms: float) -> None:
-        """Record an HTTP request (2xx/4xx/5xx) and latency."""
+    def record_http_request(
+        self,
+        status_class: str,
+        latency_ms: float,
+        active_connections: Optional[int] = None,
+        route: Optional[str] = None,
+    ) -> None:
+        """
+        Record an HTTP request (2xx/4xx/5xx) and latency.
+        active_connections (optional): in-flight gauge tracked by the caller, folded into the same update.
+        route (optional): route template (e.g. "POST /v6/zkp/mint") for per-route latency histograms.
+        """
         ...
 
     @abstractmethod
@@ -30,11 +40,32 @@ class MetricsPort(ABC):
         """Record a failed mint attempt (e.g. validation error)."""
         ...
 
+    @abstractmethod
+    def record_dropped_request(self) -> None:
+        """Record a request shed by admission control (q_dropped_reqs)."""
+        ...
+
+    @abstractmethod
+    def set_overloaded(self, lane: str, overloaded: bool) -> None:
+        """
+        Admission control state of a lane (e.g. "mint", "verify"); circuit_breaker reports
+        "OPEN" while any lane is shedding load.
+        """
+        ...
+
     @abstractmethod
     def get_snapshot(self) -> Dict[str, Any]:
         """Return a read-only snapshot of current metrics (for /stats endpoint)."""
         ...
 
+    def get_counters(self) -> Dict[str, Any]:
+        """
+        Cheap snapshot for scrapers (/metrics): counters and gauges, plus the overall latency
+        histogram under "latency_histogram" when available — no percentile reports.
+        Default: get_snapshot(); adapters override to skip the expensive parts.
+        """
+        return self.get_snapshot()
+
     @abstractmethod
     def increment_active_connections(self) -> int:
         """Increment active connections; return new total (for middleware)."""
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Port: SignBatcherPort (Interface for micro-batched token signing).
+Mint submits one payload and awaits its token; infrastructure groups concurrent
+submissions and signs them in a single executor task.
+Elias Andrade — Replika AI Solutions
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class SignBatcherPort(ABC):
+    """
+    Interface for a batching stage in front of CryptoPort.
+    submit(payload) resolves with the signed JWT of that payload (or raises its error).
+    """
+
+    @abstractmethod
+    async def submit(self, payload: Dict[str, Any]) -> str:
+        """Queue payload for the next batch and return its signed token."""
+        ...
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Return batch counters/histograms (for /stats endpoint)."""
+        ...
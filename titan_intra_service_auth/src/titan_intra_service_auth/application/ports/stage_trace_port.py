@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Port: StageTrace (per-request stage timings carried in a ContextVar).
+Infrastructure (telemetry middleware) opens a trace for sampled requests; use cases,
+routes and adapters call mark_stage(name) at stage boundaries. Each mark records the
+time since the previous mark (perf_counter_ns), so stages add up to the request time.
+Without an active trace mark_stage is a single ContextVar lookup.
+Elias Andrade — Replika AI Solutions
+"""
+
+from contextvars import ContextVar, Token
+from time import perf_counter_ns
+from typing import List, Optional, Tuple
+
+_CURRENT: ContextVar[Optional["StageTrace"]] = ContextVar("titan_stage_trace", default=None)
+
+
+class StageTrace:
+    """Ordered (stage, duration_ns) pairs of one request."""
+
+    __slots__ = ("stages", "_last_ns")
+
+    def __init__(self) -> None:
+        self.stages: List[Tuple[str, int]] = []
+        self._last_ns = perf_counter_ns()
+
+    def mark(self, stage: str) -> None:
+        """Close the current stage: duration = now - previous mark."""
+        now = perf_counter_ns()
+        self.stages.append((stage, now - self._last_ns))
+        self._last_ns = now
+
+
+def current_trace() -> Optional[StageTrace]:
+    return _CURRENT.get()
+
+
+def activate_trace(trace: StageTrace) -> Token:
+    """Bind trace to the current context (reset with deactivate_trace)."""
+    return _CURRENT.set(trace)
+
+
+def deactivate_trace(token: Token) -> None:
+    _CURRENT.reset(token)
+
+
+def clear_trace() -> None:
+    """Detach the current context (e.g. a task shared by many requests) from any trace."""
+    _CURRENT.set(None)
+
+
+def mark_stage(stage: str) -> None:
+    """Mark a stage boundary on the active trace (no-op when the request is not sampled)."""
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.mark(stage)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Port: TokenCachePort (Interface for reusing a recently minted token).
+Mint looks up (subject, scope) before signing; on a miss it signs and stores the new token.
+Infrastructure bounds the cache (size, age, remaining lifetime) and drops revoked subjects.
+Elias Andrade — Replika AI Solutions
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+
+class TokenCachePort(ABC):
+    """
+    Interface for a (subject, scope) → token cache in front of signing.
+    generation() is read before signing and passed back to store(): a token signed while
+    the subject was being invalidated is never cached.
+    """
+
+    @abstractmethod
+    def lookup(self, subject: str, scope: str) -> Optional[Tuple[str, int]]:
+        """Return (token, remaining lifetime in seconds) if a reusable token exists, else None."""
+        ...
+
+    @abstractmethod
+    def generation(self) -> int:
+        """Current invalidation generation (pass to store)."""
+        ...
+
+    @abstractmethod
+    def store(self, subject: str, scope: str, token: str, expires_at: int, generation: int) -> None:
+        """Cache token (JWT exp = expires_at, epoch seconds) unless invalidated since generation."""
+        ...
+
+    @abstractmethod
+    def invalidate_subject(self, subject: str) -> None:
+        """Drop every cached token of subject (revocation)."""
+        ...
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters (for /stats endpoint)."""
+        ...
@@ -3,16 +3,25 @@
 Use Case: MintTokenUseCase.
 Orchestrates domain + ports to produce a signed JWT (single responsibility, dependency inversion).
 Pipeline à prova de erro: timeout no slot libera semáforo; falha registrada em metrics.
+OverloadedError (controle de admissão) sobe sem contar como falha de mint — a rota responde 503.
+Estágios (request amostrado): claim_build, jwt_sign (na thread do executor) ou mint_batch.
+Com token_cache (opcional), repetição de (subject, scope) devolve o token recente sem assinar
+(estágio token_cache_hit; não conta em record_mint, que segue contando assinaturas).
 Elias Andrade — Replika AI Solutions
 """
 
 import asyncio
+from calendar import timegm
+from typing import Optional
 
 from ..dtos.mint_request import MintRequestDTO
 from ..dtos.mint_response import MintResponseDTO
-from ..ports.concurrency_port import ConcurrencyPort
+from ..ports.concurrency_port import ConcurrencyPort, OverloadedError
 from ..ports.crypto_port import CryptoPort
 from ..ports.metrics_port import MetricsPort
+from ..ports.sign_batcher_port import SignBatcherPort
+from ..ports.stage_trace_port import mark_stage
+from ..ports.token_cache_port import TokenCachePort
 from titan_intra_service_auth.domain import TokenMintingDomainService
 
 # Timeout por request no slot (falha rápida se crypto travar; cliente stress 60s)
@@ -23,6 +32,8 @@ class MintTokenUseCase:
     """
     Mint token use case: build claim (domain), acquire slot (concurrency), sign (crypto), record (metrics).
     Depends only on ports — no FastAPI, no multiprocessing.
+    Com batcher (opcional), a assinatura entra num micro-lote em vez de um slot próprio.
+    Com token_cache (opcional), a assinatura só acontece em miss.
     """
 
     def __init__(
@@ -33,6 +44,8 @@ class MintTokenUseCase:
         concurrency: ConcurrencyPort,
         exp_hours: int,
         engine_version: str,
+        batcher: Optional[SignBatcherPort] = None,
+        token_cache: Optional[TokenCachePort] = None,
     ) -> None:
         self._domain = domain_service
         self._crypto = crypto
@@ -40,6 +53,8 @@ class MintTokenUseCase:
         self._concurrency = concurrency
         self._exp_hours = exp_hours
         self._engine_version = engine_version
+        self._batcher = batcher
+        self._token_cache = token_cache
 
     async def execute(self, dto: MintRequestDTO) -> MintResponseDTO:
         """
@@ -47,25 +62,52 @@ class MintTokenUseCase:
         Semáforo é liberado pelo async with mesmo em timeout/exception (à prova de erro).
         """
         user = (dto.user or "guest_user").strip() or "guest_user"
-        claim = self._domain.build_claim(user=user, scope=dto.scope)
+        scope = dto.scope or self._domain.default_scope
+        generation = 0
+        if self._token_cache is not None:
+            cached = self._token_cache.lookup(user, scope)
+            if cached is not None:
+                mark_stage("token_cache_hit")
+                token, remaining_sec = cached
+                return MintResponseDTO(
+                    access_token=token,
+                    token_type="Bearer",
+                    expires_in_seconds=remaining_sec,
+                    engine_version=self._engine_version,
+                )
+            generation = self._token_cache.generation()
+
+        claim = self._domain.build_claim(user=user, scope=scope)
         payload = claim.to_jwt_payload()
+        mark_stage("claim_build")
 
         def do_sign() -> str:
-            return self._crypto.sign(payload)
+            token = self._crypto.sign(payload)
+            mark_stage("jwt_sign")
+            return token
+
+        if self._batcher is not None:
+            sign_call = self._batcher.submit(payload)
+        else:
+            sign_call = self._concurrency.run_with_slot(do_sign)
 
         try:
-            token = await asyncio.wait_for(
-                self._concurrency.run_with_slot(do_sign),
-                timeout=_MINT_SLOT_TIMEOUT_SEC,
-            )
+            token = await asyncio.wait_for(sign_call, timeout=_MINT_SLOT_TIMEOUT_SEC)
         except asyncio.TimeoutError:
             self._metrics.record_mint_failure()
             raise ValueError("Mint slot timeout") from None
+        except OverloadedError:
+            raise
         except Exception:
             self._metrics.record_mint_failure()
             raise
+        if self._batcher is not None:
+            # Espera do lote + assinatura do lote inteiro (o lote não tem trace por item)
+            mark_stage("mint_batch")
 
         self._metrics.record_mint(user=claim.subject.value, jti=claim.jti.value)
+        if self._token_cache is not None:
+            self._token_cache.store(user, scope, token, timegm(payload["exp"].utctimetuple()), generation)
 
         return MintResponseDTO(
             access_token=token,
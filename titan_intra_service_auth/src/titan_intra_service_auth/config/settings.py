@@ -36,16 +36,102 @@ class Settings:
     TOKEN_EXP_HOURS: int = int(os.environ.get("TITAN_TOKEN_EXP_HOURS", "24"))
     JWT_ALGORITHM: str = os.environ.get("TITAN_JWT_ALGORITHM", "ES256")
     JWT_ISSUER: str = "titan-intra-service-auth-v6"
+    # Fast path ES256 (chave carregada + header pré-computado); 0 volta ao jwt.encode
+    JWS_FAST_PATH: bool = os.environ.get("TITAN_JWS_FAST_PATH", "1").lower() in ("1", "true", "yes")
 
     # Orquestração estilo V1: 1 processo, N threads crypto, slots = THREADS * 2 (fila curta como no monólito)
     NUM_WORKERS: int = int(os.environ.get("TITAN_NUM_WORKERS", str(_UVCORN_WORKERS_DEFAULT)))
     UVCORN_WORKERS: int = int(os.environ.get("TITAN_UVCORN_WORKERS", str(_UVCORN_WORKERS_DEFAULT)))
     THREADS_PER_WORKER: int = int(os.environ.get("TITAN_THREADS_PER_WORKER", str(_THREADS_DEFAULT)))
+    # Teto de requests esperando slot por lane (mint, verify) em cada worker — acima disso 503
     MAX_QUEUE_CAPACITY: int = int(os.environ.get("TITAN_MAX_QUEUE_CAPACITY", "20000"))
+    # Controle de admissão (CoDel) nas lanes: espera por slot limitada a INTERVAL; se nenhum
+    # request esperou menos que TARGET durante um INTERVAL inteiro, o limite cai para TARGET
+    ADMISSION_CONTROL_ENABLED: bool = os.environ.get("TITAN_ADMISSION_CONTROL", "1").lower() in ("1", "true", "yes")
+    ADMISSION_TARGET_MS: float = float(os.environ.get("TITAN_ADMISSION_TARGET_MS", "25"))
+    ADMISSION_INTERVAL_MS: float = float(os.environ.get("TITAN_ADMISSION_INTERVAL_MS", "250"))
+    # Limite adaptativo de slots (Vegas sobre o tempo de slot): começa em THREADS × MULTIPLIER e
+    # varia entre MIN_SLOTS e inicial × MAX_SLOTS_FACTOR; QUEUE_ALPHA = fila estimada dentro da
+    # lane abaixo da qual cresce (acima de 2 × ALPHA encolhe), escalada por log10(limite)
+    ADAPTIVE_CONCURRENCY_ENABLED: bool = os.environ.get("TITAN_ADAPTIVE_CONCURRENCY", "1").lower() in ("1", "true", "yes")
+    ADAPTIVE_MIN_SLOTS: int = int(os.environ.get("TITAN_ADAPTIVE_MIN_SLOTS", str(cpu_count())))
+    ADAPTIVE_MAX_SLOTS_FACTOR: float = float(os.environ.get("TITAN_ADAPTIVE_MAX_SLOTS_FACTOR", "2"))
+    ADAPTIVE_QUEUE_ALPHA: float = float(os.environ.get("TITAN_ADAPTIVE_QUEUE_ALPHA", "3"))
     SEMAPHORE_MULTIPLIER: int = 2  # slots = THREADS_PER_WORKER * 2 (ex.: 32*2 = 64)
+    # Modo de assinatura: "thread" (pool de threads no worker) ou "process" (processos signer
+    # de vida longa com a chave carregada; um único worker satura todos os cores)
+    SIGNING_MODE: str = os.environ.get("TITAN_SIGNING_MODE", "thread").lower()
+    SIGNER_PROCESSES: int = int(os.environ.get("TITAN_SIGNER_PROCESSES", str(cpu_count())))
+    # Métricas: "local" (só o worker que responde), "segment" (mmap com um slot por worker,
+    # /v6/engine/stats agrega a frota) ou "auto" (segment quando UVCORN_WORKERS > 1)
+    METRICS_BACKEND: str = os.environ.get("TITAN_METRICS_BACKEND", "auto").lower()
+    METRICS_SEGMENT_SLOTS: int = int(os.environ.get("TITAN_METRICS_SEGMENT_SLOTS", "64"))
+    METRICS_PUBLISH_INTERVAL_SEC: float = float(os.environ.get("TITAN_METRICS_PUBLISH_INTERVAL_SEC", "0.5"))
+    # Micro-batching do mint: agrupa até MAX_SIZE assinaturas ou MAX_DELAY_US por tarefa do executor
+    MINT_BATCH_ENABLED: bool = os.environ.get("TITAN_MINT_BATCH", "0").lower() in ("1", "true", "yes")
+    MINT_BATCH_MAX_SIZE: int = int(os.environ.get("TITAN_MINT_BATCH_MAX_SIZE", "32"))
+    MINT_BATCH_MAX_DELAY_US: int = int(os.environ.get("TITAN_MINT_BATCH_MAX_DELAY_US", "500"))
+    # Reuso de token por (subject, scope): mint repetido devolve o token mintado há até MAX_AGE_SEC,
+    # se ainda restarem MIN_REMAINING_SEC de vida (default: metade de TOKEN_EXP_HOURS)
+    MINT_TOKEN_CACHE_ENABLED: bool = os.environ.get("TITAN_MINT_TOKEN_CACHE", "0").lower() in ("1", "true", "yes")
+    MINT_TOKEN_CACHE_MAX_ENTRIES: int = int(os.environ.get("TITAN_MINT_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+    MINT_TOKEN_CACHE_MAX_AGE_SEC: float = float(os.environ.get("TITAN_MINT_TOKEN_CACHE_MAX_AGE_SEC", "60"))
+    MINT_TOKEN_CACHE_MIN_REMAINING_SEC: float = float(
+        os.environ.get("TITAN_MINT_TOKEN_CACHE_MIN_REMAINING_SEC", str(TOKEN_EXP_HOURS * 1800))
+    )
+
+    # Pipeline de verify ZKP (CA): pool próprio, separado do pool de assinatura
+    VERIFY_THREADS_PER_WORKER: int = int(os.environ.get("TITAN_VERIFY_THREADS_PER_WORKER", "8"))
+    VERIFY_TIMEOUT_SEC: float = float(os.environ.get("TITAN_VERIFY_TIMEOUT_SEC", "10"))
+    # Cache de pubkeys carregadas no CAService (LRU + TTL); revogação de qualquer processo chega
+    # pelo log identity_revocations, lido a cada CA_REVOCATION_POLL_SEC
+    PUBKEY_CACHE_MAX_ENTRIES: int = int(os.environ.get("TITAN_PUBKEY_CACHE_MAX_ENTRIES", "10000"))
+    PUBKEY_CACHE_TTL_SEC: float = float(os.environ.get("TITAN_PUBKEY_CACHE_TTL_SEC", "300"))
+    CA_REVOCATION_POLL_SEC: float = float(os.environ.get("TITAN_CA_REVOCATION_POLL_SEC", "1"))
+    # Challenge store ZKP: "memory" (por worker), "sqlite" (compartilhado no host) ou "auto"
+    # (auto = sqlite quando UVCORN_WORKERS > 1, senão memory)
+    CHALLENGE_STORE_BACKEND: str = os.environ.get("TITAN_CHALLENGE_STORE", "auto").lower()
+    CHALLENGE_TTL_SEC: float = float(os.environ.get("TITAN_CHALLENGE_TTL_SEC", "60"))
+    CHALLENGE_MAX_OUTSTANDING: int = int(os.environ.get("TITAN_CHALLENGE_MAX_OUTSTANDING", "50000"))
+    CHALLENGE_SWEEP_INTERVAL_SEC: float = float(os.environ.get("TITAN_CHALLENGE_SWEEP_INTERVAL_SEC", "1"))
+    # /v6/zkp/challenge/batch: K máximo por chamada e teto de challenges pendentes por identity
+    CHALLENGE_BATCH_MAX: int = int(os.environ.get("TITAN_CHALLENGE_BATCH_MAX", "256"))
+    CHALLENGE_MAX_PER_IDENTITY: int = int(os.environ.get("TITAN_CHALLENGE_MAX_PER_IDENTITY", "1024"))
+    # Modo de challenge: "stored" (store acima) ou "signed" (HMAC stateless + filtro anti-replay)
+    CHALLENGE_MODE: str = os.environ.get("TITAN_CHALLENGE_MODE", "stored").lower()
+    REPLAY_FILTER_BITS: int = int(os.environ.get("TITAN_REPLAY_FILTER_BITS", str(1 << 25)))
+    REPLAY_FILTER_HASHES: int = int(os.environ.get("TITAN_REPLAY_FILTER_HASHES", "7"))
+    # Anti-replay do modo signed: "bloom" (memória do worker), "sqlite" (tabela comum ao host,
+    # mesmo arquivo do challenge store) ou "auto" (sqlite quando UVCORN_WORKERS > 1)
+    REPLAY_FILTER_BACKEND: str = os.environ.get("TITAN_REPLAY_FILTER", "auto").lower()
+    # Mint ZKP em uma ida (proof de época): cliente assina identity_id|época|random, sem challenge;
+    # aceito a até EPOCH_MAX_SKEW épocas de EPOCH_SEC segundos da atual
+    ZKP_EPOCH_PROOF_ENABLED: bool = os.environ.get("TITAN_ZKP_EPOCH_PROOF", "0").lower() in ("1", "true", "yes")
+    ZKP_EPOCH_SEC: float = float(os.environ.get("TITAN_ZKP_EPOCH_SEC", "30"))
+    ZKP_EPOCH_MAX_SKEW: int = int(os.environ.get("TITAN_ZKP_EPOCH_MAX_SKEW", "1"))
+    # Teto do corpo JSON (bytes) dos mints (/v6/zkp/mint, /v6/auth/mint) e do registro de identidade
+    MAX_MINT_BODY_BYTES: int = int(os.environ.get("TITAN_MAX_MINT_BODY_BYTES", "4096"))
+    MAX_IDENTITY_BODY_BYTES: int = int(os.environ.get("TITAN_MAX_IDENTITY_BODY_BYTES", "16384"))
+    # Registro em lote (/v6/zkp/identity/batch): itens por chamada e teto do corpo
+    IDENTITY_BATCH_MAX_ITEMS: int = int(os.environ.get("TITAN_IDENTITY_BATCH_MAX_ITEMS", "5000"))
+    MAX_IDENTITY_BATCH_BODY_BYTES: int = int(os.environ.get("TITAN_MAX_IDENTITY_BATCH_BODY_BYTES", "4194304"))
+    # Pool de conexões SQLite (WAL) do CARepository
+    CA_DB_POOL_SIZE: int = int(os.environ.get("TITAN_CA_DB_POOL_SIZE", "16"))
+    CA_DB_POOL_TIMEOUT_SEC: float = float(os.environ.get("TITAN_CA_DB_POOL_TIMEOUT_SEC", "5"))
 
     # Observability
     METRIC_SYNC_INTERVAL: float = 0.5
+    # Intervalo da amostra de psutil/COUNT(*) do CA usada por /metrics (fora do scrape)
+    PROCESS_STATS_INTERVAL_SEC: float = float(os.environ.get("TITAN_PROCESS_STATS_INTERVAL_SEC", "5"))
+    # /v6/engine/stats: snapshot JSON reconstruído em background a cada N s (0 = montado por request)
+    STATS_REFRESH_INTERVAL_SEC: float = float(os.environ.get("TITAN_STATS_REFRESH_SEC", "1"))
+    # Stream SSE do stats (/v6/engine/stats/stream): intervalo, limite de inscritos e fila por inscrito
+    TELEMETRY_STREAM_INTERVAL_SEC: float = float(os.environ.get("TITAN_TELEMETRY_STREAM_INTERVAL_SEC", "1"))
+    TELEMETRY_STREAM_MAX_SUBSCRIBERS: int = int(os.environ.get("TITAN_TELEMETRY_STREAM_MAX_SUBSCRIBERS", "64"))
+    TELEMETRY_STREAM_QUEUE_FRAMES: int = int(os.environ.get("TITAN_TELEMETRY_STREAM_QUEUE_FRAMES", "8"))
+    # Stage timings do mint: fração de requests amostrados (0 desliga) e header Server-Timing
+    STAGE_TIMING_SAMPLE_RATE: float = float(os.environ.get("TITAN_STAGE_TIMING_SAMPLE", "0.01"))
+    SERVER_TIMING_ENABLED: bool = os.environ.get("TITAN_SERVER_TIMING", "0").lower() in ("1", "true", "yes")
     UVCORN_BACKLOG: int = 2048 if os.name == "nt" else 4096
     UVCORN_KEEP_ALIVE: int = 60
 
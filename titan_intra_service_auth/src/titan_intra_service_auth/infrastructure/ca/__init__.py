@@ -7,10 +7,20 @@ Armazena apenas dados criptográficos (pubkeys) — ZKP: nunca identidades em cl
 
 Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
 Produto: Titan ZKP Auth — CA Module
-Micro-revisão: 000000001
+Micro-revisão: 000000002
 """
 
 from titan_intra_service_auth.infrastructure.ca.ca_repository import CARepository
 from titan_intra_service_auth.infrastructure.ca.ca_service import CAService
+from titan_intra_service_auth.infrastructure.ca.ca_verify_pipeline import CAVerifyPipeline, VerifyTimeoutError
+from titan_intra_service_auth.infrastructure.ca.identity_batch import register_identities_batch
+from titan_intra_service_auth.infrastructure.ca.pubkey_cache import PublicKeyCache
 
-__all__ = ["CARepository", "CAService"]
+__all__ = [
+    "CARepository",
+    "CAService",
+    "CAVerifyPipeline",
+    "PublicKeyCache",
+    "VerifyTimeoutError",
+    "register_identities_batch",
+]
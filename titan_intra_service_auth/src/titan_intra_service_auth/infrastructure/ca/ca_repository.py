@@ -8,17 +8,81 @@ NUNCA armazena identidades em claro — Zero Knowledge para a API.
 O CA é o único componente que conhece a relação identity_id <-> pubkey.
 A API apenas pergunta "este identity_id está autorizado?" e "esta assinatura é válida?".
 
+Contagens (total / revogadas) mantidas por triggers na tabela identity_counters — na mesma
+transação do INSERT/UPDATE/DELETE, qualquer que seja o processo escritor — e espelhadas em
+memória por até counters_max_age_sec. Stats ficam O(1); reconcile_counters() refaz a partir
+de um scan completo (python run_ca_reconcile.py).
+
+Revogações (UPDATE revoked 0→1 ou DELETE de identidade ativa) entram por trigger no log
+identity_revocations, seja qual for o processo escritor (API, ca_server, script). Cada worker
+lê o log a partir da última seq vista (poll_revocations, range scan na PK — O(novas linhas)) e
+dispara os listeners: caches de pubkey/token do worker caem em até um intervalo de poll.
+
+register_many: lote de identidades numa única transação (um executemany, um commit), com
+erro por item (fingerprint duplicado no banco ou repetido no lote) sem derrubar o lote.
+
 Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
 Produto: Titan ZKP Auth — CA Repository
-Micro-revisão: 000000001
+Micro-revisão: 000000004
 """
 
 import hashlib
 import os
 import sqlite3
+import threading
+import time
 import uuid
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from titan_intra_service_auth.infrastructure.ca.sqlite_pool import SQLiteConnectionPool
+
+# Contadores mantidos pelos triggers abaixo (revoked é 0/1)
+_COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_identities_count_insert AFTER INSERT ON identities
+    BEGIN
+        UPDATE identity_counters SET value = value + 1 WHERE name = 'total';
+        UPDATE identity_counters SET value = value + 1 WHERE name = 'revoked' AND NEW.revoked != 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_identities_count_revoke AFTER UPDATE OF revoked ON identities
+    WHEN OLD.revoked != NEW.revoked
+    BEGIN
+        UPDATE identity_counters SET value = value + (NEW.revoked != 0) - (OLD.revoked != 0)
+        WHERE name = 'revoked';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_identities_count_delete AFTER DELETE ON identities
+    BEGIN
+        UPDATE identity_counters SET value = value - 1 WHERE name = 'total';
+        UPDATE identity_counters SET value = value - 1 WHERE name = 'revoked' AND OLD.revoked != 0;
+    END
+    """,
+)
+
+# Log de revogações: uma linha por identidade que deixou de estar ativa (seq crescente)
+_REVOCATION_LOG_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_identities_revocation_log AFTER UPDATE OF revoked ON identities
+    WHEN OLD.revoked = 0 AND NEW.revoked != 0
+    BEGIN
+        INSERT INTO identity_revocations (identity_id) VALUES (NEW.identity_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_identities_revocation_log_delete AFTER DELETE ON identities
+    WHEN OLD.revoked = 0
+    BEGIN
+        INSERT INTO identity_revocations (identity_id) VALUES (OLD.identity_id);
+    END
+    """,
+)
+
+# Parâmetros por SELECT ... IN (abaixo do limite de variáveis do SQLite)
+_IN_CHUNK = 500
 
 
 class CARepository:
@@ -26,9 +90,18 @@ class CARepository:
     Persistência SQLite ZKP para o Certificate Authority.
     Tabela: identities — apenas identity_id, pubkey_pem, pubkey_fingerprint, created_at.
     Nenhum dado de identificação pessoal.
+    Conexões vêm de SQLiteConnectionPool (WAL, reutilizadas) — sem connect por chamada.
+    Tabela identity_counters: total/revoked mantidos por triggers (contagem O(1)).
+    Tabela identity_revocations: log de revogações de todos os processos (poll_revocations).
     """
 
-    def __init__(self, db_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        pool_size: int = 16,
+        pool_checkout_timeout: float = 5.0,
+        counters_max_age_sec: float = 1.0,
+    ) -> None:
         # data/ na raiz do pacote titan_intra_service_auth
         _base = Path(__file__).resolve().parent.parent.parent.parent.parent
         self._db_path = db_path or os.environ.get(
@@ -36,16 +109,46 @@ class CARepository:
             str(_base / "data" / "ca_zkp.db"),
         )
         Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool = SQLiteConnectionPool(
+            self._db_path,
+            max_connections=pool_size,
+            checkout_timeout=pool_checkout_timeout,
+        )
+        # Callbacks chamados com identity_id após revoke (ex.: invalidar cache de pubkeys)
+        self._revocation_listeners: List[Callable[[str], None]] = []
+        # Espelho de identity_counters: escritas deste processo entram na hora; as de outros
+        # workers/processos aparecem no próximo refresh (no máximo counters_max_age_sec)
+        self._counters_max_age = counters_max_age_sec
+        self._counters_lock = threading.Lock()
+        self._counters: Dict[str, int] = {"total": 0, "revoked": 0}
+        self._counters_read_at = float("-inf")
+        # Última seq de identity_revocations já repassada aos listeners (começa no fim do log)
+        self._revocation_lock = threading.Lock()
+        self._revocation_seq = 0
+        self._revocations_seen = 0
         self._init_schema()
 
-    def _get_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def add_revocation_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Registra callback(identity_id) disparado logo após uma revogação efetiva deste processo
+        e, via poll_revocations, após revogações feitas por outros processos. Pode ser chamado
+        mais de uma vez para a mesma identidade (deve ser idempotente).
+        """
+        self._revocation_listeners.append(listener)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Gauges do pool de conexões (in-use, waits, checkout médio)."""
+        return self._pool.get_stats()
+
+    def close(self) -> None:
+        """Fecha as conexões do pool."""
+        self._pool.close_all()
 
     def _init_schema(self) -> None:
-        """Cria tabela identities se não existir."""
-        with self._get_conn() as conn:
+        """Cria tabelas, índices e triggers; semeia identity_counters com um scan na primeira vez."""
+        with self._pool.connection() as conn, conn:
+            # Transação de escrita: workers subindo juntos não semeiam os contadores duas vezes
+            conn.execute("BEGIN IMMEDIATE")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS identities (
                     identity_id TEXT PRIMARY KEY,
@@ -64,6 +167,41 @@ class CARepository:
                 CREATE INDEX IF NOT EXISTS idx_identities_revoked 
                 ON identities(revoked)
             """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS identity_counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            for trigger in _COUNTER_TRIGGERS:
+                conn.execute(trigger)
+            if conn.execute("SELECT COUNT(*) FROM identity_counters").fetchone()[0] < 2:
+                self._write_counters_from_scan(conn)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS identity_revocations (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    identity_id TEXT NOT NULL
+                )
+            """)
+            for trigger in _REVOCATION_LOG_TRIGGERS:
+                conn.execute(trigger)
+            # Revogações anteriores ao start já estão no banco: nada em cache para invalidar
+            self._revocation_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM identity_revocations").fetchone()[0]
+
+    @staticmethod
+    def _scan_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+        row = conn.execute(
+            "SELECT COUNT(*) AS total, COALESCE(SUM(revoked != 0), 0) AS revoked FROM identities"
+        ).fetchone()
+        return {"total": row["total"], "revoked": row["revoked"]}
+
+    def _write_counters_from_scan(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        counts = self._scan_counts(conn)
+        conn.executemany(
+            "INSERT OR REPLACE INTO identity_counters (name, value) VALUES (?, ?)",
+            list(counts.items()),
+        )
+        return counts
 
     @staticmethod
     def _fingerprint(pubkey_pem: str) -> str:
@@ -80,7 +218,7 @@ class CARepository:
         identity_id = str(uuid.uuid4())
         created_at = __import__("datetime").datetime.utcnow().isoformat() + "Z"
 
-        with self._get_conn() as conn:
+        with self._pool.connection() as conn, conn:
             try:
                 conn.execute(
                     """
@@ -95,11 +233,64 @@ class CARepository:
                     raise ValueError(f"Pubkey já registrada (fingerprint: {fingerprint[:16]}...)") from e
                 raise
 
+        self._bump_counter("total")
         return identity_id, fingerprint
 
+    def register_many(self, entries: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Registra um lote de (pubkey_pem, scope) numa transação só. Retorna, na ordem da
+        entrada, {"identity_id", "pubkey_fingerprint"} ou {"pubkey_fingerprint", "error"}
+        para fingerprint já registrado ou repetido dentro do próprio lote.
+        """
+        fingerprints = [self._fingerprint(pubkey_pem) for pubkey_pem, _ in entries]
+        created_at = __import__("datetime").datetime.utcnow().isoformat() + "Z"
+        # Um urandom para o lote inteiro em vez de um uuid4() por identidade
+        raw_ids = os.urandom(16 * len(entries))
+        results: List[Dict[str, Any]] = []
+        rows = []
+
+        with self._pool.connection() as conn, conn:
+            # Trava de escrita antes do SELECT: nenhum outro worker insere o mesmo fingerprint no meio
+            conn.execute("BEGIN IMMEDIATE")
+            existing = set()
+            for start in range(0, len(fingerprints), _IN_CHUNK):
+                chunk = fingerprints[start : start + _IN_CHUNK]
+                existing.update(
+                    row["pubkey_fingerprint"]
+                    for row in conn.execute(
+                        "SELECT pubkey_fingerprint FROM identities WHERE pubkey_fingerprint IN (%s)"
+                        % ",".join("?" * len(chunk)),
+                        chunk,
+                    )
+                )
+            for i, ((pubkey_pem, scope), fingerprint) in enumerate(zip(entries, fingerprints)):
+                if fingerprint in existing:
+                    results.append(
+                        {
+                            "pubkey_fingerprint": fingerprint,
+                            "error": f"Pubkey já registrada (fingerprint: {fingerprint[:16]}...)",
+                        }
+                    )
+                    continue
+                existing.add(fingerprint)
+                identity_id = str(uuid.UUID(bytes=raw_ids[16 * i : 16 * i + 16], version=4))
+                rows.append((identity_id, pubkey_pem, fingerprint, scope, created_at))
+                results.append({"identity_id": identity_id, "pubkey_fingerprint": fingerprint})
+            conn.executemany(
+                """
+                INSERT INTO identities (identity_id, pubkey_pem, pubkey_fingerprint, scope, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+        if rows:
+            self._bump_counter("total", len(rows))
+        return results
+
     def get_pubkey(self, identity_id: str) -> Optional[str]:
         """Retorna pubkey_pem se identity_id existir e não estiver revogado."""
-        with self._get_conn() as conn:
+        with self._pool.connection() as conn, conn:
             row = conn.execute(
                 "SELECT pubkey_pem FROM identities WHERE identity_id = ? AND revoked = 0",
                 (identity_id,),
@@ -112,25 +303,88 @@ class CARepository:
 
     def revoke(self, identity_id: str) -> bool:
         """Revoga identidade. Retorna True se revogou, False se não encontrou."""
-        with self._get_conn() as conn:
+        with self._pool.connection() as conn, conn:
             cur = conn.execute(
                 "UPDATE identities SET revoked = 1 WHERE identity_id = ? AND revoked = 0",
                 (identity_id,),
             )
             conn.commit()
-        return cur.rowcount > 0
+        revoked = cur.rowcount > 0
+        if revoked:
+            self._bump_counter("revoked")
+            for listener in self._revocation_listeners:
+                listener(identity_id)
+        return revoked
+
+    def poll_revocations(self) -> List[str]:
+        """
+        Identidades revogadas (por qualquer processo) desde a última chamada; dispara os
+        listeners para cada uma. Sem revogação nova custa um seek na PK do log.
+        """
+        with self._revocation_lock:
+            with self._pool.connection() as conn, conn:
+                rows = conn.execute(
+                    "SELECT seq, identity_id FROM identity_revocations WHERE seq > ? ORDER BY seq",
+                    (self._revocation_seq,),
+                ).fetchall()
+            if not rows:
+                return []
+            self._revocation_seq = rows[-1]["seq"]
+            self._revocations_seen += len(rows)
+        identity_ids = [row["identity_id"] for row in rows]
+        for identity_id in identity_ids:
+            for listener in self._revocation_listeners:
+                listener(identity_id)
+        return identity_ids
+
+    def get_revocation_stats(self) -> Dict[str, int]:
+        """Posição no log de revogações e quantas revogações o poll já repassou."""
+        with self._revocation_lock:
+            return {"revocation_seq": self._revocation_seq, "revocations_polled": self._revocations_seen}
+
+    def _bump_counter(self, name: str, amount: int = 1) -> None:
+        with self._counters_lock:
+            self._counters = {**self._counters, name: self._counters[name] + amount}
+
+    def get_counters(self) -> Dict[str, int]:
+        """{"total", "revoked"} do espelho em memória; relê identity_counters (PK, O(1)) se vencido."""
+        now = time.monotonic()
+        if now - self._counters_read_at <= self._counters_max_age:
+            return self._counters
+        with self._pool.connection() as conn, conn:
+            rows = conn.execute("SELECT name, value FROM identity_counters").fetchall()
+        counters = {"total": 0, "revoked": 0}
+        counters.update({row["name"]: row["value"] for row in rows})
+        with self._counters_lock:
+            self._counters = counters
+            self._counters_read_at = now
+        return counters
 
     def count_identities(self, include_revoked: bool = False) -> int:
-        """Retorna total de identidades registradas no CA."""
-        with self._get_conn() as conn:
-            if include_revoked:
-                row = conn.execute("SELECT COUNT(*) as c FROM identities").fetchone()
-            else:
-                row = conn.execute("SELECT COUNT(*) as c FROM identities WHERE revoked = 0").fetchone()
-        return row["c"] if row else 0
+        """Retorna total de identidades registradas no CA (contadores mantidos, sem COUNT(*))."""
+        counters = self.get_counters()
+        if include_revoked:
+            return counters["total"]
+        return counters["total"] - counters["revoked"]
 
     def count_revoked(self) -> int:
-        """Retorna total de identidades revogadas."""
-        with self._get_conn() as conn:
-            row = conn.execute("SELECT COUNT(*) as c FROM identities WHERE revoked = 1").fetchone()
-        return row["c"] if row else 0
+        """Retorna total de identidades revogadas (contadores mantidos, sem COUNT(*))."""
+        return self.get_counters()["revoked"]
+
+    def reconcile_counters(self) -> Dict[str, Any]:
+        """
+        Recalcula identity_counters com um scan completo (transação de escrita: nenhum
+        INSERT/UPDATE entra no meio). Retorna os valores e a divergência encontrada.
+        """
+        with self._pool.connection() as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            stored = {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM identity_counters")}
+            counts = self._write_counters_from_scan(conn)
+        with self._counters_lock:
+            self._counters = dict(counts)
+            self._counters_read_at = time.monotonic()
+        return {
+            **counts,
+            "drift_total": stored.get("total", 0) - counts["total"],
+            "drift_revoked": stored.get("revoked", 0) - counts["revoked"],
+        }
@@ -8,20 +8,26 @@ O CA nunca conhece a API — apenas recebe requests e responde.
 
 Rotas:
   POST /ca/register  — Registra nova identidade (pubkey_pem)
+  POST /ca/register/batch — Registra um lote (PEMs validados em paralelo, uma transação)
   POST /ca/verify    — Verifica assinatura (identity_id, nonce, signature)
 
 Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
 Produto: Titan ZKP Auth — CA Server
-Micro-revisão: 000000001
+Micro-revisão: 000000002
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from typing import List, Optional
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
+from titan_intra_service_auth.config.settings import get_settings
 from titan_intra_service_auth.infrastructure.ca.ca_repository import CARepository
 from titan_intra_service_auth.infrastructure.ca.ca_service import CAService
+from titan_intra_service_auth.infrastructure.ca.identity_batch import register_identities_batch
 
 
 class RegisterRequest(BaseModel):
@@ -37,6 +43,29 @@ class RegisterResponse(BaseModel):
     scope: str
 
 
+class RegisterBatchRequest(BaseModel):
+    """Request para registro em lote."""
+    identities: List[RegisterRequest]
+
+
+class RegisterBatchItem(BaseModel):
+    """Resultado de um item do lote (created ou error)."""
+    index: int
+    status: str
+    identity_id: Optional[str] = None
+    pubkey_fingerprint: Optional[str] = None
+    scope: Optional[str] = None
+    error: Optional[str] = None
+
+
+class RegisterBatchResponse(BaseModel):
+    """Resposta do registro em lote."""
+    requested: int
+    created: int
+    failed: int
+    results: List[RegisterBatchItem]
+
+
 class VerifyRequest(BaseModel):
     """Request para verificação de assinatura."""
     identity_id: str
@@ -53,9 +82,16 @@ class VerifyResponse(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Inicializa CA no startup."""
+    settings = get_settings()
     app.state.ca_service = CAService(repository=CARepository())
+    app.state.batch_max_items = settings.IDENTITY_BATCH_MAX_ITEMS
+    # Pool da validação PEM em lote e do INSERT em lote (fora do event loop)
+    app.state.register_executor = ThreadPoolExecutor(
+        max_workers=settings.VERIFY_THREADS_PER_WORKER,
+        thread_name_prefix="titan-ca-register-",
+    )
     yield
-    # cleanup se necessário
+    app.state.register_executor.shutdown(wait=False)
 
 
 def create_ca_app() -> FastAPI:
@@ -84,6 +120,31 @@ def create_ca_app() -> FastAPI:
         except ValueError as e:
             raise HTTPException(status_code=422, detail=str(e))
 
+    @app.post("/ca/register/batch", response_model=RegisterBatchResponse)
+    async def register_identities(request: RegisterBatchRequest):
+        """Registra um lote de identidades. PEM inválido ou duplicado falha só o próprio item."""
+        if not request.identities:
+            raise HTTPException(status_code=422, detail="identities não pode ser vazio")
+        if len(request.identities) > app.state.batch_max_items:
+            raise HTTPException(status_code=413, detail=f"Lote acima de {app.state.batch_max_items} identidades")
+        loop = asyncio.get_running_loop()
+        outcomes = await register_identities_batch(
+            app.state.ca_service,
+            [(item.pubkey_pem, item.scope) for item in request.identities],
+            lambda fn: loop.run_in_executor(app.state.register_executor, fn),
+        )
+        results = [
+            RegisterBatchItem(index=index, status="error" if "error" in outcome else "created", **outcome)
+            for index, outcome in enumerate(outcomes)
+        ]
+        created = sum(1 for item in results if item.status == "created")
+        return RegisterBatchResponse(
+            requested=len(results),
+            created=created,
+            failed=len(results) - created,
+            results=results,
+        )
+
     @app.post("/ca/verify", response_model=VerifyResponse)
     async def verify_signature(request: VerifyRequest):
         """Verifica assinatura do nonce. Retorna authorized=True/False."""
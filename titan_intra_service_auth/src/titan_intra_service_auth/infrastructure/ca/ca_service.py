@@ -8,52 +8,104 @@ cliente assina um nonce; CA verifica com a pubkey; API só recebe "autorizado" o
 
 Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
 Produto: Titan ZKP Auth — CA Service
-Micro-revisão: 000000001
+Micro-revisão: 000000003
 """
 
 import base64
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
+from titan_intra_service_auth.application.ports.stage_trace_port import mark_stage
 from titan_intra_service_auth.infrastructure.ca.ca_repository import CARepository
+from titan_intra_service_auth.infrastructure.ca.pubkey_cache import PublicKeyCache
 
 
 class CAService:
     """
     Serviço do Certificate Authority.
     - register: adiciona nova identidade (pubkey)
+    - register_identities: lote validado por item, inserido numa transação só
     - verify_signature: verifica se a assinatura do nonce é válida para o identity_id
+    Pubkeys carregadas ficam em PublicKeyCache (sem SELECT nem parse PEM no hot path);
+    revogação neste processo invalida a entrada na hora; em outro processo (ca_server, outro
+    worker), no próximo CARepository.poll_revocations.
     """
 
-    def __init__(self, repository: Optional[CARepository] = None) -> None:
+    def __init__(
+        self,
+        repository: Optional[CARepository] = None,
+        pubkey_cache: Optional[PublicKeyCache] = None,
+    ) -> None:
         self._repo = repository or CARepository()
+        self._pubkey_cache = pubkey_cache or PublicKeyCache()
+        self._repo.add_revocation_listener(self._pubkey_cache.invalidate)
+
+    def _load_public_key(self, identity_id: str) -> Optional[Any]:
+        """Loader do cache: SELECT + parse PEM. None se inexistente, revogado ou PEM inválido."""
+        pubkey_pem = self._repo.get_pubkey(identity_id)
+        if not pubkey_pem:
+            return None
+        try:
+            return serialization.load_pem_public_key(pubkey_pem.encode())
+        except Exception:
+            return None
+
+    def get_public_key(self, identity_id: str) -> Optional[Any]:
+        """Chave pública carregada (via cache) ou None."""
+        return self._pubkey_cache.get_or_load(identity_id, self._load_public_key)
 
     def register_identity(self, pubkey_pem: str, scope: str = "access_root") -> Tuple[str, str]:
         """
         Registra identidade. Retorna (identity_id, fingerprint).
         Levanta ValueError se pubkey inválida ou duplicada.
         """
-        # Valida que é PEM válido
+        error = self.check_pubkey(pubkey_pem)
+        if error is not None:
+            raise ValueError(error)
+        return self._repo.register(pubkey_pem=pubkey_pem.strip(), scope=scope)
+
+    @staticmethod
+    def check_pubkey(pubkey_pem: str) -> Optional[str]:
+        """Mensagem de erro se pubkey_pem não for uma chave pública PEM válida; None se for."""
         try:
             serialization.load_pem_public_key(pubkey_pem.encode())
         except Exception as e:
-            raise ValueError(f"Pubkey inválida: {e}") from e
-        return self._repo.register(pubkey_pem=pubkey_pem.strip(), scope=scope)
+            return f"Pubkey inválida: {e}"
+        return None
+
+    def register_identities(
+        self,
+        entries: Sequence[Tuple[str, str]],
+        errors: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Registra um lote de (pubkey_pem, scope). errors: resultado de check_pubkey por item,
+        se a validação já rodou fora (em paralelo); ausente → valida aqui.
+        Itens válidos vão num único INSERT em lote; retorna por item, na ordem da entrada,
+        {"identity_id", "pubkey_fingerprint", "scope"} ou {"error"} — um item ruim não derruba o lote.
+        """
+        if errors is None:
+            errors = [self.check_pubkey(pubkey_pem) for pubkey_pem, _ in entries]
+        valid = [i for i, error in enumerate(errors) if error is None]
+        inserted = self._repo.register_many([(entries[i][0].strip(), entries[i][1]) for i in valid])
+        results: List[Dict[str, Any]] = [{"error": error} for error in errors]
+        for i, outcome in zip(valid, inserted):
+            if "error" not in outcome:
+                outcome["scope"] = entries[i][1]
+            results[i] = outcome
+        return results
 
     def verify_signature(self, identity_id: str, nonce: str, signature_b64: str) -> bool:
         """
         Verifica se a assinatura do nonce foi feita pela chave privada correspondente
         ao identity_id. Retorna True se válida, False caso contrário.
+        Estágios (request amostrado): pubkey_fetch (cache/SELECT + PEM) e ecdsa_verify.
         """
-        pubkey_pem = self._repo.get_pubkey(identity_id)
-        if not pubkey_pem:
-            return False
-
-        try:
-            public_key = serialization.load_pem_public_key(pubkey_pem.encode())
-        except Exception:
+        public_key = self.get_public_key(identity_id)
+        mark_stage("pubkey_fetch")
+        if public_key is None:
             return False
 
         try:
@@ -67,12 +119,24 @@ class CAService:
 
         try:
             public_key.verify(signature_bytes, nonce_bytes, ec.ECDSA(hashes.SHA256()))
-            return True
+            valid = True
         except InvalidSignature:
-            return False
+            valid = False
         except Exception:
-            return False
+            valid = False
+        mark_stage("ecdsa_verify")
+        return valid
 
     def is_authorized(self, identity_id: str) -> bool:
-        """Delega ao repositório."""
-        return self._repo.is_authorized(identity_id)
+        """Autorizado = pubkey ativa no CA (via cache; miss delega ao repositório)."""
+        authorized = self.get_public_key(identity_id) is not None
+        mark_stage("pubkey_fetch")
+        return authorized
+
+    def revoke_identity(self, identity_id: str) -> bool:
+        """Revoga no repositório; o listener de revogação invalida o cache."""
+        return self._repo.revoke(identity_id)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Contadores do cache de pubkeys (hits/misses/evictions) para /v6/engine/stats."""
+        return self._pubkey_cache.get_stats()
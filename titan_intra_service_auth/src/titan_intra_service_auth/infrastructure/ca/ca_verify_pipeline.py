@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+🧵 CA VERIFY PIPELINE — Verificação ZKP fora do event loop
+==========================================================
+PEM parse, ECDSA verify e SELECT no SQLite são bloqueantes; rodando dentro de
+um handler async eles travam todas as conexões do worker.
+Este pipeline despacha CAService.verify_signature / is_authorized para um pool
+dedicado (separado do pool de assinatura do ConcurrencyAdapter), com slots
+próprios, métricas de fila e timeout — verify e sign se sobrepõem entre requests.
+Registro (register_identity e register_identities em lote) usa o mesmo pool: parse PEM,
+fatias de validação em paralelo e o INSERT fora do event loop.
+Leitura (verify, is_authorized, validação PEM) que estoura timeout_sec levanta
+VerifyTimeoutError (indisponibilidade do servidor → 503 nas rotas), nunca ValueError (erro de
+validação do cliente → 422); o slot segue preso até a thread terminar. Escrita só tem prazo
+para conseguir slot: começou, vai até o commit — 503 depois de gravar mentiria ao cliente.
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Produto: Titan ZKP Auth — CA Verify Pipeline
+Micro-revisão: 000000005
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from titan_intra_service_auth.infrastructure.ca.ca_service import CAService
+from titan_intra_service_auth.infrastructure.ca.identity_batch import register_identities_batch
+from titan_intra_service_auth.infrastructure.observability.adaptive_limit import VegasConcurrencyLimit
+from titan_intra_service_auth.infrastructure.observability.admission_controller import CoDelAdmissionController
+from titan_intra_service_auth.infrastructure.observability.concurrency_adapter import ConcurrencyAdapter
+
+
+class VerifyTimeoutError(Exception):
+    """Verify não terminou em timeout_sec (pool saturado ou CA lento); retry_after_sec para o Retry-After."""
+
+    def __init__(self, timeout_sec: float, retry_after_sec: int = 1) -> None:
+        super().__init__(f"Verify slot timeout ({timeout_sec:g}s)")
+        self.timeout_sec = timeout_sec
+        self.retry_after_sec = retry_after_sec
+
+
+class CAVerifyPipeline:
+    """
+    Fachada async sobre CAService: cada chamada adquire um slot de verify e roda no pool
+    titan-verify-*; leitura responde em até timeout (falha rápida, slot devolvido só quando a
+    thread termina), escrita espera slot em até timeout e então roda até o fim.
+    Com admission, lane cheia rejeita com OverloadedError antes do timeout; com limiter,
+    o número de slots de verify se ajusta ao tempo de verify medido.
+    """
+
+    def __init__(
+        self,
+        ca_service: CAService,
+        num_threads: int,
+        semaphore_slots: int | None = None,
+        timeout_sec: float = 10.0,
+        admission: Optional[CoDelAdmissionController] = None,
+        limiter: Optional[VegasConcurrencyLimit] = None,
+    ) -> None:
+        self._ca = ca_service
+        self._timeout = timeout_sec
+        self._executor = ConcurrencyAdapter(
+            num_threads=num_threads,
+            semaphore_slots=semaphore_slots,
+            thread_name_prefix="titan-verify-",
+            stage_name="verify",
+            admission=admission,
+            limiter=limiter,
+        )
+        self._timeouts = 0
+
+    async def _run(self, fn):
+        try:
+            return await asyncio.wait_for(self._executor.run_with_slot(fn), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise VerifyTimeoutError(self._timeout) from None
+
+    async def _run_write(self, fn):
+        try:
+            return await self._executor.run_with_slot(fn, slot_timeout=self._timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise VerifyTimeoutError(self._timeout) from None
+
+    async def verify_signature(self, identity_id: str, nonce: str, signature_b64: str) -> bool:
+        """CAService.verify_signature no pool de verify."""
+        return await self._run(
+            lambda: self._ca.verify_signature(
+                identity_id=identity_id,
+                nonce=nonce,
+                signature_b64=signature_b64,
+            )
+        )
+
+    async def is_authorized(self, identity_id: str) -> bool:
+        """CAService.is_authorized no pool de verify."""
+        return await self._run(lambda: self._ca.is_authorized(identity_id))
+
+    async def register_identity(self, pubkey_pem: str, scope: str = "access_root") -> Tuple[str, str]:
+        """CAService.register_identity no pool de verify (escrita: sem prazo depois de iniciada)."""
+        return await self._run_write(lambda: self._ca.register_identity(pubkey_pem=pubkey_pem, scope=scope))
+
+    async def register_identities(self, entries: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Lote (pubkey_pem, scope): validação PEM em fatias paralelas + uma transação, no pool de verify."""
+        return await register_identities_batch(self._ca, entries, self._run, run_write=self._run_write)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Slots, profundidade de fila e timeouts do pipeline de verify."""
+        stats = self._executor.get_stats()
+        stats["timeout_sec"] = self._timeout
+        stats["timeouts"] = self._timeouts
+        return stats
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+📥 IDENTITY BATCH — Registro de identidades em lote
+===================================================
+Onboarding de milhares de identidades uma chamada por vez paga, por identidade, um
+request HTTP, uma conexão, um uuid4 e um commit. Aqui o lote inteiro é:
+  1. validado em fatias de PEM despachadas em paralelo num pool (parse PEM é a parte cara);
+  2. inserido numa única transação (CAService.register_identities → CARepository.register_many).
+O pool é injetado como `run(fn) -> awaitable`: na API é o pool de verify (slots, admissão,
+timeout); no CA standalone, um ThreadPoolExecutor próprio. run_write (default run) leva a
+transação: na API não tem prazo depois de iniciada (lote gravado nunca volta como falha).
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Produto: Titan ZKP Auth — Identity Batch
+Micro-revisão: 000000002
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from titan_intra_service_auth.infrastructure.ca.ca_service import CAService
+
+T = TypeVar("T")
+
+# PEMs por tarefa de validação (~15 µs cada → ~1 ms por fatia)
+VALIDATE_CHUNK_SIZE = 64
+
+
+def _check_chunk(pubkey_pems: Sequence[str]) -> List[Optional[str]]:
+    return [CAService.check_pubkey(pubkey_pem) for pubkey_pem in pubkey_pems]
+
+
+async def register_identities_batch(
+    ca_service: CAService,
+    entries: Sequence[Tuple[str, str]],
+    run: Callable[[Callable[[], T]], Awaitable[T]],
+    chunk_size: int = VALIDATE_CHUNK_SIZE,
+    run_write: Optional[Callable[[Callable[[], T]], Awaitable[T]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Valida os PEMs de entries [(pubkey_pem, scope)] em paralelo via run e insere os válidos
+    numa transação. Retorna um resultado por item, na ordem da entrada (ver
+    CAService.register_identities).
+    """
+    pubkey_pems = [pubkey_pem for pubkey_pem, _ in entries]
+    chunks = await asyncio.gather(
+        *(
+            run(lambda chunk=pubkey_pems[start : start + chunk_size]: _check_chunk(chunk))
+            for start in range(0, len(pubkey_pems), chunk_size)
+        )
+    )
+    errors = [error for chunk in chunks for error in chunk]
+    return await (run_write or run)(lambda: ca_service.register_identities(entries, errors))
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+🗝️ PUBKEY CACHE — Cache LRU/TTL de chaves públicas já carregadas
+================================================================
+Cada /v6/zkp/mint fazia SELECT + load_pem_public_key (parse ASN.1) antes do
+verify. Com uma frota pequena de identidades, quase todas as chamadas repetem.
+Este cache guarda o objeto EllipticCurvePublicKey por identity_id (LRU limitado
++ TTL); revogação remove a entrada via listener do CARepository (na hora no processo que
+revoga; nos demais, no poll do log de revogações).
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Produto: Titan ZKP Auth — CA Pubkey Cache
+Micro-revisão: 000000001
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Defaults: ~10k identidades em memória; TTL é rede de segurança se o poll de revogações parar
+_DEFAULT_MAX_ENTRIES = 10000
+_DEFAULT_TTL_SEC = 300.0
+
+
+class PublicKeyCache:
+    """
+    LRU limitado (OrderedDict) com TTL por entrada, thread-safe (pool de verify).
+    Não faz cache negativo: identidade inexistente/revogada sempre volta ao loader.
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_ENTRIES, ttl_sec: float = _DEFAULT_TTL_SEC) -> None:
+        self._max = max(1, max_entries)
+        self._ttl = ttl_sec
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        # Incrementa a cada invalidate: um load concorrente com revogação não é cacheado
+        self._epoch = 0
+
+    def get_or_load(self, identity_id: str, loader: Callable[[str], Optional[Any]]) -> Optional[Any]:
+        """
+        Retorna a chave em cache ou chama loader(identity_id) fora do lock.
+        loader retorna None para identidade inexistente/revogada (não é cacheado).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(identity_id)
+            if entry is not None:
+                key, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(identity_id)
+                    self._hits += 1
+                    return key
+                del self._entries[identity_id]
+                self._expirations += 1
+            self._misses += 1
+            epoch = self._epoch
+
+        key = loader(identity_id)
+        if key is None:
+            return None
+
+        with self._lock:
+            if epoch != self._epoch:
+                return key
+            self._entries[identity_id] = (key, now + self._ttl)
+            self._entries.move_to_end(identity_id)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return key
+
+    def invalidate(self, identity_id: str) -> None:
+        """Remove identity_id do cache (revogação)."""
+        with self._lock:
+            self._epoch += 1
+            if self._entries.pop(identity_id, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max,
+                "ttl_sec": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate_pct": round(self._hits / lookups * 100, 2) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
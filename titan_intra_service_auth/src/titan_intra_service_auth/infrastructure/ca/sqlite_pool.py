@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+🗄️ SQLITE POOL — Pool persistente de conexões WAL para o CA
+===========================================================
+Antes: um sqlite3.connect novo por register/get_pubkey/revoke/count, em modo
+rollback-journal (leitor bloqueia atrás de escritor).
+Agora: conexões reutilizáveis (LIFO — a thread tende a pegar a conexão quente),
+journal_mode=WAL (leitores nunca esperam escritor), pragmas ajustados e cache de
+prepared statements por conexão. Gauges de in-use/waits/checkout para dimensionar.
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Produto: Titan ZKP Auth — CA SQLite Pool
+Micro-revisão: 000000001
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+# Pragmas por conexão: WAL + synchronous=NORMAL é durável em commit de checkpoint e ~10x mais rápido que FULL
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256 MB mapeados para leitura
+    "PRAGMA cache_size=-16000",  # ~16 MB de page cache por conexão
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",  # escritor concorrente espera em vez de falhar com "database is locked"
+)
+_CACHED_STATEMENTS = 256
+
+
+class SQLiteConnectionPool:
+    """
+    Pool limitado de conexões SQLite (check_same_thread=False; um dono por vez).
+    Conexões criadas sob demanda até max_connections; acima disso o checkout espera
+    (conta em waits) até checkout_timeout.
+    """
+
+    def __init__(self, db_path: str, max_connections: int = 16, checkout_timeout: float = 5.0) -> None:
+        self._db_path = db_path
+        self._max = max(1, max_connections)
+        self._timeout = checkout_timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._checkout_ns_total = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._db_path,
+            check_same_thread=False,
+            cached_statements=_CACHED_STATEMENTS,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        t0 = time.perf_counter_ns()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self._max
+                if create:
+                    self._created += 1
+                else:
+                    self._waits += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                with self._lock:
+                    self._all.append(conn)
+            else:
+                try:
+                    conn = self._idle.get(timeout=self._timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise sqlite3.OperationalError("CA DB pool exhausted (checkout timeout)") from None
+        with self._lock:
+            self._in_use += 1
+            if self._in_use > self._peak_in_use:
+                self._peak_in_use = self._in_use
+            self._checkouts += 1
+            self._checkout_ns_total += time.perf_counter_ns() - t0
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        # Transação pendente (exceção no meio) não pode vazar para o próximo dono
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._in_use -= 1
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Checkout de uma conexão; devolvida ao pool no fim do bloco."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close_all(self) -> None:
+        """Fecha todas as conexões (shutdown)."""
+        with self._lock:
+            conns, self._all = self._all, []
+            self._created = 0
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gauges do pool (para /v6/engine/stats)."""
+        with self._lock:
+            avg_us = (self._checkout_ns_total / self._checkouts / 1000) if self._checkouts else 0.0
+            return {
+                "max_connections": self._max,
+                "connections_open": self._created,
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "idle": self._created - self._in_use,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "avg_checkout_us": round(avg_us, 2),
+            }
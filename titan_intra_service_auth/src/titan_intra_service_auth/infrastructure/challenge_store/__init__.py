@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+🎟️ CHALLENGE STORE — Armazenamento de challenges ZKP
+====================================================
+Implementações de ChallengeStorePort:
+  - InMemoryChallengeStore: dict + Lock por processo (1 worker Uvicorn)
+  - SQLiteChallengeStore: tabela WAL local compartilhada entre workers do mesmo host
+Modo stateless: SignedChallengeCodec (HMAC) + TimeBucketedBloomFilter (anti-replay por worker)
+ou SQLiteReplayGuard (anti-replay comum aos workers do host).
+Lote: new_challenges / new_nonces (uma leitura de os.urandom para K challenges).
+Sem challenge: EpochProofVerifier (cliente assina identity_id|época|random; mint em uma ida).
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000003
+"""
+
+from titan_intra_service_auth.infrastructure.challenge_store.challenge_batch import new_challenges, new_nonces
+from titan_intra_service_auth.infrastructure.challenge_store.epoch_proof import (
+    EpochProofVerifier,
+    epoch_proof_message,
+)
+from titan_intra_service_auth.infrastructure.challenge_store.memory_challenge_store import InMemoryChallengeStore
+from titan_intra_service_auth.infrastructure.challenge_store.sqlite_challenge_store import SQLiteChallengeStore
+from titan_intra_service_auth.infrastructure.challenge_store.replay_filter import TimeBucketedBloomFilter
+from titan_intra_service_auth.infrastructure.challenge_store.shared_replay_guard import SQLiteReplayGuard
+from titan_intra_service_auth.infrastructure.challenge_store.signed_challenge import (
+    SignedChallengeCodec,
+    load_or_create_challenge_secret,
+)
+
+__all__ = [
+    "EpochProofVerifier",
+    "epoch_proof_message",
+    "InMemoryChallengeStore",
+    "SQLiteChallengeStore",
+    "TimeBucketedBloomFilter",
+    "SQLiteReplayGuard",
+    "SignedChallengeCodec",
+    "load_or_create_challenge_secret",
+    "new_challenges",
+    "new_nonces",
+]
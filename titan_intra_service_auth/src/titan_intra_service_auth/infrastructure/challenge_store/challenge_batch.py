@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+🎟️ CHALLENGE BATCH — challenge_id/nonce em lote a partir de uma leitura de os.urandom
+=====================================================================================
+GET /v6/zkp/challenge/batch emite K challenges de uma vez: em vez de K token_urlsafe(32)
++ K uuid4() (2K syscalls de entropia), um único os.urandom(48 × K) é fatiado em nonce
+(32 bytes, mesmo formato de token_urlsafe(32)) + challenge_id (16 bytes, UUID v4).
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000001
+"""
+
+import base64
+import os
+import uuid
+from typing import List, Tuple
+
+_NONCE_BYTES = 32
+_ID_BYTES = 16
+
+
+def _nonce(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def new_nonces(count: int) -> List[str]:
+    """count nonces (formato de secrets.token_urlsafe(32)) de uma leitura de os.urandom."""
+    raw = os.urandom(_NONCE_BYTES * count)
+    return [_nonce(raw[i : i + _NONCE_BYTES]) for i in range(0, len(raw), _NONCE_BYTES)]
+
+
+def new_challenges(count: int) -> List[Tuple[str, str]]:
+    """count pares (challenge_id, nonce) de uma leitura de os.urandom."""
+    step = _NONCE_BYTES + _ID_BYTES
+    raw = os.urandom(step * count)
+    return [
+        (
+            str(uuid.UUID(bytes=raw[i + _NONCE_BYTES : i + step], version=4)),
+            _nonce(raw[i : i + _NONCE_BYTES]),
+        )
+        for i in range(0, len(raw), step)
+    ]
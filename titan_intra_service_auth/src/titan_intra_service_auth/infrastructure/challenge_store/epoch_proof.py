@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+⏱️ EPOCH PROOFS — Mint ZKP em uma ida, sem challenge
+====================================================
+Alternativa ao par GET /v6/zkp/challenge → POST /v6/zkp/mint: o cliente assina
+    titan-zkp-epoch-v1|identity_id|época|random
+onde época = floor(tempo / epoch_sec) (relógio do servidor anunciado em GET /v6/zkp/epoch)
+e random é gerado pelo cliente. O servidor aceita épocas a até max_skew_epochs da atual —
+nenhum estado por challenge, metade dos requests por token.
+Anti-replay: a mensagem assinada fica marcada até a época sair da janela — num
+TimeBucketedBloomFilter por worker (memória limitada: ~2 × skew + 2 bitsets vivos) com um
+worker só, ou no SQLiteReplayGuard comum ao host com vários (como nos challenges assinados);
+senão um proof capturado valeria uma vez em cada worker durante a janela.
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Union
+
+from titan_intra_service_auth.infrastructure.challenge_store.replay_filter import TimeBucketedBloomFilter
+from titan_intra_service_auth.infrastructure.challenge_store.shared_replay_guard import SQLiteReplayGuard
+
+# Separação de domínio: assinatura de proof de época nunca vale como assinatura de nonce
+EPOCH_PROOF_DOMAIN = "titan-zkp-epoch-v1"
+_MIN_RANDOM_LEN = 16
+_MAX_RANDOM_LEN = 128
+
+
+def epoch_proof_message(identity_id: str, epoch: int, client_random: str) -> str:
+    """Mensagem que o cliente assina (e o CA verifica) no modo proof de época."""
+    return f"{EPOCH_PROOF_DOMAIN}|{identity_id}|{epoch}|{client_random}"
+
+
+class EpochProofVerifier:
+    """
+    message_if_fresh(...) → mensagem a verificar pelo CA, ou None se fora da janela;
+    await mark_used(mensagem, época) depois da assinatura válida → False se replay.
+    """
+
+    def __init__(
+        self,
+        epoch_sec: float = 30.0,
+        max_skew_epochs: int = 1,
+        replay_filter: Optional[Union[TimeBucketedBloomFilter, SQLiteReplayGuard]] = None,
+    ) -> None:
+        self._epoch_sec = max(1.0, epoch_sec)
+        self._max_skew = max(0, max_skew_epochs)
+        self._replay = replay_filter or TimeBucketedBloomFilter(window_sec=self._epoch_sec)
+        self._lock = threading.Lock()
+        self._accepted = 0
+        self._rejected_skew = 0
+        self._rejected_random = 0
+        self._rejected_replay = 0
+
+    def current_epoch(self, now: Optional[float] = None) -> int:
+        return int((time.time() if now is None else now) // self._epoch_sec)
+
+    def describe(self) -> Dict[str, Any]:
+        """Corpo de GET /v6/zkp/epoch: época atual e parâmetros da janela."""
+        now = time.time()
+        epoch = self.current_epoch(now)
+        return {
+            "epoch": epoch,
+            "epoch_sec": self._epoch_sec,
+            "max_skew_epochs": self._max_skew,
+            "server_time": round(now, 3),
+            "next_epoch_at": round((epoch + 1) * self._epoch_sec, 3),
+            "message_format": f"{EPOCH_PROOF_DOMAIN}|<identity_id>|<epoch>|<random>",
+        }
+
+    def message_if_fresh(self, identity_id: str, epoch: int, client_random: str) -> Optional[str]:
+        if not _MIN_RANDOM_LEN <= len(client_random) <= _MAX_RANDOM_LEN:
+            self._count("_rejected_random")
+            return None
+        if abs(epoch - self.current_epoch()) > self._max_skew:
+            self._count("_rejected_skew")
+            return None
+        return epoch_proof_message(identity_id, epoch, client_random)
+
+    async def mark_used(self, message: str, epoch: int) -> bool:
+        # Lembrado até a época sair da janela aceita
+        expires_at = (epoch + self._max_skew + 1) * self._epoch_sec
+        if not await self._replay.mark_if_new(message.encode(), expires_at):
+            self._count("_rejected_replay")
+            return False
+        self._count("_accepted")
+        return True
+
+    def _count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "mode": "epoch",
+                "epoch_sec": self._epoch_sec,
+                "max_skew_epochs": self._max_skew,
+                "accepted": self._accepted,
+                "rejected_skew": self._rejected_skew,
+                "rejected_random": self._rejected_random,
+                "rejected_replay": self._rejected_replay,
+            }
+        stats["replay_filter"] = self._replay.get_stats()
+        return stats
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+🎟️ IN-MEMORY CHALLENGE STORE — fila de expiração por inserção + Lock por processo
+=================================================================================
+challenge_id -> (identity_id, nonce, expires_at) num OrderedDict.
+TTL é constante, então ordem de inserção == ordem de expiração: a cabeça da fila
+é sempre o próximo a expirar → remoção O(1) (popitem(last=False)), sem varrer.
+Privado a cada worker Uvicorn — use apenas com TITAN_UVCORN_WORKERS=1.
+Pendentes por identity contados junto (put/pop/expiração/eviction) — put_many limita o
+lote pelo teto por identity sem varrer a fila.
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000003
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from titan_intra_service_auth.application.ports.challenge_store_port import ChallengeStorePort
+
+_MAX_CHALLENGES = 50000
+_DEFAULT_TTL_SEC = 60.0
+# Máximo de entradas expiradas removidas por aquisição de lock (put e sweep) — amortizado
+_SWEEP_BATCH = 256
+
+
+class InMemoryChallengeStore(ChallengeStorePort):
+    """
+    Challenges com TTL real. put() remove até _SWEEP_BATCH expirados da cabeça;
+    sweep_expired() (tarefa de fundo) drena o resto em lotes curtos sob lock.
+    Acima de max_challenges, descarta o mais antigo (O(1)) e conta como eviction.
+    """
+
+    def __init__(self, max_challenges: int = _MAX_CHALLENGES, ttl_sec: float = _DEFAULT_TTL_SEC) -> None:
+        self._max = max_challenges
+        self._ttl = ttl_sec
+        self._store: "OrderedDict[str, Tuple[str, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # identity_id -> challenges pendentes (entradas no store, expiradas ainda não removidas inclusive)
+        self._outstanding: Dict[str, int] = {}
+        self._expired = 0
+        self._evicted = 0
+        self._batch_capped = 0
+
+    def _release_locked(self, identity_id: str) -> None:
+        count = self._outstanding.get(identity_id, 0) - 1
+        if count > 0:
+            self._outstanding[identity_id] = count
+        else:
+            self._outstanding.pop(identity_id, None)
+
+    def _drop_expired_locked(self, now: float, limit: int) -> int:
+        dropped = 0
+        store = self._store
+        while store and dropped < limit:
+            head = next(iter(store.values()))
+            if head[2] > now:
+                break
+            store.popitem(last=False)
+            self._release_locked(head[0])
+            dropped += 1
+        self._expired += dropped
+        return dropped
+
+    def _insert_locked(self, challenge_id: str, identity_id: str, nonce: str, expires_at: float) -> None:
+        previous = self._store.pop(challenge_id, None)
+        if previous is not None:
+            self._release_locked(previous[0])
+        self._store[challenge_id] = (identity_id, nonce, expires_at)
+        self._outstanding[identity_id] = self._outstanding.get(identity_id, 0) + 1
+
+    def _evict_over_capacity_locked(self) -> None:
+        while len(self._store) > self._max:
+            _, (identity_id, _, _) = self._store.popitem(last=False)
+            self._release_locked(identity_id)
+            self._evicted += 1
+
+    async def put(self, challenge_id: str, identity_id: str, nonce: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._drop_expired_locked(now, _SWEEP_BATCH)
+            self._insert_locked(challenge_id, identity_id, nonce, now + self._ttl)
+            self._evict_over_capacity_locked()
+
+    async def put_many(
+        self,
+        identity_id: str,
+        challenges: Sequence[Tuple[str, str]],
+        max_outstanding: int,
+    ) -> int:
+        now = time.monotonic()
+        expires_at = now + self._ttl
+        with self._lock:
+            self._drop_expired_locked(now, _SWEEP_BATCH)
+            room = max(0, max_outstanding - self._outstanding.get(identity_id, 0))
+            granted = challenges[:room]
+            if len(granted) < len(challenges):
+                self._batch_capped += 1
+            for challenge_id, nonce in granted:
+                self._insert_locked(challenge_id, identity_id, nonce, expires_at)
+            self._evict_over_capacity_locked()
+        return len(granted)
+
+    async def pop(self, challenge_id: str) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            entry = self._store.pop(challenge_id, None)
+            if entry is None:
+                return None
+            self._release_locked(entry[0])
+            if entry[2] <= time.monotonic():
+                self._expired += 1
+                return None
+        return entry[0], entry[1]
+
+    async def sweep_expired(self) -> int:
+        total = 0
+        while True:
+            with self._lock:
+                dropped = self._drop_expired_locked(time.monotonic(), _SWEEP_BATCH)
+            total += dropped
+            if dropped < _SWEEP_BATCH:
+                return total
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._store),
+                "max_challenges": self._max,
+                "ttl_sec": self._ttl,
+                "expired": self._expired,
+                "evicted_under_pressure": self._evicted,
+                "identities_with_outstanding": len(self._outstanding),
+                "batch_capped": self._batch_capped,
+            }
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+🧮 REPLAY FILTER — Bloom filter rotativo por janela de tempo
+============================================================
+Filtro compacto de "já visto" com memória limitada: um bitset por janela de
+expiração (bucket = expires_at // window). Itens só precisam ser lembrados até
+expirarem, então buckets cujo fim já passou são descartados inteiros — no
+máximo ~2 bitsets vivos, independente do volume.
+Falso positivo (item novo tido como visto) tem probabilidade ajustável por
+num_bits/num_hashes; falso negativo não existe dentro da janela.
+Por processo: com vários workers no host use o SQLiteReplayGuard (mesma interface mark_if_new).
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict
+
+# 2^25 bits = 4 MB por bucket: ~1M itens/janela com 7 hashes → FP ≈ 1e-5
+_DEFAULT_NUM_BITS = 1 << 25
+_DEFAULT_NUM_HASHES = 7
+
+
+class TimeBucketedBloomFilter:
+    """add_if_absent(key, expires_at) → True se novo, False se (provavelmente) já visto."""
+
+    def __init__(
+        self,
+        window_sec: float,
+        num_bits: int = _DEFAULT_NUM_BITS,
+        num_hashes: int = _DEFAULT_NUM_HASHES,
+    ) -> None:
+        self._window = max(window_sec, 1.0)
+        self._num_bits = max(num_bits, 8)
+        self._num_hashes = max(1, min(num_hashes, 16))
+        self._buckets: Dict[int, bytearray] = {}
+        self._lock = threading.Lock()
+        self._added = 0
+        self._rejected = 0
+        self._rotations = 0
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=4 * self._num_hashes).digest()
+        m = self._num_bits
+        return [int.from_bytes(digest[i : i + 4], "little") % m for i in range(0, len(digest), 4)]
+
+    def _rotate_locked(self, now: float) -> None:
+        current = int(now // self._window)
+        stale = [b for b in self._buckets if b < current]
+        for b in stale:
+            del self._buckets[b]
+            self._rotations += 1
+
+    def add_if_absent(self, key: bytes, expires_at: float) -> bool:
+        positions = self._positions(key)
+        bucket_id = int(expires_at // self._window)
+        with self._lock:
+            self._rotate_locked(time.time())
+            bits = self._buckets.get(bucket_id)
+            if bits is None:
+                bits = bytearray(self._num_bits // 8 + 1)
+                self._buckets[bucket_id] = bits
+            seen = True
+            for p in positions:
+                byte, mask = p >> 3, 1 << (p & 7)
+                if not bits[byte] & mask:
+                    seen = False
+                    bits[byte] |= mask
+            if seen:
+                self._rejected += 1
+                return False
+            self._added += 1
+            return True
+
+    async def mark_if_new(self, key: bytes, expires_at: float) -> bool:
+        """Interface comum com SQLiteReplayGuard; em memória, sem hop de thread."""
+        return self.add_if_absent(key, expires_at)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "bloom",
+                "window_sec": self._window,
+                "num_bits": self._num_bits,
+                "num_hashes": self._num_hashes,
+                "live_buckets": len(self._buckets),
+                "memory_bytes": sum(len(b) for b in self._buckets.values()),
+                "added": self._added,
+                "replays_blocked": self._rejected,
+                "rotations": self._rotations,
+            }
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+🛡️ SHARED REPLAY GUARD — "já usado" comum a todos os workers do host
+====================================================================
+O TimeBucketedBloomFilter vive na memória de um processo: com N workers Uvicorn, um
+challenge assinado (ou proof de época) capturado podia ser reapresentado uma vez por
+worker. Aqui a marca de uso é uma linha na tabela replay_seen do mesmo arquivo WAL do
+SQLiteChallengeStore: INSERT OR IGNORE na PK é o árbitro (só uma conexão, de qualquer
+processo, insere a chave) — o mesmo pop-once entre workers do modo stored.
+Linhas vivem até expires_at (prazo do challenge / fim da janela de época); o sweep de
+fundo remove as vencidas por range scan no índice. I/O num pool pequeno, fora do event loop.
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from titan_intra_service_auth.infrastructure.ca.sqlite_pool import SQLiteConnectionPool
+
+# Sweep em lotes: cada transação segura o lock de escrita por pouco tempo
+_SWEEP_BATCH = 4096
+
+
+class SQLiteReplayGuard:
+    """mark_if_new(key, expires_at) → True na primeira vez (em qualquer worker), False se replay."""
+
+    def __init__(self, db_path: Optional[str] = None, num_threads: int = 4) -> None:
+        _base = Path(__file__).resolve().parent.parent.parent.parent.parent
+        self._db_path = db_path or os.environ.get(
+            "TITAN_CHALLENGE_DB_PATH",
+            str(_base / "data" / "zkp_challenges.db"),
+        )
+        Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool = SQLiteConnectionPool(self._db_path, max_connections=num_threads)
+        self._executor = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="titan-replay-")
+        self._lock = threading.Lock()
+        self._added = 0
+        self._rejected = 0
+        self._swept = 0
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self._pool.connection() as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS replay_seen (
+                    key BLOB PRIMARY KEY,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_replay_seen_expires ON replay_seen(expires_at)")
+
+    def add_if_absent(self, key: bytes, expires_at: float) -> bool:
+        """Versão síncrona (bloqueia em I/O): quem está no event loop usa mark_if_new."""
+        with self._pool.connection() as conn, conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO replay_seen (key, expires_at) VALUES (?, ?)",
+                (key, expires_at),
+            )
+        fresh = cur.rowcount == 1
+        with self._lock:
+            if fresh:
+                self._added += 1
+            else:
+                self._rejected += 1
+        return fresh
+
+    async def mark_if_new(self, key: bytes, expires_at: float) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.add_if_absent, key, expires_at)
+
+    def _sweep_sync(self) -> int:
+        total = 0
+        while True:
+            with self._pool.connection() as conn, conn:
+                cur = conn.execute(
+                    "DELETE FROM replay_seen WHERE rowid IN "
+                    "(SELECT rowid FROM replay_seen WHERE expires_at <= ? LIMIT ?)",
+                    (time.time(), _SWEEP_BATCH),
+                )
+            removed = max(cur.rowcount, 0)
+            total += removed
+            if removed < _SWEEP_BATCH:
+                break
+        with self._lock:
+            self._swept += total
+        return total
+
+    async def sweep_expired(self) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._sweep_sync)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "backend": "sqlite",
+                "added": self._added,
+                "replays_blocked": self._rejected,
+                "swept": self._swept,
+            }
+        stats["db_pool"] = self._pool.get_stats()
+        return stats
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+✍️ SIGNED CHALLENGES — Challenges stateless autenticados por HMAC
+================================================================
+Modo alternativo ao ChallengeStorePort: /v6/zkp/challenge devolve
+challenge_id = "s1.<exp>.<mac>", mac = HMAC-SHA256(segredo, identity_id|nonce|exp).
+/v6/zkp/mint valida recomputando o HMAC — nenhum lookup, memória constante por
+challenge emitido, válido em qualquer worker que compartilhe o segredo.
+Anti-replay indexado pelo mac: TimeBucketedBloomFilter (memória limitada, por processo)
+com um worker; SQLiteReplayGuard (tabela comum ao host) com vários — senão um challenge
+capturado poderia ser reapresentado uma vez em cada worker dentro do TTL.
+issue_many: lote para /v6/zkp/challenge/batch (nonces de uma leitura de os.urandom).
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from titan_intra_service_auth.infrastructure.challenge_store.challenge_batch import new_nonces
+from titan_intra_service_auth.infrastructure.challenge_store.replay_filter import TimeBucketedBloomFilter
+from titan_intra_service_auth.infrastructure.challenge_store.shared_replay_guard import SQLiteReplayGuard
+
+SIGNED_CHALLENGE_PREFIX = "s1."
+_SECRET_BYTES = 32
+
+
+def load_or_create_challenge_secret(path: Optional[str] = None) -> bytes:
+    """
+    Segredo HMAC compartilhado pelos workers do host.
+    TITAN_CHALLENGE_SECRET (hex) tem prioridade; senão lê/cria arquivo (O_EXCL, 0600).
+    """
+    env_secret = os.environ.get("TITAN_CHALLENGE_SECRET")
+    if env_secret:
+        return bytes.fromhex(env_secret)
+    _base = Path(__file__).resolve().parent.parent.parent.parent.parent
+    secret_path = Path(path or os.environ.get(
+        "TITAN_CHALLENGE_SECRET_PATH",
+        str(_base / "data" / "challenge_hmac.key"),
+    ))
+    secret_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(str(secret_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Outro worker criou; espera o conteúdo completo aparecer
+        for _ in range(50):
+            data = secret_path.read_bytes()
+            if len(data) >= _SECRET_BYTES:
+                return data[:_SECRET_BYTES]
+            time.sleep(0.01)
+        raise RuntimeError(f"Segredo de challenge incompleto em {secret_path}")
+    secret = secrets.token_bytes(_SECRET_BYTES)
+    with os.fdopen(fd, "wb") as f:
+        f.write(secret)
+    return secret
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+class SignedChallengeCodec:
+    """
+    issue(identity_id) → (challenge_id, nonce); await verify(...) → True se autêntico,
+    dentro do prazo e ainda não usado (marca como usado no filtro).
+    """
+
+    def __init__(
+        self,
+        secret: bytes,
+        ttl_sec: float = 60.0,
+        replay_filter: Optional[Union[TimeBucketedBloomFilter, SQLiteReplayGuard]] = None,
+    ) -> None:
+        self._secret = secret
+        self._ttl = ttl_sec
+        self._replay = replay_filter or TimeBucketedBloomFilter(window_sec=ttl_sec)
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._accepted = 0
+        self._rejected_mac = 0
+        self._rejected_expired = 0
+        self._rejected_replay = 0
+
+    def _mac(self, identity_id: str, nonce: str, exp: int) -> bytes:
+        msg = f"{identity_id}|{nonce}|{exp}".encode()
+        return hmac.new(self._secret, msg, hashlib.sha256).digest()
+
+    def issue(self, identity_id: str) -> Tuple[str, str]:
+        nonce = secrets.token_urlsafe(32)
+        exp = int(time.time() + self._ttl)
+        challenge_id = f"{SIGNED_CHALLENGE_PREFIX}{exp}.{_b64(self._mac(identity_id, nonce, exp))}"
+        with self._lock:
+            self._issued += 1
+        return challenge_id, nonce
+
+    def issue_many(self, identity_id: str, count: int) -> List[Tuple[str, str]]:
+        exp = int(time.time() + self._ttl)
+        challenges = [
+            (f"{SIGNED_CHALLENGE_PREFIX}{exp}.{_b64(self._mac(identity_id, nonce, exp))}", nonce)
+            for nonce in new_nonces(count)
+        ]
+        with self._lock:
+            self._issued += count
+        return challenges
+
+    @staticmethod
+    def is_signed(challenge_id: str) -> bool:
+        return challenge_id.startswith(SIGNED_CHALLENGE_PREFIX)
+
+    async def verify(self, challenge_id: str, identity_id: str, nonce: str) -> bool:
+        try:
+            exp_str, mac_b64 = challenge_id[len(SIGNED_CHALLENGE_PREFIX):].split(".", 1)
+            exp = int(exp_str)
+            mac = base64.urlsafe_b64decode(mac_b64 + "=" * (-len(mac_b64) % 4))
+        except (ValueError, TypeError):
+            self._count("_rejected_mac")
+            return False
+        if not hmac.compare_digest(mac, self._mac(identity_id, nonce, exp)):
+            self._count("_rejected_mac")
+            return False
+        now = time.time()
+        if exp <= now or exp > now + self._ttl + 1:
+            self._count("_rejected_expired")
+            return False
+        if not await self._replay.mark_if_new(mac, exp):
+            self._count("_rejected_replay")
+            return False
+        self._count("_accepted")
+        return True
+
+    def _count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "mode": "signed",
+                "ttl_sec": self._ttl,
+                "issued": self._issued,
+                "accepted": self._accepted,
+                "rejected_mac": self._rejected_mac,
+                "rejected_expired": self._rejected_expired,
+                "rejected_replay": self._rejected_replay,
+            }
+        stats["replay_filter"] = self._replay.get_stats()
+        return stats
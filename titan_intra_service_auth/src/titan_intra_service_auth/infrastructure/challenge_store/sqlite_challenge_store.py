@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+🎟️ SQLITE CHALLENGE STORE — challenges compartilhados entre workers
+===================================================================
+Tabela WAL local (mesmo host): o challenge emitido pelo worker A é resgatado
+no worker B. pop-once atômico via DELETE ... RETURNING (o DELETE é o árbitro:
+apenas uma conexão remove a linha). I/O roda num pool pequeno, fora do event loop.
+TTL por linha (expires_at, relógio de parede comum aos processos) + índice para
+o sweep de fundo remover expirados por range scan.
+put_many: COUNT dos pendentes da identity (índice identity_id) + executemany na mesma
+transação de escrita — o teto por identity vale entre workers.
+Tamanho da tabela em challenge_counters, mantido por triggers de INSERT/DELETE na mesma
+transação (qualquer worker): get_stats lê uma linha pela PK, sem COUNT(*) por sweep.
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000003
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from titan_intra_service_auth.application.ports.challenge_store_port import ChallengeStorePort
+from titan_intra_service_auth.infrastructure.ca.sqlite_pool import SQLiteConnectionPool
+
+_MAX_CHALLENGES = 50000
+_DEFAULT_TTL_SEC = 60.0
+# A cada N puts deste processo, corta linhas além de max_challenges (por rowid, sem COUNT)
+_TRIM_EVERY_PUTS = 1024
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+# Sweep em lotes: cada transação segura o lock de escrita por pouco tempo
+_SWEEP_BATCH = 4096
+
+# Tamanho vivo da tabela (o DELETE implícito do INSERT OR REPLACE não dispara trigger, mas
+# challenge_id é UUID v4 — colisão não acontece na prática)
+_SIZE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_challenges_size_insert AFTER INSERT ON challenges
+    BEGIN
+        UPDATE challenge_counters SET value = value + 1 WHERE name = 'size';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_challenges_size_delete AFTER DELETE ON challenges
+    BEGIN
+        UPDATE challenge_counters SET value = value - 1 WHERE name = 'size';
+    END
+    """,
+)
+
+
+class SQLiteChallengeStore(ChallengeStorePort):
+    """
+    challenge_id -> (identity_id, nonce) numa tabela SQLite WAL.
+    Todos os workers Uvicorn apontam para o mesmo arquivo (TITAN_CHALLENGE_DB_PATH).
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_challenges: int = _MAX_CHALLENGES,
+        ttl_sec: float = _DEFAULT_TTL_SEC,
+        num_threads: int = 4,
+    ) -> None:
+        _base = Path(__file__).resolve().parent.parent.parent.parent.parent
+        self._db_path = db_path or os.environ.get(
+            "TITAN_CHALLENGE_DB_PATH",
+            str(_base / "data" / "zkp_challenges.db"),
+        )
+        Path(self._db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._max = max_challenges
+        self._ttl = ttl_sec
+        self._pool = SQLiteConnectionPool(self._db_path, max_connections=num_threads)
+        self._executor = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="titan-challenge-")
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._pops_hit = 0
+        self._pops_miss = 0
+        self._expired = 0
+        self._trimmed = 0
+        self._batch_capped = 0
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self._pool.connection() as conn, conn:
+            # Transação de escrita: workers subindo juntos não semeiam o contador duas vezes
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS challenges (
+                    challenge_id TEXT PRIMARY KEY,
+                    identity_id TEXT NOT NULL,
+                    nonce TEXT NOT NULL,
+                    expires_at REAL NOT NULL DEFAULT 0
+                )
+            """)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(challenges)")}
+            if "expires_at" not in columns:
+                conn.execute("ALTER TABLE challenges ADD COLUMN expires_at REAL NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_challenges_expires ON challenges(expires_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_challenges_identity ON challenges(identity_id)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS challenge_counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            for trigger in _SIZE_TRIGGERS:
+                conn.execute(trigger)
+            # Banco anterior aos triggers: semeia com um COUNT(*) único
+            conn.execute(
+                "INSERT OR IGNORE INTO challenge_counters (name, value) "
+                "SELECT 'size', COUNT(*) FROM challenges"
+            )
+
+    def _put_sync(self, challenge_id: str, identity_id: str, nonce: str) -> None:
+        with self._pool.connection() as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO challenges (challenge_id, identity_id, nonce, expires_at) VALUES (?, ?, ?, ?)",
+                (challenge_id, identity_id, nonce, time.time() + self._ttl),
+            )
+        with self._lock:
+            self._puts += 1
+            trim = self._puts % _TRIM_EVERY_PUTS == 0
+        if trim:
+            self._trim_sync()
+
+    def _put_many_sync(self, identity_id: str, challenges: Sequence[Tuple[str, str]], max_outstanding: int) -> int:
+        now = time.time()
+        with self._pool.connection() as conn, conn:
+            # Trava de escrita antes do COUNT: dois workers não passam do teto juntos
+            conn.execute("BEGIN IMMEDIATE")
+            outstanding = conn.execute(
+                "SELECT COUNT(*) AS c FROM challenges WHERE identity_id = ? AND expires_at > ?",
+                (identity_id, now),
+            ).fetchone()["c"]
+            granted = challenges[: max(0, max_outstanding - outstanding)]
+            expires_at = now + self._ttl
+            conn.executemany(
+                "INSERT OR REPLACE INTO challenges (challenge_id, identity_id, nonce, expires_at) VALUES (?, ?, ?, ?)",
+                [(challenge_id, identity_id, nonce, expires_at) for challenge_id, nonce in granted],
+            )
+        with self._lock:
+            before = self._puts
+            self._puts += len(granted)
+            if len(granted) < len(challenges):
+                self._batch_capped += 1
+            trim = self._puts // _TRIM_EVERY_PUTS != before // _TRIM_EVERY_PUTS
+        if trim:
+            self._trim_sync()
+        return len(granted)
+
+    def _trim_sync(self) -> None:
+        """Descarta as linhas mais antigas além de max_challenges (rowid crescente = ordem de emissão)."""
+        with self._pool.connection() as conn, conn:
+            cur = conn.execute(
+                "DELETE FROM challenges WHERE rowid <= (SELECT MAX(rowid) FROM challenges) - ?",
+                (self._max,),
+            )
+        with self._lock:
+            self._trimmed += max(cur.rowcount, 0)
+
+    def _pop_sync(self, challenge_id: str) -> Optional[Tuple[str, str]]:
+        with self._pool.connection() as conn, conn:
+            if _HAS_RETURNING:
+                rows = conn.execute(
+                    "DELETE FROM challenges WHERE challenge_id = ? RETURNING identity_id, nonce, expires_at",
+                    (challenge_id,),
+                ).fetchall()
+                row = rows[0] if rows else None
+            else:
+                row = conn.execute(
+                    "SELECT identity_id, nonce, expires_at FROM challenges WHERE challenge_id = ?",
+                    (challenge_id,),
+                ).fetchone()
+                if row is not None:
+                    cur = conn.execute("DELETE FROM challenges WHERE challenge_id = ?", (challenge_id,))
+                    if cur.rowcount != 1:
+                        row = None
+        expired = row is not None and row["expires_at"] <= time.time()
+        with self._lock:
+            if row is None:
+                self._pops_miss += 1
+            elif expired:
+                self._expired += 1
+            else:
+                self._pops_hit += 1
+        if row is None or expired:
+            return None
+        return row["identity_id"], row["nonce"]
+
+    def _sweep_sync(self) -> int:
+        """Remove expirados em lotes (range scan no índice); o tamanho segue pelos triggers."""
+        total = 0
+        while True:
+            with self._pool.connection() as conn, conn:
+                cur = conn.execute(
+                    "DELETE FROM challenges WHERE rowid IN "
+                    "(SELECT rowid FROM challenges WHERE expires_at <= ? LIMIT ?)",
+                    (time.time(), _SWEEP_BATCH),
+                )
+            removed = max(cur.rowcount, 0)
+            total += removed
+            if removed < _SWEEP_BATCH:
+                break
+        with self._lock:
+            self._expired += total
+        return total
+
+    def _size_sync(self) -> int:
+        with self._pool.connection() as conn:
+            row = conn.execute("SELECT value FROM challenge_counters WHERE name = 'size'").fetchone()
+        return row["value"] if row else 0
+
+    async def put(self, challenge_id: str, identity_id: str, nonce: str) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._put_sync, challenge_id, identity_id, nonce)
+
+    async def put_many(
+        self,
+        identity_id: str,
+        challenges: Sequence[Tuple[str, str]],
+        max_outstanding: int,
+    ) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._put_many_sync, identity_id, challenges, max_outstanding
+        )
+
+    async def pop(self, challenge_id: str) -> Optional[Tuple[str, str]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._pop_sync, challenge_id)
+
+    async def sweep_expired(self) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._sweep_sync)
+
+    def get_stats(self) -> Dict[str, Any]:
+        size = self._size_sync()
+        with self._lock:
+            stats = {
+                "backend": "sqlite",
+                "size": size,
+                "max_challenges": self._max,
+                "ttl_sec": self._ttl,
+                "puts": self._puts,
+                "pops_hit": self._pops_hit,
+                "pops_miss": self._pops_miss,
+                "expired": self._expired,
+                "evicted_under_pressure": self._trimmed,
+                "batch_capped": self._batch_capped,
+            }
+        stats["db_pool"] = self._pool.get_stats()
+        return stats
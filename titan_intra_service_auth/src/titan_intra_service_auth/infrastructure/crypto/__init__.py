@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
-"""Crypto adapters — RSA (legado) e ECDSA ES256 (default pipeline)."""
+"""Crypto adapters — RSA (legado) e ECDSA ES256 (default pipeline; modo thread ou process); cache de reuso de token."""
 
 from .ecdsa_signer_adapter import EcdsaSignerAdapter
+from .es256_fast_encoder import Es256JwsEncoder
+from .process_signer_adapter import ProcessPoolSignerAdapter
 from .rsa_signer_adapter import RsaSignerAdapter
+from .token_reuse_cache import TokenReuseCache
 
-__all__ = ["EcdsaSignerAdapter", "RsaSignerAdapter"]
+__all__ = ["EcdsaSignerAdapter", "Es256JwsEncoder", "ProcessPoolSignerAdapter", "RsaSignerAdapter", "TokenReuseCache"]
@@ -3,7 +3,7 @@
 Adapter: EcdsaSignerAdapter — implements CryptoPort using ECDSA (PyJWT + cryptography).
 Curva elíptica P-256 (SECP256R1) = ES256 — melhor performance e segurança que RSA 512.
 Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
-Micro-revisão: 000000001 — Pipeline multi-lane 1 proc + 2 threads por camada.
+Micro-revisão: 000000002 — Fast path ES256 (Es256JwsEncoder) com chave já carregada.
 """
 
 import os
@@ -15,6 +15,7 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 
 from titan_intra_service_auth.application.ports.crypto_port import CryptoPort
+from titan_intra_service_auth.infrastructure.crypto.es256_fast_encoder import Es256JwsEncoder
 
 try:
     from colorama import Fore
@@ -31,11 +32,15 @@ class EcdsaSignerAdapter(CryptoPort):
     Assina payloads JWT com ES256 usando par de chaves ECDSA P-256 em memória.
     Responsabilidade única: implementar CryptoPort (SOLID S).
     ECDSA é mais rápido que RSA para assinaturas e produz tokens menores.
+    fast_path=True (ES256): Es256JwsEncoder em vez de jwt.encode (sem re-parse do PEM por mint).
     """
 
-    def __init__(self, algorithm: str = JWT_ALGORITHM_ES256) -> None:
+    def __init__(self, algorithm: str = JWT_ALGORITHM_ES256, fast_path: bool = True) -> None:
         self._algorithm = algorithm
         self._pem_private: str = ""
+        self._public_pem: str = ""
+        self._encoder: Es256JwsEncoder | None = None
+        self._fast_path = fast_path and algorithm == JWT_ALGORITHM_ES256
         self._initialize()
 
     def _initialize(self) -> None:
@@ -49,9 +54,22 @@ class EcdsaSignerAdapter(CryptoPort):
                 format=serialization.PrivateFormat.PKCS8,
                 encryption_algorithm=serialization.NoEncryption(),
             ).decode()
+            self._public_pem = private_key.public_key().public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            ).decode()
+            if self._fast_path:
+                self._encoder = Es256JwsEncoder(private_key)
         except Exception as e:
             print(f"{Fore.RED}❌ [SECURITY] Falha ao gerar chave ECDSA: {e}")
             raise
 
+    @property
+    def public_key_pem(self) -> str:
+        """Chave pública (SubjectPublicKeyInfo PEM) para verificar os tokens emitidos."""
+        return self._public_pem
+
     def sign(self, payload: Dict[str, Any]) -> str:
+        if self._encoder is not None:
+            return self._encoder.encode(payload)
         return jwt.encode(payload, self._pem_private, algorithm=self._algorithm)
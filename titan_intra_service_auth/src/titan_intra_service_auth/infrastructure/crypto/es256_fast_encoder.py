@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Es256JwsEncoder — encoder JWS ES256 especializado (fast path do EcdsaSignerAdapter).
+jwt.encode(payload, pem) re-parseia a chave PEM, re-serializa o header constante e
+faz json.dumps genérico a cada mint. Aqui: chave já carregada, segmento de header
+base64url pré-computado, JSON compacto (orjson se instalado) e assinatura direta no
+cryptography com conversão DER → raw r||s (RFC 7518 §3.4). Saída verificável por PyJWT.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000001
+"""
+
+import base64
+import json
+from calendar import timegm
+from datetime import datetime
+from typing import Any, Dict
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+try:
+    import orjson
+
+    def _dumps(obj: Dict[str, Any]) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    _encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def _dumps(obj: Dict[str, Any]) -> bytes:
+        return _encoder.encode(obj).encode()
+
+
+# Mesmo header que PyJWT gera (sort_keys=True, separators compactos)
+_HEADER_ES256 = b'{"alg":"ES256","typ":"JWT"}'
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+# P-256: r e s têm 32 bytes cada
+_P256_COORD_BYTES = 32
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+class Es256JwsEncoder:
+    """Assina payloads JWT com ES256 usando a chave P-256 já carregada (sem PEM por chamada)."""
+
+    def __init__(self, private_key: ec.EllipticCurvePrivateKey) -> None:
+        if not isinstance(private_key.curve, ec.SECP256R1):
+            raise ValueError("Es256JwsEncoder requer chave P-256 (SECP256R1)")
+        self._key = private_key
+        self._ecdsa = ec.ECDSA(hashes.SHA256())
+        self._header_segment = _b64url(_HEADER_ES256) + b"."
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        # Mesma conversão de claims temporais que PyJWT (datetime → NumericDate int)
+        claims = payload
+        for claim in _TIME_CLAIMS:
+            value = payload.get(claim)
+            if isinstance(value, datetime):
+                if claims is payload:
+                    claims = dict(payload)
+                claims[claim] = timegm(value.utctimetuple())
+
+        signing_input = self._header_segment + _b64url(_dumps(claims))
+        der = self._key.sign(signing_input, self._ecdsa)
+        r, s = decode_dss_signature(der)
+        raw = r.to_bytes(_P256_COORD_BYTES, "big") + s.to_bytes(_P256_COORD_BYTES, "big")
+        return (signing_input + b"." + _b64url(raw)).decode()
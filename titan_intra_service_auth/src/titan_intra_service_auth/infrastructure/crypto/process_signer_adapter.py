@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Adapter: ProcessPoolSignerAdapter — CryptoPort com assinatura em processos dedicados.
+No modo thread, JSON/base64/montagem do JWT ficam sob o GIL e o TPS satura antes dos
+cores. Aqui N processos signer de vida longa recebem a chave uma vez (PKCS8 DER no
+initializer, carregada num Es256JwsEncoder por processo) e trocam tuplas compactas
+(iss, sub, iat, exp, jti, scope) em vez de dicts com datetime.
+As threads do ConcurrencyAdapter só aguardam o future (GIL liberado).
+Processos criados por spawn: fork de um worker Uvicorn com event loop, locks e threads
+vivos herda esse estado pela metade (deadlock/crash no filho); spawn parte de interpretador limpo.
+Só ES256 — o initializer carrega uma chave P-256 no Es256JwsEncoder.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+import multiprocessing
+from calendar import timegm
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from titan_intra_service_auth.application.ports.crypto_port import CryptoPort
+from titan_intra_service_auth.infrastructure.crypto.es256_fast_encoder import Es256JwsEncoder
+
+# Ordem das claims do TokenClaim.to_jwt_payload (o JSON sai na mesma ordem)
+_COMPACT_KEYS = ("iss", "sub", "iat", "exp", "jti", "scope")
+_COMPACT_KEYSET = frozenset(_COMPACT_KEYS)
+
+# Estado do processo signer (preenchido no initializer)
+_ENCODER: Optional[Es256JwsEncoder] = None
+
+
+def _init_signer(pkcs8_der: bytes) -> None:
+    global _ENCODER
+    key = serialization.load_der_private_key(pkcs8_der, password=None)
+    _ENCODER = Es256JwsEncoder(key)
+
+
+def _sign_in_child(item: Union[Tuple[Any, ...], Dict[str, Any]]) -> str:
+    if isinstance(item, tuple):
+        item = dict(zip(_COMPACT_KEYS, item))
+    return _ENCODER.encode(item)
+
+
+def _sign_batch_in_child(items: List[Union[Tuple[Any, ...], Dict[str, Any]]]) -> List[str]:
+    return [_sign_in_child(item) for item in items]
+
+
+def _numeric_date(value: Any) -> Any:
+    return timegm(value.utctimetuple()) if isinstance(value, datetime) else value
+
+
+def _to_compact(payload: Dict[str, Any]) -> Union[Tuple[Any, ...], Dict[str, Any]]:
+    """Payload padrão → tupla com NumericDate int; qualquer outro formato segue como dict."""
+    if payload.keys() == _COMPACT_KEYSET:
+        return tuple(_numeric_date(payload[k]) for k in _COMPACT_KEYS)
+    return {k: (_numeric_date(v) if k in ("exp", "iat", "nbf") else v) for k, v in payload.items()}
+
+
+class ProcessPoolSignerAdapter(CryptoPort):
+    """
+    Assina ES256 em um ProcessPoolExecutor de processos signer com a chave pré-carregada.
+    Mesma chave em todos os processos → tokens verificáveis por uma única public_key_pem.
+    """
+
+    def __init__(self, num_processes: int, private_key: Optional[ec.EllipticCurvePrivateKey] = None) -> None:
+        key = private_key or ec.generate_private_key(ec.SECP256R1())
+        pkcs8_der = key.private_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        self._public_pem = key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        self._num_processes = max(1, num_processes)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self._num_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_signer,
+            initargs=(pkcs8_der,),
+        )
+
+    @property
+    def public_key_pem(self) -> str:
+        return self._public_pem
+
+    @property
+    def num_processes(self) -> int:
+        return self._num_processes
+
+    def sign(self, payload: Dict[str, Any]) -> str:
+        return self._pool.submit(_sign_in_child, _to_compact(payload)).result()
+
+    def sign_many(self, payloads: List[Dict[str, Any]]) -> List[str]:
+        # Um único round-trip IPC para o lote inteiro
+        return self._pool.submit(_sign_batch_in_child, [_to_compact(p) for p in payloads]).result()
+
+    def close(self) -> None:
+        """Encerra os processos signer."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+♻️ TOKEN REUSE CACHE — Reuso de token recente por (subject, scope)
+==================================================================
+Serviços internos pedem token novo para a mesma identidade/scope várias vezes por minuto,
+embora o token viva TOKEN_EXP_HOURS. Cada pedido pagava uma assinatura ECDSA nova.
+Com este cache (opt-in), o mint devolve o último token de (subject, scope) enquanto:
+  - ele foi mintado há no máximo max_age_sec (limita quanto tempo um token é repetido); e
+  - restam pelo menos min_remaining_sec de vida (o cliente nunca recebe token quase vencido).
+LRU limitado (OrderedDict) e thread-safe; revogação no CA remove todos os scopes do subject
+via listener do CARepository — na hora no processo que revoga e, para revogações de outros
+processos (ca_server, outro worker), no poll do log identity_revocations.
+
+Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Produto: Titan ZKP Auth — Token Reuse Cache
+Micro-revisão: 000000002
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from titan_intra_service_auth.application.ports.token_cache_port import TokenCachePort
+
+_DEFAULT_MAX_ENTRIES = 10000
+_DEFAULT_MAX_AGE_SEC = 60.0
+_DEFAULT_MIN_REMAINING_SEC = 3600.0
+
+
+class TokenReuseCache(TokenCachePort):
+    """
+    (subject, scope) → (token, mintado em [monotonic], exp [epoch]).
+    Índice subject → scopes para invalidar todos os tokens de uma identidade revogada.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+        max_age_sec: float = _DEFAULT_MAX_AGE_SEC,
+        min_remaining_sec: float = _DEFAULT_MIN_REMAINING_SEC,
+    ) -> None:
+        self._max = max(1, max_entries)
+        self._max_age = max_age_sec
+        self._min_remaining = min_remaining_sec
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float, int]]" = OrderedDict()
+        self._scopes: Dict[str, Set[str]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._stale_stores = 0
+        # Incrementa a cada invalidação: token assinado durante uma revogação não é cacheado
+        self._generation = 0
+
+    def lookup(self, subject: str, scope: str) -> Optional[Tuple[str, int]]:
+        key = (subject, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                token, minted_at, expires_at = entry
+                remaining = expires_at - int(time.time())
+                if time.monotonic() - minted_at <= self._max_age and remaining >= self._min_remaining:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return token, remaining
+                self._remove_locked(key)
+                self._expirations += 1
+            self._misses += 1
+            return None
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def store(self, subject: str, scope: str, token: str, expires_at: int, generation: int) -> None:
+        key = (subject, scope)
+        with self._lock:
+            if generation != self._generation:
+                self._stale_stores += 1
+                return
+            self._entries[key] = (token, time.monotonic(), expires_at)
+            self._entries.move_to_end(key)
+            self._scopes.setdefault(subject, set()).add(scope)
+            while len(self._entries) > self._max:
+                self._remove_locked(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate_subject(self, subject: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for scope in self._scopes.pop(subject, ()):
+                if self._entries.pop((subject, scope), None) is not None:
+                    self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._scopes.clear()
+
+    def _remove_locked(self, key: Tuple[str, str]) -> None:
+        del self._entries[key]
+        subject, scope = key
+        scopes = self._scopes.get(subject)
+        if scopes is not None:
+            scopes.discard(scope)
+            if not scopes:
+                del self._scopes[subject]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self._max,
+                "max_age_sec": self._max_age,
+                "min_remaining_sec": self._min_remaining,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate_pct": round(self._hits / lookups * 100, 2) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "stale_stores": self._stale_stores,
+            }
@@ -5,65 +5,338 @@ Worker entry point: build_app_for_worker() cria app por processo (sem Manager) p
 Elias Andrade — Replika AI Solutions
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from titan_intra_service_auth.application.ports.challenge_store_port import ChallengeStorePort
+from titan_intra_service_auth.application.ports.crypto_port import CryptoPort
 from titan_intra_service_auth.application.ports.metrics_port import MetricsPort
+from titan_intra_service_auth.application.ports.sign_batcher_port import SignBatcherPort
+from titan_intra_service_auth.application.ports.token_cache_port import TokenCachePort
 from titan_intra_service_auth.application.use_cases.mint_token import MintTokenUseCase
-from titan_intra_service_auth.config import get_settings
+from titan_intra_service_auth.config import Settings, get_settings
 from titan_intra_service_auth.domain import TokenMintingDomainService
-from titan_intra_service_auth.infrastructure.crypto import EcdsaSignerAdapter
+from titan_intra_service_auth.infrastructure.crypto import EcdsaSignerAdapter, ProcessPoolSignerAdapter, TokenReuseCache
 from titan_intra_service_auth.infrastructure.observability import (
+    BackgroundJobs,
+    CoDelAdmissionController,
     ConcurrencyAdapter,
+    VegasConcurrencyLimit,
+    FleetMetricsAdapter,
+    MetricsSegment,
+    MintBatchScheduler,
+    ProcessStatsSampler,
+    PrometheusExporter,
+    StageTimingRecorder,
+    TelemetryBroadcaster,
     create_local_metrics_adapter,
 )
 from titan_intra_service_auth.infrastructure.http.middleware.telemetry_middleware import (
     TelemetryMiddleware,
 )
-from titan_intra_service_auth.infrastructure.ca import CARepository, CAService
+from titan_intra_service_auth.infrastructure.ca import (
+    CARepository,
+    CAService,
+    CAVerifyPipeline,
+    PublicKeyCache,
+)
+from titan_intra_service_auth.infrastructure.challenge_store import (
+    EpochProofVerifier,
+    InMemoryChallengeStore,
+    SignedChallengeCodec,
+    SQLiteChallengeStore,
+    SQLiteReplayGuard,
+    TimeBucketedBloomFilter,
+    load_or_create_challenge_secret,
+)
 from titan_intra_service_auth.infrastructure.zkp_metrics import ZKPMetricsStore
 from titan_intra_service_auth.infrastructure.http.routes.auth_routes import register_auth_routes
 from titan_intra_service_auth.infrastructure.http.routes.health_routes import register_health_routes
+from titan_intra_service_auth.infrastructure.http.routes.metrics_routes import register_metrics_routes
 from titan_intra_service_auth.infrastructure.http.routes.stats_routes import register_stats_routes
+from titan_intra_service_auth.infrastructure.http.routes.telemetry_stream_routes import (
+    register_telemetry_stream_routes,
+)
 from titan_intra_service_auth.infrastructure.http.routes.zkp_routes import register_zkp_routes
 
 
+def create_challenge_store(settings: Settings) -> ChallengeStorePort:
+    """Escolhe o backend de challenges: compartilhado entre workers quando há mais de um."""
+    backend = settings.CHALLENGE_STORE_BACKEND
+    if backend == "auto":
+        backend = "sqlite" if settings.UVCORN_WORKERS > 1 else "memory"
+    if backend == "sqlite":
+        return SQLiteChallengeStore(
+            max_challenges=settings.CHALLENGE_MAX_OUTSTANDING,
+            ttl_sec=settings.CHALLENGE_TTL_SEC,
+        )
+    return InMemoryChallengeStore(
+        max_challenges=settings.CHALLENGE_MAX_OUTSTANDING,
+        ttl_sec=settings.CHALLENGE_TTL_SEC,
+    )
+
+
+def create_metrics_adapter(settings: Settings) -> MetricsPort:
+    """Métricas do worker; com mais de um worker, publica num segmento mmap agregado no /stats."""
+    local = create_local_metrics_adapter(settings.VERSION, settings.UVCORN_WORKERS)
+    backend = settings.METRICS_BACKEND
+    if backend == "auto":
+        backend = "segment" if settings.UVCORN_WORKERS > 1 else "local"
+    if backend != "segment":
+        return local
+    return FleetMetricsAdapter(
+        local=local,
+        segment=MetricsSegment(num_slots=settings.METRICS_SEGMENT_SLOTS),
+        stale_after_sec=max(5.0, settings.METRICS_PUBLISH_INTERVAL_SEC * 10),
+    )
+
+
+def create_admission_controller(
+    settings: Settings, metrics: MetricsPort, lane: str
+) -> Optional[CoDelAdmissionController]:
+    """Controle de admissão CoDel de uma lane (mint, verify); estado alimenta o circuit_breaker."""
+    if not settings.ADMISSION_CONTROL_ENABLED:
+        return None
+    return CoDelAdmissionController(
+        target_ms=settings.ADMISSION_TARGET_MS,
+        interval_ms=settings.ADMISSION_INTERVAL_MS,
+        max_queue=settings.MAX_QUEUE_CAPACITY,
+        on_state_change=lambda overloaded: metrics.set_overloaded(lane, overloaded),
+    )
+
+
+def create_concurrency_limit(settings: Settings, initial_slots: int) -> Optional[VegasConcurrencyLimit]:
+    """Limite adaptativo de slots de uma lane, partindo do valor fixo configurado."""
+    if not settings.ADAPTIVE_CONCURRENCY_ENABLED:
+        return None
+    return VegasConcurrencyLimit(
+        initial_limit=initial_slots,
+        min_limit=min(settings.ADAPTIVE_MIN_SLOTS, initial_slots),
+        max_limit=max(initial_slots, int(initial_slots * settings.ADAPTIVE_MAX_SLOTS_FACTOR)),
+        alpha=settings.ADAPTIVE_QUEUE_ALPHA,
+        beta=settings.ADAPTIVE_QUEUE_ALPHA * 2,
+    )
+
+
+def create_signer(settings: Settings) -> CryptoPort:
+    """Signer do mint: ECDSA no pool de threads do worker ou em processos signer dedicados."""
+    if settings.SIGNING_MODE == "process":
+        if settings.JWT_ALGORITHM.upper() != "ES256":
+            raise ValueError(
+                f"TITAN_SIGNING_MODE=process só assina ES256 (TITAN_JWT_ALGORITHM={settings.JWT_ALGORITHM})"
+            )
+        return ProcessPoolSignerAdapter(num_processes=settings.SIGNER_PROCESSES)
+    return EcdsaSignerAdapter(algorithm=settings.JWT_ALGORITHM, fast_path=settings.JWS_FAST_PATH)
+
+
+def create_replay_guard(settings: Settings) -> Optional[SQLiteReplayGuard]:
+    """Anti-replay (challenges assinados, proofs de época) comum aos workers do host; None = Bloom por worker."""
+    backend = settings.REPLAY_FILTER_BACKEND
+    if backend == "auto":
+        backend = "sqlite" if settings.UVCORN_WORKERS > 1 else "bloom"
+    if backend != "sqlite":
+        return None
+    return SQLiteReplayGuard()
+
+
+def create_signed_challenges(
+    settings: Settings, replay_guard: Optional[SQLiteReplayGuard] = None
+) -> Optional[SignedChallengeCodec]:
+    """Codec HMAC de challenges stateless (TITAN_CHALLENGE_MODE=signed); None no modo stored."""
+    if settings.CHALLENGE_MODE != "signed":
+        return None
+    return SignedChallengeCodec(
+        secret=load_or_create_challenge_secret(),
+        ttl_sec=settings.CHALLENGE_TTL_SEC,
+        replay_filter=replay_guard
+        or TimeBucketedBloomFilter(
+            window_sec=settings.CHALLENGE_TTL_SEC,
+            num_bits=settings.REPLAY_FILTER_BITS,
+            num_hashes=settings.REPLAY_FILTER_HASHES,
+        ),
+    )
+
+
+def create_epoch_proofs(
+    settings: Settings, replay_guard: Optional[SQLiteReplayGuard] = None
+) -> Optional[EpochProofVerifier]:
+    """Verificador do mint em uma ida (TITAN_ZKP_EPOCH_PROOF=1); None desliga o modo."""
+    if not settings.ZKP_EPOCH_PROOF_ENABLED:
+        return None
+    return EpochProofVerifier(
+        epoch_sec=settings.ZKP_EPOCH_SEC,
+        max_skew_epochs=settings.ZKP_EPOCH_MAX_SKEW,
+        replay_filter=replay_guard
+        or TimeBucketedBloomFilter(
+            window_sec=settings.ZKP_EPOCH_SEC,
+            num_bits=settings.REPLAY_FILTER_BITS,
+            num_hashes=settings.REPLAY_FILTER_HASHES,
+        ),
+    )
+
+
+def create_token_cache(settings: Settings) -> Optional[TokenCachePort]:
+    """Reuso de token por (subject, scope) no mint (TITAN_MINT_TOKEN_CACHE=1); None desliga."""
+    if not settings.MINT_TOKEN_CACHE_ENABLED:
+        return None
+    return TokenReuseCache(
+        max_entries=settings.MINT_TOKEN_CACHE_MAX_ENTRIES,
+        max_age_sec=settings.MINT_TOKEN_CACHE_MAX_AGE_SEC,
+        min_remaining_sec=settings.MINT_TOKEN_CACHE_MIN_REMAINING_SEC,
+    )
+
+
 def create_app(
     metrics: MetricsPort,
     mint_use_case: MintTokenUseCase,
+    mint_batcher: Optional[SignBatcherPort] = None,
+    mint_concurrency: Optional[ConcurrencyAdapter] = None,
+    token_cache: Optional[TokenCachePort] = None,
+    signer: Optional[CryptoPort] = None,
 ) -> FastAPI:
     """
     Creates and returns the FastAPI app. Dependencies injected (no global state for use case/metrics).
     Definida antes de build_app_for_worker para evitar NameError no import.
     """
     settings = get_settings()
+    # Jobs periódicos iniciados no startup do worker; no shutdown, cancelados e seguidos dos hooks
+    background_jobs = BackgroundJobs()
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        background_jobs.start()
+        yield
+        background_jobs.stop()
+
     app = FastAPI(
         title=settings.APP_NAME,
         version=settings.VERSION,
         docs_url="/api/docs",
         redoc_url="/api/redoc",
+        lifespan=lifespan,
     )
     app.state.metrics = metrics
     app.state.mint_use_case = mint_use_case
+    stage_timings = StageTimingRecorder(
+        sample_rate=settings.STAGE_TIMING_SAMPLE_RATE,
+        server_timing=settings.SERVER_TIMING_ENABLED,
+    )
+    app.state.stage_timings = stage_timings
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["X-Performance-TPS", "X-Request-ID", "X-Engine-Lat"],
+        expose_headers=["X-Performance-TPS", "X-Request-ID", "X-Engine-Lat", "Server-Timing"],
     )
     app.add_middleware(TelemetryMiddleware)
 
+    if isinstance(signer, ProcessPoolSignerAdapter):
+        background_jobs.add_shutdown_hook("signer_pool", signer.close)
+
+    if isinstance(metrics, FleetMetricsAdapter):
+        background_jobs.add("metrics_publish", metrics.publish, settings.METRICS_PUBLISH_INTERVAL_SEC)
+        background_jobs.add_shutdown_hook("metrics_release", metrics.release)
+
     router = APIRouter()
-    ca_repository = CARepository()
-    ca_service = CAService(repository=ca_repository)
+    ca_repository = CARepository(
+        pool_size=settings.CA_DB_POOL_SIZE,
+        pool_checkout_timeout=settings.CA_DB_POOL_TIMEOUT_SEC,
+    )
+    ca_service = CAService(
+        repository=ca_repository,
+        pubkey_cache=PublicKeyCache(
+            max_entries=settings.PUBKEY_CACHE_MAX_ENTRIES,
+            ttl_sec=settings.PUBKEY_CACHE_TTL_SEC,
+        ),
+    )
+    if token_cache is not None:
+        # Revogação no CA (deste ou de outro processo, via poll abaixo) derruba os tokens reutilizáveis
+        ca_repository.add_revocation_listener(token_cache.invalidate_subject)
+    # Revogações feitas fora deste worker (ca_server, outro worker, script) → listeners acima
+    background_jobs.add(
+        "ca_revocation_poll",
+        lambda: asyncio.to_thread(ca_repository.poll_revocations),
+        settings.CA_REVOCATION_POLL_SEC,
+    )
+    verify_threads = settings.VERIFY_THREADS_PER_WORKER
+    verify_slots = verify_threads * settings.SEMAPHORE_MULTIPLIER
+    verify_pipeline = CAVerifyPipeline(
+        ca_service=ca_service,
+        num_threads=verify_threads,
+        semaphore_slots=verify_slots,
+        timeout_sec=settings.VERIFY_TIMEOUT_SEC,
+        admission=create_admission_controller(settings, metrics, "verify"),
+        limiter=create_concurrency_limit(settings, verify_slots),
+    )
     zkp_metrics = ZKPMetricsStore()
+    challenge_store = create_challenge_store(settings)
+    background_jobs.add("challenge_sweep", challenge_store.sweep_expired, settings.CHALLENGE_SWEEP_INTERVAL_SEC)
+    needs_replay_guard = settings.CHALLENGE_MODE == "signed" or settings.ZKP_EPOCH_PROOF_ENABLED
+    replay_guard = create_replay_guard(settings) if needs_replay_guard else None
+    if replay_guard is not None:
+        background_jobs.add("replay_sweep", replay_guard.sweep_expired, settings.CHALLENGE_SWEEP_INTERVAL_SEC)
+    signed_challenges = create_signed_challenges(settings, replay_guard)
+    epoch_proofs = create_epoch_proofs(settings, replay_guard)
+
+    # psutil + COUNT(*) do CA amostrados em background; /metrics e /stats só leem a última amostra
+    process_stats = ProcessStatsSampler(ca_repository=ca_repository)
+    background_jobs.add("process_stats", process_stats.sample, settings.PROCESS_STATS_INTERVAL_SEC)
 
     register_health_routes(router, metrics)
-    register_auth_routes(router, mint_use_case, metrics)
-    register_stats_routes(router, metrics, zkp_metrics=zkp_metrics, ca_repository=ca_repository)
-    register_zkp_routes(router, ca_service, mint_use_case, metrics, zkp_metrics)
+    register_metrics_routes(router, PrometheusExporter(metrics, zkp_metrics, process_stats, token_cache=token_cache))
+    register_auth_routes(router, mint_use_case, metrics, max_body_bytes=settings.MAX_MINT_BODY_BYTES)
+    stats_snapshot = register_stats_routes(
+        router,
+        metrics,
+        zkp_metrics=zkp_metrics,
+        ca_repository=ca_repository,
+        ca_service=ca_service,
+        verify_pipeline=verify_pipeline,
+        challenge_store=challenge_store,
+        signed_challenges=signed_challenges,
+        epoch_proofs=epoch_proofs,
+        mint_batcher=mint_batcher,
+        mint_concurrency=mint_concurrency,
+        token_cache=token_cache,
+        background_jobs=background_jobs,
+        stage_timings=stage_timings,
+        process_stats=process_stats,
+        refresh_interval_sec=settings.STATS_REFRESH_INTERVAL_SEC,
+    )
+    if stats_snapshot.refresh_interval_sec > 0:
+        background_jobs.add("stats_refresh", stats_snapshot.refresh, stats_snapshot.refresh_interval_sec)
+    # Dashboards: um produtor SSE lê o mesmo snapshot e transmite deltas a todos os inscritos
+    telemetry_stream = TelemetryBroadcaster(
+        source=stats_snapshot.get_data,
+        interval_sec=settings.TELEMETRY_STREAM_INTERVAL_SEC,
+        max_subscribers=settings.TELEMETRY_STREAM_MAX_SUBSCRIBERS,
+        queue_size=settings.TELEMETRY_STREAM_QUEUE_FRAMES,
+    )
+    background_jobs.add_shutdown_hook("telemetry_stream", telemetry_stream.close)
+    register_telemetry_stream_routes(router, telemetry_stream)
+    register_zkp_routes(
+        router,
+        ca_service,
+        verify_pipeline,
+        challenge_store,
+        mint_use_case,
+        metrics,
+        zkp_metrics,
+        signed_challenges=signed_challenges,
+        epoch_proofs=epoch_proofs,
+        mint_max_body_bytes=settings.MAX_MINT_BODY_BYTES,
+        identity_max_body_bytes=settings.MAX_IDENTITY_BODY_BYTES,
+        identity_batch_max_items=settings.IDENTITY_BATCH_MAX_ITEMS,
+        identity_batch_max_body_bytes=settings.MAX_IDENTITY_BATCH_BODY_BYTES,
+        challenge_batch_max=settings.CHALLENGE_BATCH_MAX,
+        challenge_max_per_identity=settings.CHALLENGE_MAX_PER_IDENTITY,
+    )
     app.include_router(router)
 
     return app
@@ -76,18 +349,31 @@ def build_app_for_worker() -> FastAPI:
     Pipeline: receive → mint (crypto em thread pool) → respond; métricas locais por worker.
     """
     settings = get_settings()
-    metrics = create_local_metrics_adapter(settings.VERSION, settings.UVCORN_WORKERS)
-    crypto = EcdsaSignerAdapter(algorithm=settings.JWT_ALGORITHM)
+    metrics = create_metrics_adapter(settings)
+    crypto = create_signer(settings)
     slots = settings.THREADS_PER_WORKER * settings.SEMAPHORE_MULTIPLIER
     concurrency = ConcurrencyAdapter(
         num_threads=settings.THREADS_PER_WORKER,
         semaphore_slots=slots,
+        execution_mode=settings.SIGNING_MODE,
+        stage_name="mint",
+        admission=create_admission_controller(settings, metrics, "mint"),
+        limiter=create_concurrency_limit(settings, slots),
     )
+    mint_batcher = None
+    if settings.MINT_BATCH_ENABLED:
+        mint_batcher = MintBatchScheduler(
+            crypto=crypto,
+            concurrency=concurrency,
+            max_batch_size=settings.MINT_BATCH_MAX_SIZE,
+            max_delay_us=settings.MINT_BATCH_MAX_DELAY_US,
+        )
     domain_service = TokenMintingDomainService(
         issuer=settings.JWT_ISSUER,
         exp_hours=settings.TOKEN_EXP_HOURS,
         default_scope="access_root",
     )
+    token_cache = create_token_cache(settings)
     mint_use_case = MintTokenUseCase(
         domain_service=domain_service,
         crypto=crypto,
@@ -95,8 +381,17 @@ def build_app_for_worker() -> FastAPI:
         concurrency=concurrency,
         exp_hours=settings.TOKEN_EXP_HOURS,
         engine_version=settings.VERSION,
+        batcher=mint_batcher,
+        token_cache=token_cache,
+    )
+    return create_app(
+        metrics=metrics,
+        mint_use_case=mint_use_case,
+        mint_batcher=mint_batcher,
+        mint_concurrency=concurrency,
+        token_cache=token_cache,
+        signer=crypto,
     )
-    return create_app(metrics=metrics, mint_use_case=mint_use_case)
 
 
 # Entry point para Uvicorn multi-worker: cada processo carrega o módulo e obtém app próprio
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Corpo JSON das rotas quentes (mint, identity) — leitura limitada, decode tipado, resposta pré-serializada.
+request.json() aceita qualquer tamanho, devolve dict genérico (campos via .get() sem tipo) e
+a resposta em dict ainda passa pelo jsonable_encoder + JSONResponse do FastAPI.
+Aqui: o corpo é lido em streaming com teto de bytes (413 antes de bufferizar o excesso),
+decodificado uma vez (orjson se instalado) direto para uma dataclass com slots e tipos
+conferidos campo a campo, e a resposta sai como bytes prontos num Response cru.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+import dataclasses
+import json
+import typing
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+
+    _loads: Callable[[bytes], Any] = orjson.loads
+
+    def dumps(obj: Dict[str, Any]) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    _loads = json.loads
+    _encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def dumps(obj: Dict[str, Any]) -> bytes:
+        return _encoder.encode(obj).encode()
+
+
+S = TypeVar("S")
+
+_JSON_MEDIA_TYPE = "application/json"
+
+
+class BodyDecodeError(ValueError):
+    """Corpo rejeitado: status_code 413 (grande demais) ou 422 (JSON inválido / campo com tipo errado)."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+
+
+# (nome, tipo aceito, obrigatório, default) por dataclass — montado uma vez por classe
+_Spec = Tuple[Tuple[str, type, bool, Any], ...]
+_SPECS: Dict[type, _Spec] = {}
+
+
+def _spec_for(cls: type) -> _Spec:
+    spec = _SPECS.get(cls)
+    if spec is None:
+        hints = typing.get_type_hints(cls)
+        fields = []
+        for f in dataclasses.fields(cls):
+            hint = hints[f.name]
+            # Optional[X] → X (None aceito pelo default); List[X] → list (itens conferidos pela rota)
+            if typing.get_origin(hint) is typing.Union:
+                hint = next(a for a in typing.get_args(hint) if a is not type(None))
+            kind = typing.get_origin(hint) or hint
+            required = f.default is dataclasses.MISSING
+            fields.append((f.name, kind, required, None if required else f.default))
+        spec = _SPECS[cls] = tuple(fields)
+    return spec
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """Corpo inteiro com teto: Content-Length acima do teto → 413 sem ler; chunked idem ao passar."""
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        raise BodyDecodeError(413, f"Corpo acima de {max_bytes} bytes")
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise BodyDecodeError(413, f"Corpo acima de {max_bytes} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def decode(body: bytes, cls: Type[S]) -> S:
+    """JSON objeto → instância de cls (dataclass de campos str/int/bool/list, opcionais com default; null = ausente)."""
+    try:
+        data = _loads(body)
+    except ValueError:
+        raise BodyDecodeError(422, "JSON inválido") from None
+    return decode_object(data, cls)
+
+
+def decode_object(data: Any, cls: Type[S]) -> S:
+    """Valor já decodificado (ex.: item de uma lista) → instância de cls, com as mesmas regras de decode."""
+    if not isinstance(data, dict):
+        raise BodyDecodeError(422, "Esperado um objeto JSON")
+    values = {}
+    for name, kind, required, default in _spec_for(cls):
+        value = data.get(name)
+        if value is None:
+            if required:
+                raise BodyDecodeError(422, f"{name} é obrigatório")
+            values[name] = default
+        elif type(value) is kind:
+            values[name] = value
+        else:
+            raise BodyDecodeError(422, f"{name} deve ser {kind.__name__}")
+    return cls(**values)
+
+
+async def read_json(request: Request, cls: Type[S], max_bytes: int) -> S:
+    """read_body + decode."""
+    return decode(await read_body(request, max_bytes), cls)
+
+
+def json_response(content: Dict[str, Any], status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Bytes já serializados num Response cru (sem jsonable_encoder nem segunda serialização)."""
+    return Response(content=dumps(content), status_code=status_code, headers=headers, media_type=_JSON_MEDIA_TYPE)
@@ -1,44 +1,124 @@
 # -*- coding: utf-8 -*-
 """
 Telemetry middleware: records request/response and latency via MetricsPort (from app.state).
-Never rejects; single lock section on entry and exit. Minimal work under lock.
-Elias Andrade — Replika AI Solutions
+ASGI puro (sem BaseHTTPMiddleware: nada de task extra nem memory streams por request).
+Headers X-Request-ID / X-Engine-Lat injetados no http.response.start; request id =
+prefixo do worker + contador; conexões ativas contadas no event loop e enviadas junto
+com o registro do request → uma única atualização de métricas por request. O request que
+responde já sai da contagem antes do registro (worker ocioso volta a reportar 0).
+Latência vai também para o histograma da rota (template, não o path cru).
+Requests amostrados (app.state.stage_timings) carregam um StageTrace no contexto; o
+último estágio (response_serialize) fecha no http.response.start.
+Elias Andrade — Replika AI Solutions — Micro-revisão 000000004
 """
 
+import itertools
+import os
+import secrets
 import time
-import uuid
-from typing import Callable
+from typing import Any, Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from titan_intra_service_auth.application.ports.metrics_port import MetricsPort
+from titan_intra_service_auth.application.ports.stage_trace_port import activate_trace, deactivate_trace
+from titan_intra_service_auth.infrastructure.observability.stage_timings import StageTimingRecorder
 
-class TelemetryMiddleware(BaseHTTPMiddleware):
-    """Reads MetricsPort from request.app.state.metrics (set in create_app)."""
+_HDR_REQUEST_ID = b"x-request-id"
+_HDR_ENGINE_LAT = b"x-engine-lat"
+_HDR_SERVER_TIMING = b"server-timing"
+
+
+def _route_key(scope: Scope) -> str:
+    """Template da rota casada pelo Router ("POST /v6/zkp/mint"); paths sem rota viram um único bucket."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return f"{scope['method']} {path}" if path else "unmatched"
+
+
+class TelemetryMiddleware:
+    """Reads MetricsPort from app.state.metrics (set in create_app) on the first HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._metrics: Optional[MetricsPort] = None
+        self._stage_timings: Optional[StageTimingRecorder] = None
+        # Prefixo único por processo (pid + sal aleatório: pids se repetem entre reinícios)
+        self._rid_prefix = f"{os.getpid():x}{secrets.token_hex(2)}-"
+        self._rid_counter = itertools.count(1)
+        # Só tocado no event loop deste worker — sem lock
+        self._active = 0
+
+    def _resolve_metrics(self, scope: Scope) -> Optional[MetricsPort]:
+        if self._metrics is None:
+            app: Any = scope.get("app")
+            state = getattr(app, "state", None)
+            self._metrics = getattr(state, "metrics", None)
+            self._stage_timings = getattr(state, "stage_timings", None)
+        return self._metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics = self._resolve_metrics(scope)
+        if metrics is None:
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        metrics = getattr(request.app.state, "metrics", None)
-        if not metrics:
-            return await call_next(request)
-        rid = str(uuid.uuid4())[:8]
         t_start = time.perf_counter()
-        metrics.increment_active_connections()
+        rid = f"{self._rid_prefix}{next(self._rid_counter):x}"
+        self._active += 1
+        recorded = False
+        stage_timings = self._stage_timings
+        trace = stage_timings.start(scope["headers"]) if stage_timings is not None else None
+        trace_token = activate_trace(trace) if trace is not None else None
+
+        async def send_with_telemetry(message: Message) -> None:
+            nonlocal recorded
+            if message["type"] == "http.response.start" and not recorded:
+                recorded = True
+                duration_ms = (time.perf_counter() - t_start) * 1000
+                sc = message["status"]
+                status_class = "2xx" if sc < 400 else ("4xx" if sc < 500 else "5xx")
+                headers = list(message.get("headers", ()))
+                names = {name.lower() for name, _ in headers}
+                if _HDR_REQUEST_ID not in names:
+                    headers.append((_HDR_REQUEST_ID, rid.encode("latin-1")))
+                if _HDR_ENGINE_LAT not in names:
+                    headers.append((_HDR_ENGINE_LAT, f"{duration_ms:.2f}ms".encode("latin-1")))
+                if trace is not None:
+                    trace.mark("response_serialize")
+                    if sc < 400:
+                        stage_timings.record(_route_key(scope), trace)
+                    if stage_timings.server_timing and _HDR_SERVER_TIMING not in names:
+                        headers.append((_HDR_SERVER_TIMING, stage_timings.server_timing_value(trace)))
+                message = {**message, "headers": headers}
+                self._active -= 1
+                metrics.record_http_request(
+                    status_class=status_class,
+                    latency_ms=duration_ms,
+                    active_connections=self._active,
+                    route=_route_key(scope),
+                )
+            await send(message)
+
         try:
-            response = await call_next(request)
-            sc = response.status_code
-            duration_ms = (time.perf_counter() - t_start) * 1000
-            status_class = "2xx" if sc < 400 else ("4xx" if sc < 500 else "5xx")
-            metrics.record_http_request(status_class=status_class, latency_ms=duration_ms)
-            metrics.decrement_active_connections()
-            if response.headers.get("x-request-id") is None:
-                response.headers["X-Request-ID"] = rid
-            if "X-Engine-Lat" not in response.headers:
-                response.headers["X-Engine-Lat"] = f"{duration_ms:.2f}ms"
-            return response
+            await self.app(scope, receive, send_with_telemetry)
         except Exception:
-            metrics.record_http_request(status_class="5xx", latency_ms=(time.perf_counter() - t_start) * 1000)
-            metrics.decrement_active_connections()
+            if not recorded:
+                recorded = True
+                self._active -= 1
+                metrics.record_http_request(
+                    status_class="5xx",
+                    latency_ms=(time.perf_counter() - t_start) * 1000,
+                    active_connections=self._active,
+                    route=_route_key(scope),
+                )
             raise
-
-
+        finally:
+            if trace_token is not None:
+                deactivate_trace(trace_token)
+            # Cliente desconectou antes do response.start (ou app não respondeu)
+            if not recorded:
+                self._active -= 1
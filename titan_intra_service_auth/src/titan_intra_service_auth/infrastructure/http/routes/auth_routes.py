@@ -1,35 +1,50 @@
 # -*- coding: utf-8 -*-
 """
 Auth routes: POST /v6/auth/mint — delegates to MintTokenUseCase.
+Lane de mint sobrecarregada (OverloadedError) → 503 + Retry-After, contado em q_dropped_reqs.
+Corpo lido com teto (max_body_bytes → 413) e decodificado em AuthMintBody; resposta em bytes.
 Elias Andrade — Replika AI Solutions
 """
 
 from fastapi import APIRouter, HTTPException, Request
 
 from titan_intra_service_auth.application.dtos.mint_request import MintRequestDTO
+from titan_intra_service_auth.application.ports.concurrency_port import OverloadedError
 from titan_intra_service_auth.application.use_cases.mint_token import MintTokenUseCase
 from titan_intra_service_auth.application.ports.metrics_port import MetricsPort
+from titan_intra_service_auth.infrastructure.http.json_body import BodyDecodeError, json_response, read_json
+from titan_intra_service_auth.infrastructure.http.schemas import AuthMintBody
 
 
-def register_auth_routes(router: APIRouter, use_case: MintTokenUseCase, metrics: MetricsPort) -> None:
+def register_auth_routes(
+    router: APIRouter,
+    use_case: MintTokenUseCase,
+    metrics: MetricsPort,
+    max_body_bytes: int = 4096,
+) -> None:
     """Registers mint endpoint; use_case and metrics injected (DIP)."""
 
     @router.post("/v6/auth/mint", status_code=201)
     async def mint_token(request: Request):
         try:
-            body = await request.json()
-            dto = MintRequestDTO(
-                user=body.get("user", "guest_user"),
-                scope=body.get("scope"),
-                entropy=body.get("entropy"),
-            )
+            body = await read_json(request, AuthMintBody, max_body_bytes)
+            dto = MintRequestDTO(user=body.user, scope=body.scope, entropy=body.entropy)
             response_dto = await use_case.execute(dto)
-            return {
-                "access_token": response_dto.access_token,
-                "token_type": response_dto.token_type,
-                "expires_in": response_dto.expires_in_seconds,
-                "engine": response_dto.engine_version,
-            }
+            return json_response(
+                {
+                    "access_token": response_dto.access_token,
+                    "token_type": response_dto.token_type,
+                    "expires_in": response_dto.expires_in_seconds,
+                    "engine": response_dto.engine_version,
+                },
+                status_code=201,
+            )
+        except BodyDecodeError as e:
+            metrics.record_mint_failure()
+            raise HTTPException(status_code=e.status_code, detail=f"Minting Failure: {str(e)}")
+        except OverloadedError as e:
+            metrics.record_dropped_request()
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after_sec)})
         except ValueError as e:
             metrics.record_mint_failure()
             raise HTTPException(status_code=422, detail=f"Minting Failure: {str(e)}")
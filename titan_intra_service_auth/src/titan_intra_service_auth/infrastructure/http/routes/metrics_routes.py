@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+Metrics routes: GET /metrics — texto Prometheus 0.0.4 por padrão (template pré-montado).
+OpenMetrics 1.0.0 só quando o scraper pede (Accept: application/openmetrics-text); o
+Content-Type da resposta sempre diz qual dos dois formatos foi servido.
+Elias Andrade — Replika AI Solutions
+"""
+
+from fastapi import APIRouter, Request, Response
+
+from titan_intra_service_auth.infrastructure.observability.prometheus_exporter import (
+    OPENMETRICS_CONTENT_TYPE,
+    PROMETHEUS_CONTENT_TYPE,
+    PrometheusExporter,
+)
+
+
+def register_metrics_routes(router: APIRouter, exporter: PrometheusExporter) -> None:
+    @router.get("/metrics", include_in_schema=False)
+    async def metrics(request: Request):
+        openmetrics = "application/openmetrics-text" in request.headers.get("accept", "")
+        return Response(
+            content=exporter.render(openmetrics=openmetrics),
+            media_type=OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE,
+        )
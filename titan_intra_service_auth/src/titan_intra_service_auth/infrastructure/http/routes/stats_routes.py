@@ -1,18 +1,32 @@
 # -*- coding: utf-8 -*-
 """
 Stats routes: GET /v6/engine/stats — telemetry snapshot + ZKP/CA.
-Elias Andrade — Replika AI Solutions — Micro-revisão 000000002
+Servido de CachedStatsSnapshot: JSON pré-serializado, reconstruído por job de fundo
+(refresh_interval_sec), com ETag/If-None-Match → 304. psutil e COUNT(*) do CA vêm da
+amostra do ProcessStatsSampler, não do request.
+Elias Andrade — Replika AI Solutions — Micro-revisão 000000009
 """
 
 import platform
 import time
-from typing import Optional
+from typing import Any, Dict, Optional
 
-import psutil
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
+from titan_intra_service_auth.application.ports.challenge_store_port import ChallengeStorePort
 from titan_intra_service_auth.application.ports.metrics_port import MetricsPort
+from titan_intra_service_auth.application.ports.sign_batcher_port import SignBatcherPort
+from titan_intra_service_auth.application.ports.token_cache_port import TokenCachePort
 from titan_intra_service_auth.infrastructure.ca.ca_repository import CARepository
+from titan_intra_service_auth.infrastructure.ca.ca_service import CAService
+from titan_intra_service_auth.infrastructure.ca.ca_verify_pipeline import CAVerifyPipeline
+from titan_intra_service_auth.infrastructure.challenge_store.epoch_proof import EpochProofVerifier
+from titan_intra_service_auth.infrastructure.challenge_store.signed_challenge import SignedChallengeCodec
+from titan_intra_service_auth.infrastructure.observability.background_jobs import BackgroundJobs
+from titan_intra_service_auth.infrastructure.observability.concurrency_adapter import ConcurrencyAdapter
+from titan_intra_service_auth.infrastructure.observability.process_stats_sampler import ProcessStatsSampler
+from titan_intra_service_auth.infrastructure.observability.stage_timings import StageTimingRecorder
+from titan_intra_service_auth.infrastructure.observability.stats_snapshot import CachedStatsSnapshot
 from titan_intra_service_auth.infrastructure.zkp_metrics import ZKPMetricsStore
 
 
@@ -21,17 +35,32 @@ def register_stats_routes(
     metrics: MetricsPort,
     zkp_metrics: Optional[ZKPMetricsStore] = None,
     ca_repository: Optional[CARepository] = None,
-) -> None:
-    @router.get("/v6/engine/stats")
-    async def engine_stats():
-        proc = psutil.Process()
-        with proc.oneshot():
-            mem_info = proc.memory_full_info()
-            io_counters = proc.io_counters()
-            cpu_usage = proc.cpu_percent()
-            fds = getattr(proc, "num_fds", lambda: 0)()
-            threads = proc.num_threads()
-            ctx = proc.num_ctx_switches()
+    ca_service: Optional[CAService] = None,
+    verify_pipeline: Optional[CAVerifyPipeline] = None,
+    challenge_store: Optional[ChallengeStorePort] = None,
+    signed_challenges: Optional[SignedChallengeCodec] = None,
+    epoch_proofs: Optional[EpochProofVerifier] = None,
+    mint_batcher: Optional[SignBatcherPort] = None,
+    mint_concurrency: Optional[ConcurrencyAdapter] = None,
+    token_cache: Optional[TokenCachePort] = None,
+    background_jobs: Optional[BackgroundJobs] = None,
+    stage_timings: Optional[StageTimingRecorder] = None,
+    process_stats: Optional[ProcessStatsSampler] = None,
+    refresh_interval_sec: float = 0.0,
+) -> CachedStatsSnapshot:
+    """
+    Registra o stats e devolve o cache do snapshot; quem registra agenda snapshot.refresh
+    como job periódico (refresh_interval_sec=0 → snapshot montado a cada GET).
+    Sem process_stats, o sampler é local e coletado a cada montagem.
+    """
+    sample_inline = process_stats is None
+    if process_stats is None:
+        process_stats = ProcessStatsSampler(ca_repository=ca_repository)
+
+    def build_stats() -> Dict[str, Any]:
+        if sample_inline:
+            process_stats.sample_now()
+        p = process_stats.snapshot()
         s = metrics.get_snapshot()
         uptime = time.time() - s["engine_start_time"]
         tps = s["http_req_total"] / uptime if uptime > 0 else 0
@@ -43,13 +72,15 @@ def register_stats_routes(
         if zkp_metrics:
             zkp_data = zkp_metrics.get_snapshot()
         if ca_repository:
-            try:
+            if p.get("ca_status") == "ok":
                 ca_data = {
-                    "ca_identities_total": ca_repository.count_identities(include_revoked=False),
-                    "ca_identities_revoked": ca_repository.count_revoked(),
+                    "ca_identities_total": p["ca_identities_active"],
+                    "ca_identities_revoked": p["ca_identities_revoked"],
                     "ca_status": "ok",
+                    "ca_db_pool": ca_repository.get_pool_stats(),
+                    "ca_revocation_log": ca_repository.get_revocation_stats(),
                 }
-            except Exception:
+            else:
                 ca_data = {"ca_identities_total": 0, "ca_identities_revoked": 0, "ca_status": "error"}
 
         return {
@@ -59,6 +90,7 @@ def register_stats_routes(
                 "uptime_seconds": round(uptime, 2),
                 "architecture": platform.machine(),
                 "python_version": platform.python_version(),
+                "workers_reporting": len(s.get("fleet", [])) or 1,
             },
             "traffic_telemetry": {
                 "total_requests": s["http_req_total"],
@@ -74,6 +106,8 @@ def register_stats_routes(
                 "minimum": round(s["lat_min"], 4),
                 "cumulative_processing_time": round(s["lat_sum"] / 1000, 2),
             },
+            "latency_percentiles_ms": s.get("latency_histograms", {}),
+            "stage_timings_ms": stage_timings.get_stats() if stage_timings else {},
             "cryptography_performance": {
                 "algorithm": "ECDSA-ES256",
                 "tokens_minted": s["sec_tokens_minted"],
@@ -83,15 +117,41 @@ def register_stats_routes(
                 "last_authenticated_user": s["sec_last_user"],
             },
             "system_resources_low_level": {
-                "cpu_percent": cpu_usage,
-                "memory_uss_mb": round(mem_info.uss / (1024 * 1024), 2),
-                "memory_vms_mb": round(mem_info.vms / (1024 * 1024), 2),
-                "open_fds": fds,
-                "active_threads": threads,
-                "voluntary_ctx_switches": ctx.voluntary,
-                "io_read_bytes": io_counters.read_bytes,
-                "io_write_bytes": io_counters.write_bytes,
+                "cpu_percent": p["cpu_percent"],
+                "memory_uss_mb": round(p["memory_uss_bytes"] / (1024 * 1024), 2),
+                "memory_vms_mb": round(p["memory_vms_bytes"] / (1024 * 1024), 2),
+                "open_fds": p["open_fds"],
+                "active_threads": p["threads"],
+                "voluntary_ctx_switches": p["ctx_switches_voluntary"],
+                "io_read_bytes": p["io_read_bytes"],
+                "io_write_bytes": p["io_write_bytes"],
+                "sample_age_sec": round(time.time() - p["sampled_at"], 3),
             },
             "zkp_performance": zkp_data,
             "ca_status": ca_data,
+            "ca_pubkey_cache": ca_service.get_cache_stats() if ca_service else {},
+            "verify_pipeline": verify_pipeline.get_stats() if verify_pipeline else {},
+            "challenge_store": challenge_store.get_stats() if challenge_store else {},
+            "signed_challenges": signed_challenges.get_stats() if signed_challenges else {},
+            "epoch_proofs": epoch_proofs.get_stats() if epoch_proofs else {},
+            "mint_batcher": mint_batcher.get_stats() if mint_batcher else {},
+            "mint_pipeline": mint_concurrency.get_stats() if mint_concurrency else {},
+            "mint_token_cache": token_cache.get_stats() if token_cache else {},
+            "background_jobs": background_jobs.get_stats() if background_jobs else {},
+            "fleet": s.get("fleet", []),
+            "stats_snapshot": {**snapshot.get_stats(), "generated_at": time.time()},
         }
+
+    snapshot = CachedStatsSnapshot(build_stats, refresh_interval_sec=refresh_interval_sec)
+
+    @router.get("/v6/engine/stats")
+    async def engine_stats(request: Request):
+        body, etag = snapshot.get()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+            snapshot.record_not_modified()
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    return snapshot
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Telemetry stream routes: GET /v6/engine/stats/stream — Server-Sent Events com o stats.
+Um frame por intervalo para todos os dashboards (snapshot completo na entrada, deltas depois).
+Elias Andrade — Replika AI Solutions
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from titan_intra_service_auth.infrastructure.observability.telemetry_stream import TelemetryBroadcaster
+
+
+def register_telemetry_stream_routes(router: APIRouter, broadcaster: TelemetryBroadcaster) -> None:
+    @router.get("/v6/engine/stats/stream")
+    async def engine_stats_stream():
+        sub = broadcaster.subscribe()
+        if sub is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Limite de inscritos do stream atingido",
+                headers={"Retry-After": "5"},
+            )
+        return StreamingResponse(
+            broadcaster.frames(sub),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
@@ -3,157 +3,355 @@
 🔐 ZKP ROUTES — Rotas Zero Knowledge Proof
 ==========================================
 /v6/zkp/identity  — Criar identidade (cliente envia pubkey, recebe identity_id)
+/v6/zkp/identity/batch — Criar milhares de identidades numa chamada (resultado por item)
 /v6/zkp/challenge — Obter nonce para assinar (prova de posse)
+/v6/zkp/challenge/batch — K challenges numa chamada (prefetch; teto de pendentes por identity)
 /v6/zkp/mint      — Obter token após provar posse da chave privada
+/v6/zkp/epoch     — Época atual para o mint em uma ida (proof de época, sem challenge)
 
 A API NUNCA sabe a identidade real. Apenas valida via CA.
 
 CORREÇÃO RACE CONDITION: challenge_id único por challenge — permite N concurrent
 requests por identity (antes: 1 nonce/identity = falhas em burst paralelo).
+Challenges vivem em ChallengeStorePort (memória por worker ou SQLite compartilhado).
+Proof de época (TITAN_ZKP_EPOCH_PROOF=1): mint com epoch + nonce gerado pelo cliente, assinando
+identity_id|época|random — sem GET de challenge nem store; replay barrado pelo filtro anti-replay
+(Bloom por worker ou tabela comum ao host, ver TITAN_REPLAY_FILTER).
+Lane de verify ou de mint sobrecarregada (OverloadedError) ou verify além do timeout
+(VerifyTimeoutError) → 503 + Retry-After, sem contar como falha de mint (vai para q_dropped_reqs).
+identity e mint: corpo lido com teto (413) e decodificado em dataclass tipada (json_body);
+respostas saem como bytes num Response cru.
 Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
-Micro-revisão: 000000002
+Micro-revisão: 000000008
 """
 
 import secrets
-import threading
 import uuid
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Request
 
+from titan_intra_service_auth.application.dtos.mint_request import MintRequestDTO
+from titan_intra_service_auth.application.ports.challenge_store_port import ChallengeStorePort
+from titan_intra_service_auth.application.ports.concurrency_port import OverloadedError
 from titan_intra_service_auth.application.ports.metrics_port import MetricsPort
+from titan_intra_service_auth.application.ports.stage_trace_port import mark_stage
 from titan_intra_service_auth.application.use_cases.mint_token import MintTokenUseCase
 from titan_intra_service_auth.infrastructure.ca.ca_service import CAService
+from titan_intra_service_auth.infrastructure.ca.ca_verify_pipeline import CAVerifyPipeline, VerifyTimeoutError
+from titan_intra_service_auth.infrastructure.challenge_store.challenge_batch import new_challenges
+from titan_intra_service_auth.infrastructure.challenge_store.epoch_proof import EpochProofVerifier
+from titan_intra_service_auth.infrastructure.challenge_store.signed_challenge import SignedChallengeCodec
+from titan_intra_service_auth.infrastructure.http.json_body import BodyDecodeError, decode_object, json_response, read_json
+from titan_intra_service_auth.infrastructure.http.schemas import CreateIdentityBody, IdentityBatchBody, ZKPMintBody
 from titan_intra_service_auth.infrastructure.zkp_metrics import ZKPMetricsStore
 
 
-# Cache: challenge_id -> (identity_id, nonce) — múltiplos challenges por identity
-# Em produção: Redis com TTL 60s
-_challenge_store: dict[str, Tuple[str, str]] = {}
-_challenge_lock = threading.Lock()
-_MAX_CHALLENGES = 50000
-
-
 def register_zkp_routes(
     router: APIRouter,
     ca_service: CAService,
+    verify_pipeline: CAVerifyPipeline,
+    challenge_store: ChallengeStorePort,
     mint_use_case: MintTokenUseCase,
     metrics: MetricsPort,
     zkp_metrics: ZKPMetricsStore,
+    signed_challenges: Optional[SignedChallengeCodec] = None,
+    epoch_proofs: Optional[EpochProofVerifier] = None,
+    mint_max_body_bytes: int = 4096,
+    identity_max_body_bytes: int = 16384,
+    identity_batch_max_items: int = 5000,
+    identity_batch_max_body_bytes: int = 4194304,
+    challenge_batch_max: int = 256,
+    challenge_max_per_identity: int = 1024,
 ) -> None:
-    """Registra rotas ZKP no router."""
+    """
+    Registra rotas ZKP no router.
+    signed_challenges presente → challenges stateless (HMAC), sem store no hot path.
+    epoch_proofs presente → /v6/zkp/epoch e mint em uma ida (proof de época).
+    *_max_body_bytes: teto do corpo de mint, de identity e do lote de identity (acima → 413).
+    identity_batch_max_items: identidades por chamada em /v6/zkp/identity/batch (acima → 413).
+    challenge_batch_max / challenge_max_per_identity: K máximo de /v6/zkp/challenge/batch e
+    teto de challenges pendentes por identity no store (lote cortado; nada a emitir → 429).
+    """
+
+    def unavailable(e: Exception) -> HTTPException:
+        """Lane cheia (OverloadedError) ou verify além do prazo (VerifyTimeoutError) → 503 + Retry-After."""
+        metrics.record_dropped_request()
+        return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after_sec)})
 
     @router.post("/v6/zkp/identity", status_code=201)
     async def create_identity(request: Request):
         """
         Cria identidade ZKP. Cliente envia pubkey_pem gerada localmente.
-        API repassa ao CA; CA registra e retorna identity_id.
+        API repassa ao CA (parse PEM + INSERT no pool de verify); CA registra e retorna identity_id.
         O cliente deve salvar (identity_id, pubkey, private_key) em u-data.
         """
         try:
-            body = await request.json()
-            pubkey_pem = body.get("pubkey_pem")
-            scope = body.get("scope", "access_root")
+            body = await read_json(request, CreateIdentityBody, identity_max_body_bytes)
+            pubkey_pem = body.pubkey_pem
+            scope = body.scope
 
-            if not pubkey_pem or not isinstance(pubkey_pem, str):
+            if not pubkey_pem:
                 raise HTTPException(status_code=422, detail="pubkey_pem é obrigatório")
 
-            identity_id, fingerprint = ca_service.register_identity(
-                pubkey_pem=pubkey_pem,
-                scope=scope,
-            )
+            identity_id, fingerprint = await verify_pipeline.register_identity(pubkey_pem, scope)
             zkp_metrics.record_identity_created(identity_id)
 
-            return {
-                "identity_id": identity_id,
-                "pubkey_fingerprint": fingerprint,
-                "scope": scope,
-                "message": "Salve identity_id, pubkey_pem e private_key em u-data/{identity_id}/",
-            }
+            return json_response(
+                {
+                    "identity_id": identity_id,
+                    "pubkey_fingerprint": fingerprint,
+                    "scope": scope,
+                    "message": "Salve identity_id, pubkey_pem e private_key em u-data/{identity_id}/",
+                },
+                status_code=201,
+            )
+        except BodyDecodeError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except (OverloadedError, VerifyTimeoutError) as e:
+            raise unavailable(e)
         except ValueError as e:
             raise HTTPException(status_code=422, detail=str(e))
 
+    @router.post("/v6/zkp/identity/batch")
+    async def create_identities_batch(request: Request):
+        """
+        Cria identidades em lote: {"identities": [{"pubkey_pem", "scope"?}, ...]}.
+        PEMs validados em paralelo no pool de verify; válidos inseridos numa transação só.
+        Resposta por item, na ordem do lote (index, status created|error) — PEM inválido,
+        item malformado ou fingerprint duplicado falham só o próprio item.
+        """
+        try:
+            body = await read_json(request, IdentityBatchBody, identity_batch_max_body_bytes)
+        except BodyDecodeError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        items = body.identities
+        if not items:
+            raise HTTPException(status_code=422, detail="identities não pode ser vazio")
+        if len(items) > identity_batch_max_items:
+            raise HTTPException(status_code=413, detail=f"Lote acima de {identity_batch_max_items} identidades")
+
+        results: List[Dict[str, Any]] = [{} for _ in items]
+        entries = []
+        positions = []
+        for index, item in enumerate(items):
+            try:
+                parsed = decode_object(item, CreateIdentityBody)
+            except BodyDecodeError as e:
+                results[index] = {"index": index, "status": "error", "error": str(e)}
+                continue
+            entries.append((parsed.pubkey_pem, parsed.scope))
+            positions.append(index)
+
+        created_ids = []
+        if entries:
+            try:
+                outcomes = await verify_pipeline.register_identities(entries)
+            except (OverloadedError, VerifyTimeoutError) as e:
+                raise unavailable(e)
+            for index, outcome in zip(positions, outcomes):
+                if "error" in outcome:
+                    results[index] = {"index": index, "status": "error", **outcome}
+                else:
+                    results[index] = {"index": index, "status": "created", **outcome}
+                    created_ids.append(outcome["identity_id"])
+        zkp_metrics.record_identities_created(created_ids)
+
+        return json_response(
+            {
+                "requested": len(items),
+                "created": len(created_ids),
+                "failed": len(items) - len(created_ids),
+                "results": results,
+            }
+        )
+
     @router.get("/v6/zkp/challenge")
     async def get_challenge(identity_id: Optional[str] = None):
         """
         Retorna challenge_id + nonce. Cliente assina nonce e envia challenge_id no mint.
-        Permite N challenges simultâneos por identity (evita race em burst paralelo).
+        Permite N challenges simultâneos por identity (evita race em burst paralelo), até o
+        mesmo teto de pendentes do lote (cheio → 429).
         """
         if not identity_id:
             raise HTTPException(status_code=422, detail="identity_id é obrigatório")
 
-        if not ca_service.is_authorized(identity_id):
+        try:
+            authorized = await verify_pipeline.is_authorized(identity_id)
+        except (OverloadedError, VerifyTimeoutError) as e:
+            raise unavailable(e)
+        if not authorized:
             raise HTTPException(status_code=403, detail="Identity não autorizada ou inexistente")
 
-        nonce = secrets.token_urlsafe(32)
-        challenge_id = str(uuid.uuid4())
-        with _challenge_lock:
-            _challenge_store[challenge_id] = (identity_id, nonce)
-            if len(_challenge_store) > _MAX_CHALLENGES:
-                for k in list(_challenge_store.keys())[:_MAX_CHALLENGES // 2]:
-                    _challenge_store.pop(k, None)
+        if signed_challenges is not None:
+            challenge_id, nonce = signed_challenges.issue(identity_id)
+        else:
+            nonce = secrets.token_urlsafe(32)
+            challenge_id = str(uuid.uuid4())
+            if not await challenge_store.put_many(identity_id, [(challenge_id, nonce)], challenge_max_per_identity):
+                raise HTTPException(
+                    status_code=429,
+                    detail=f"Identity com {challenge_max_per_identity} challenges pendentes",
+                    headers={"Retry-After": "1"},
+                )
         zkp_metrics.record_challenge_issued()
 
         return {"challenge_id": challenge_id, "nonce": nonce, "identity_id": identity_id}
 
+    @router.get("/v6/zkp/challenge/batch")
+    async def get_challenge_batch(identity_id: Optional[str] = None, n: int = 1):
+        """
+        K = n challenges de uma vez: uma checagem de autorização, uma leitura de os.urandom e
+        uma aquisição de lock/transação no store. O cliente pré-busca e consome um por mint.
+        No modo stored, o lote é cortado ao que cabe no teto de pendentes da identity.
+        """
+        if not identity_id:
+            raise HTTPException(status_code=422, detail="identity_id é obrigatório")
+        if not 1 <= n <= challenge_batch_max:
+            raise HTTPException(status_code=422, detail=f"n deve estar entre 1 e {challenge_batch_max}")
+
+        try:
+            authorized = await verify_pipeline.is_authorized(identity_id)
+        except (OverloadedError, VerifyTimeoutError) as e:
+            raise unavailable(e)
+        if not authorized:
+            raise HTTPException(status_code=403, detail="Identity não autorizada ou inexistente")
+
+        if signed_challenges is not None:
+            challenges = signed_challenges.issue_many(identity_id, n)
+        else:
+            challenges = new_challenges(n)
+            issued = await challenge_store.put_many(identity_id, challenges, challenge_max_per_identity)
+            if issued == 0:
+                raise HTTPException(
+                    status_code=429,
+                    detail=f"Identity com {challenge_max_per_identity} challenges pendentes",
+                    headers={"Retry-After": "1"},
+                )
+            challenges = challenges[:issued]
+        zkp_metrics.record_challenges_issued(len(challenges))
+
+        return json_response(
+            {
+                "identity_id": identity_id,
+                "requested": n,
+                "issued": len(challenges),
+                "challenges": [{"challenge_id": challenge_id, "nonce": nonce} for challenge_id, nonce in challenges],
+            }
+        )
+
+    @router.get("/v6/zkp/epoch")
+    async def get_epoch():
+        """
+        Época atual e janela aceita para o proof de época. O cliente assina
+        titan-zkp-epoch-v1|identity_id|epoch|random e chama /v6/zkp/mint direto — sem challenge.
+        """
+        if epoch_proofs is None:
+            raise HTTPException(status_code=404, detail="Proof de época desabilitado (TITAN_ZKP_EPOCH_PROOF)")
+        return json_response(epoch_proofs.describe())
+
     @router.post("/v6/zkp/mint", status_code=201)
     async def mint_token_zkp(request: Request):
         """
         Mint token ZKP. Cliente envia challenge_id, identity_id, nonce e signature.
         Lookup por challenge_id (evita race). API verifica assinatura via CA.
+        Proof de época: epoch no lugar de challenge_id, nonce = random do cliente (16–128
+        chars), signature sobre epoch_proof_message(identity_id, epoch, nonce); epoch_check no lugar
+        de challenge_lookup.
         Subject do token = identity_id (não identidade real).
+        Estágios (request amostrado): json_parse → challenge_lookup → verify_* / pubkey_fetch /
+        ecdsa_verify → claim_build → mint_* / jwt_sign → response_serialize.
         """
         try:
-            body = await request.json()
-            challenge_id = body.get("challenge_id")
-            identity_id = body.get("identity_id")
-            nonce = body.get("nonce")
-            signature = body.get("signature")
-            scope = body.get("scope", "access_root")
-
-            if not all([challenge_id, identity_id, nonce, signature]):
+            try:
+                body = await read_json(request, ZKPMintBody, mint_max_body_bytes)
+            except BodyDecodeError as e:
                 metrics.record_mint_failure()
                 zkp_metrics.record_mint_failed()
-                raise HTTPException(
-                    status_code=422,
-                    detail="challenge_id, identity_id, nonce e signature são obrigatórios",
-                )
+                raise HTTPException(status_code=e.status_code, detail=str(e))
+            mark_stage("json_parse")
+            challenge_id = body.challenge_id
+            identity_id = body.identity_id
+            nonce = body.nonce
+            signature = body.signature
+            scope = body.scope
+            epoch = body.epoch
 
-            # Lookup por challenge_id (permite N concurrent por identity)
-            with _challenge_lock:
-                stored = _challenge_store.pop(challenge_id, None)
-            stored_identity_id, stored_nonce = stored if stored else (None, None)
-            if not stored or stored_identity_id != identity_id or stored_nonce != nonce:
-                metrics.record_mint_failure()
-                zkp_metrics.record_mint_failed()
-                raise HTTPException(status_code=403, detail="Challenge inválido ou expirado")
+            if epoch is not None:
+                # Proof de época: frescor pela janela de época, replay checado após a assinatura
+                if epoch_proofs is None:
+                    metrics.record_mint_failure()
+                    zkp_metrics.record_mint_failed()
+                    raise HTTPException(status_code=422, detail="Proof de época desabilitado (TITAN_ZKP_EPOCH_PROOF)")
+                if not all([identity_id, nonce, signature]):
+                    metrics.record_mint_failure()
+                    zkp_metrics.record_mint_failed()
+                    raise HTTPException(status_code=422, detail="identity_id, nonce e signature são obrigatórios")
+                signed_message = epoch_proofs.message_if_fresh(identity_id, epoch, nonce)
+                mark_stage("epoch_check")
+                if signed_message is None:
+                    metrics.record_mint_failure()
+                    zkp_metrics.record_mint_failed()
+                    raise HTTPException(status_code=403, detail="Proof fora da janela de época")
+            else:
+                if not all([challenge_id, identity_id, nonce, signature]):
+                    metrics.record_mint_failure()
+                    zkp_metrics.record_mint_failed()
+                    raise HTTPException(
+                        status_code=422,
+                        detail="challenge_id, identity_id, nonce e signature são obrigatórios",
+                    )
+
+                if signed_challenges is not None and SignedChallengeCodec.is_signed(challenge_id):
+                    # Stateless: HMAC + prazo + filtro anti-replay (comum aos workers se houver vários)
+                    challenge_ok = await signed_challenges.verify(challenge_id, identity_id, nonce)
+                else:
+                    # Lookup por challenge_id (permite N concurrent por identity)
+                    stored = await challenge_store.pop(challenge_id)
+                    stored_identity_id, stored_nonce = stored if stored else (None, None)
+                    challenge_ok = bool(stored) and stored_identity_id == identity_id and stored_nonce == nonce
+                mark_stage("challenge_lookup")
+                if not challenge_ok:
+                    metrics.record_mint_failure()
+                    zkp_metrics.record_mint_failed()
+                    raise HTTPException(status_code=403, detail="Challenge inválido ou expirado")
+                signed_message = nonce
 
-            # CA verifica assinatura (prova de posse da chave privada)
-            if not ca_service.verify_signature(
+            # CA verifica assinatura (prova de posse da chave privada) — pool de verify, fora do loop
+            if not await verify_pipeline.verify_signature(
                 identity_id=identity_id,
-                nonce=nonce,
+                nonce=signed_message,
                 signature_b64=signature,
             ):
                 metrics.record_mint_failure()
                 zkp_metrics.record_mint_failed()
                 raise HTTPException(status_code=403, detail="Assinatura inválida")
 
-            # Subject = identity_id (API não sabe quem é a pessoa)
-            from titan_intra_service_auth.application.dtos.mint_request import MintRequestDTO
+            # Proof de época só vira "usado" com assinatura válida (forjado não envenena o filtro)
+            if epoch is not None and not await epoch_proofs.mark_used(signed_message, epoch):
+                metrics.record_mint_failure()
+                zkp_metrics.record_mint_failed()
+                raise HTTPException(status_code=403, detail="Proof já utilizado")
 
+            # Subject = identity_id (API não sabe quem é a pessoa)
             dto = MintRequestDTO(user=identity_id, scope=scope)
             response_dto = await mint_use_case.execute(dto)
             zkp_metrics.record_mint_success()
 
-            return {
-                "access_token": response_dto.access_token,
-                "token_type": response_dto.token_type,
-                "expires_in": response_dto.expires_in_seconds,
-                "engine": response_dto.engine_version,
-                "subject": identity_id,  # ZKP: subject é o id técnico, não identidade real
-            }
+            return json_response(
+                {
+                    "access_token": response_dto.access_token,
+                    "token_type": response_dto.token_type,
+                    "expires_in": response_dto.expires_in_seconds,
+                    "engine": response_dto.engine_version,
+                    "subject": identity_id,  # ZKP: subject é o id técnico, não identidade real
+                },
+                status_code=201,
+            )
         except HTTPException:
             raise
+        except (OverloadedError, VerifyTimeoutError) as e:
+            raise unavailable(e)
         except ValueError as e:
             metrics.record_mint_failure()
             zkp_metrics.record_mint_failed()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Corpos de request das rotas quentes — dataclasses com slots, decodificadas por json_body.decode.
+Campos sem default são obrigatórios; tipo conferido na entrada (string onde se espera string).
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(slots=True, frozen=True)
+class CreateIdentityBody:
+    """POST /v6/zkp/identity"""
+
+    pubkey_pem: str
+    scope: str = "access_root"
+
+
+@dataclass(slots=True, frozen=True)
+class IdentityBatchBody:
+    """POST /v6/zkp/identity/batch — itens no formato de CreateIdentityBody, conferidos um a um"""
+
+    identities: List[dict]
+
+
+@dataclass(slots=True, frozen=True)
+class ZKPMintBody:
+    """POST /v6/zkp/mint — com challenge_id (challenge) ou com epoch (proof de época; nonce = random do cliente)"""
+
+    identity_id: str
+    nonce: str
+    signature: str
+    challenge_id: Optional[str] = None
+    epoch: Optional[int] = None
+    scope: str = "access_root"
+
+
+@dataclass(slots=True, frozen=True)
+class AuthMintBody:
+    """POST /v6/auth/mint (legado)"""
+
+    user: str = "guest_user"
+    scope: Optional[str] = None
+    entropy: Optional[str] = None
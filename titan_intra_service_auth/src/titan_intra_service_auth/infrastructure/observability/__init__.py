@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-"""Observability adapters (metrics, concurrency)."""
+"""Observability adapters (metrics, concurrency, admission control, adaptive limits, mint batching, stage timings, Prometheus export, stats snapshot, telemetry stream, background jobs)."""
 
 from .shared_metrics_adapter import (
     SharedMetricsAdapter,
@@ -7,12 +7,34 @@ from .shared_metrics_adapter import (
     create_shared_metrics_schema,
     create_local_metrics_adapter,
 )
+from .adaptive_limit import VegasConcurrencyLimit
+from .background_jobs import BackgroundJobs
+from .admission_controller import CoDelAdmissionController
 from .concurrency_adapter import ConcurrencyAdapter
+from .fleet_metrics_adapter import FleetMetricsAdapter
+from .metrics_segment import MetricsSegment
+from .mint_batch_scheduler import MintBatchScheduler
+from .process_stats_sampler import ProcessStatsSampler
+from .prometheus_exporter import PrometheusExporter
+from .stage_timings import StageTimingRecorder
+from .stats_snapshot import CachedStatsSnapshot
+from .telemetry_stream import TelemetryBroadcaster
 
 __all__ = [
     "SharedMetricsAdapter",
     "LocalMetricsAdapter",
     "create_shared_metrics_schema",
     "create_local_metrics_adapter",
+    "VegasConcurrencyLimit",
+    "BackgroundJobs",
+    "CoDelAdmissionController",
     "ConcurrencyAdapter",
+    "FleetMetricsAdapter",
+    "MetricsSegment",
+    "MintBatchScheduler",
+    "ProcessStatsSampler",
+    "PrometheusExporter",
+    "StageTimingRecorder",
+    "CachedStatsSnapshot",
+    "TelemetryBroadcaster",
 ]
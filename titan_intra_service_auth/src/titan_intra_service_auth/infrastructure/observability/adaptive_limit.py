@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Limite de concorrência adaptativo (estilo TCP Vegas) para as lanes de slots.
+Slots fixos (THREADS × 2) foram achados na tentativa e erro para um host; outro número de
+cores ou outra proporção de verify muda o ponto ótimo. Aqui o limite acompanha o tempo de
+slot medido (fila do executor + assinatura/verify) contra o tempo sem fila — o menor tempo
+de execução na thread (média por janela) já visto — estima quantos requests estão só
+esperando dentro da lane:
+    fila ≈ limite × (1 − rtt_sem_fila / rtt)
+Usar o tempo de execução (e não o menor tempo de slot) evita herdar a fila do boot, quando
+a lane já nasce saturada; com mais threads que cores ele também infla, então encolher o
+limite continua reduzindo a referência até sobrar só o custo real.
+Fila abaixo de alpha → cresce log10(limite); acima de beta → encolhe (metade do excesso,
+no mínimo log10(limite)); entre os dois, mantém. Converge para "threads ocupadas + uma fila curta" em qualquer hardware.
+Sem pressão (em uso < limite/2) não cresce. O rtt sem fila é re-medido periodicamente
+(host mais lento ou mais rápido desloca a referência).
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000001
+"""
+
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+# Decisões recentes guardadas para o stats
+_HISTORY = 20
+
+
+class VegasConcurrencyLimit:
+    """
+    on_sample(tempo de slot, tempo de execução, em uso) a cada request devolvido; retorna o
+    limite efetivo atual.
+    Decide uma vez por janela (window_sec com pelo menos min_window_samples amostras), sobre
+    a média da janela. Só tocado no event loop — sem lock.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        alpha: float = 3.0,
+        beta: float = 6.0,
+        window_sec: float = 0.1,
+        min_window_samples: int = 10,
+        probe_interval_sec: float = 30.0,
+    ) -> None:
+        self._min = max(1, min_limit)
+        self._max = max(self._min, max_limit)
+        self._limit = min(self._max, max(self._min, initial_limit))
+        self._alpha = alpha
+        self._beta = max(alpha, beta)
+        self._window_sec = window_sec
+        self._min_samples = max(1, min_window_samples)
+        self._probe_interval = probe_interval_sec
+        self._window_start = time.perf_counter()
+        self._window_sum = 0.0
+        self._window_service_sum = 0.0
+        self._window_count = 0
+        self._window_max_inflight = 0
+        self._rtt_noload = 0.0
+        self._probe_at = self._window_start + probe_interval_sec
+        self._last_rtt = 0.0
+        self._last_queue = 0.0
+        self._increases = 0
+        self._decreases = 0
+        self._app_limited_windows = 0
+        self._probes = 0
+        self._decisions: Deque[Dict[str, Any]] = deque(maxlen=_HISTORY)
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def on_sample(self, rtt_sec: float, service_sec: float, inflight: int) -> int:
+        self._window_sum += rtt_sec
+        self._window_service_sum += service_sec
+        self._window_count += 1
+        if inflight > self._window_max_inflight:
+            self._window_max_inflight = inflight
+        now = time.perf_counter()
+        if self._window_count >= self._min_samples and now - self._window_start >= self._window_sec:
+            self._update(
+                self._window_sum / self._window_count,
+                self._window_service_sum / self._window_count,
+                self._window_max_inflight,
+                now,
+            )
+            self._window_start = now
+            self._window_sum = 0.0
+            self._window_service_sum = 0.0
+            self._window_count = 0
+            self._window_max_inflight = 0
+        return self._limit
+
+    def _update(self, rtt: float, service: float, max_inflight: int, now: float) -> None:
+        rtt = max(rtt, 1e-9)
+        service = min(max(service, 1e-9), rtt)
+        self._last_rtt = rtt
+        if now >= self._probe_at:
+            # Re-mede a referência: esta janela vira o novo candidato a "sem fila"
+            self._probe_at = now + self._probe_interval
+            self._probes += 1
+            self._rtt_noload = service
+        elif self._rtt_noload == 0.0 or service < self._rtt_noload:
+            self._rtt_noload = service
+        limit = self._limit
+        queue = limit * (1 - self._rtt_noload / rtt)
+        self._last_queue = queue
+        log_limit = math.log10(limit) if limit > 10 else 1.0
+        step = max(1, int(log_limit))
+        if queue < self._alpha * log_limit:
+            if max_inflight < limit / 2:
+                # Limite não é o gargalo; crescer só inflaria o número sem medir nada
+                self._app_limited_windows += 1
+                return
+            new_limit = min(self._max, limit + step)
+        elif queue > self._beta * log_limit:
+            new_limit = max(self._min, limit - max(step, int((queue - self._beta * log_limit) / 2)))
+        else:
+            return
+        if new_limit == limit:
+            return
+        if new_limit > limit:
+            self._increases += 1
+        else:
+            self._decreases += 1
+        self._decisions.append(
+            {
+                "at": round(time.time(), 3),
+                "from": limit,
+                "to": new_limit,
+                "queue_estimate": round(queue, 2),
+                "rtt_ms": round(rtt * 1000, 3),
+                "rtt_noload_ms": round(self._rtt_noload * 1000, 3),
+            }
+        )
+        self._limit = new_limit
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "algorithm": "vegas",
+            "limit": self._limit,
+            "min_limit": self._min,
+            "max_limit": self._max,
+            "rtt_ms": round(self._last_rtt * 1000, 3),
+            "rtt_noload_ms": round(self._rtt_noload * 1000, 3),
+            "queue_estimate": round(self._last_queue, 2),
+            "increases": self._increases,
+            "decreases": self._decreases,
+            "app_limited_windows": self._app_limited_windows,
+            "noload_probes": self._probes,
+            "recent_decisions": list(self._decisions),
+        }
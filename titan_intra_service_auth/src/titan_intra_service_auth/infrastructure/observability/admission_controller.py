@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Controle de admissão na frente de uma lane de semáforo (mint, verify) — falha rápida.
+Sem isso, sob sobrecarga os requests se acumulam atrás do semáforo até o timeout de 30s
+do use case: latência de cauda sem limite e trabalho feito para clientes que já desistiram.
+CoDel (variante "fila com prazo"): mede o tempo de espera por slot (sojourn). Se o menor
+sojourn de um intervalo inteiro ficou acima do alvo, a fila não está drenando (fila ruim,
+não rajada) → modo sobrecarga: a espera máxima cai de `interval` para `target`.
+Na chegada, fila cheia (max_queue) ou atraso estimado (fila / slots × tempo de serviço
+médio) acima da espera máxima → rejeita na hora, sem entrar na fila.
+Rejeição = OverloadedError (→ 503 + Retry-After); transições do modo sobrecarga vão para
+o callback (MetricsPort.set_overloaded → circuit_breaker).
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000001
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, Optional
+
+from titan_intra_service_auth.application.ports.concurrency_port import OverloadedError
+
+# Peso da amostra nova na média móvel do tempo de serviço
+_EWMA_ALPHA = 0.05
+
+
+class CoDelAdmissionController:
+    """
+    Estado CoDel de uma lane. Só tocado no event loop — sem lock.
+    admit() antes de enfileirar, queue_timeout() para a espera, on_dequeue()/on_complete()
+    com os tempos medidos; reject_timeout() quando a espera estourou.
+    """
+
+    def __init__(
+        self,
+        target_ms: float = 25.0,
+        interval_ms: float = 250.0,
+        max_queue: int = 20000,
+        on_state_change: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        self._target = max(0.001, target_ms / 1000)
+        self._interval = max(self._target, interval_ms / 1000)
+        self._max_queue = max(1, max_queue)
+        self._on_state_change = on_state_change
+        self._overloaded = False
+        self._interval_end = time.perf_counter() + self._interval
+        self._min_sojourn = 0.0
+        self._service_ewma = 0.0
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_delay = 0
+        self._rejected_timeout = 0
+        self._overload_episodes = 0
+
+    @property
+    def overloaded(self) -> bool:
+        return self._overloaded
+
+    def queue_timeout(self) -> float:
+        """Espera máxima por slot (s): target em sobrecarga, interval fora dela."""
+        return self._target if self._overloaded else self._interval
+
+    def _estimated_delay(self, waiting: int, slots: int) -> float:
+        # Little: vazão ≈ slots / tempo de serviço → espera ≈ fila / vazão
+        return (waiting + 1) * self._service_ewma / slots
+
+    def _retry_after(self, estimated_delay: float) -> int:
+        return max(1, math.ceil(estimated_delay))
+
+    def admit(self, waiting: int, slots: int) -> None:
+        """Chamado com a lane cheia, antes de enfileirar; levanta OverloadedError se não cabe."""
+        if waiting >= self._max_queue:
+            self._rejected_queue_full += 1
+            raise OverloadedError(self._retry_after(self._estimated_delay(waiting, slots)), "queue_full")
+        estimated = self._estimated_delay(waiting, slots)
+        if estimated > self.queue_timeout():
+            self._rejected_delay += 1
+            raise OverloadedError(self._retry_after(estimated), "queue_delay")
+
+    def reject_timeout(self, waiting: int, slots: int) -> OverloadedError:
+        """Espera por slot estourou queue_timeout(): erro a levantar pelo chamador."""
+        self._rejected_timeout += 1
+        return OverloadedError(self._retry_after(self._estimated_delay(waiting, slots)), "queue_timeout")
+
+    def on_dequeue(self, sojourn_sec: float) -> None:
+        """Tempo de espera por slot (0 = slot livre na chegada; timeout conta como espera inteira)."""
+        now = time.perf_counter()
+        if now < self._interval_end:
+            if sojourn_sec < self._min_sojourn:
+                self._min_sojourn = sojourn_sec
+            return
+        # Fim do intervalo: nenhum request passou abaixo do alvo → fila persistente
+        overloaded = min(self._min_sojourn, sojourn_sec) > self._target
+        self._min_sojourn = sojourn_sec
+        self._interval_end = now + self._interval
+        if overloaded != self._overloaded:
+            self._overloaded = overloaded
+            if overloaded:
+                self._overload_episodes += 1
+            if self._on_state_change is not None:
+                self._on_state_change(overloaded)
+
+    def on_complete(self, service_sec: float) -> None:
+        """Tempo com o slot ocupado (executor + trabalho) — base do atraso estimado."""
+        self._admitted += 1
+        if self._service_ewma == 0.0:
+            self._service_ewma = service_sec
+        else:
+            self._service_ewma += _EWMA_ALPHA * (service_sec - self._service_ewma)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": "OVERLOADED" if self._overloaded else "OK",
+            "target_ms": round(self._target * 1000, 3),
+            "interval_ms": round(self._interval * 1000, 3),
+            "max_queue": self._max_queue,
+            "queue_timeout_ms": round(self.queue_timeout() * 1000, 3),
+            "service_time_ewma_ms": round(self._service_ewma * 1000, 3),
+            "admitted": self._admitted,
+            "rejected_queue_full": self._rejected_queue_full,
+            "rejected_queue_delay": self._rejected_delay,
+            "rejected_queue_timeout": self._rejected_timeout,
+            "overload_episodes": self._overload_episodes,
+        }
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Jobs de fundo do worker — loops periódicos (sweep de challenges, poll de revogações do CA, ...)
+e hooks de shutdown.
+Uma rodada que falha não derruba o loop, mas também não some: vai para o log
+(logging.exception) e para os contadores por job em background_jobs no stats.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000001
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundJobs:
+    """
+    add(nome, job async, intervalo) antes do startup; start() no lifespan cria as tasks,
+    stop() as cancela e roda os hooks de shutdown (add_shutdown_hook), cada um isolado.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: List[Tuple[str, Callable[[], Awaitable[Any]], float]] = []
+        self._hooks: List[Tuple[str, Callable[[], None]]] = []
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, name: str, job: Callable[[], Awaitable[Any]], interval_sec: float) -> None:
+        self._jobs.append((name, job, interval_sec))
+        self._stats[name] = {"interval_sec": interval_sec, "runs": 0, "failures": 0, "last_error": None, "last_error_at": None}
+
+    def add_shutdown_hook(self, name: str, hook: Callable[[], None]) -> None:
+        self._hooks.append((name, hook))
+        self._stats.setdefault(f"shutdown:{name}", {"runs": 0, "failures": 0, "last_error": None, "last_error_at": None})
+
+    def _record_failure(self, name: str, error: BaseException) -> None:
+        stats = self._stats[name]
+        stats["failures"] += 1
+        stats["last_error"] = f"{type(error).__name__}: {error}"
+        stats["last_error_at"] = time.time()
+
+    async def _run(self, name: str, job: Callable[[], Awaitable[Any]], interval_sec: float) -> None:
+        stats = self._stats[name]
+        while True:
+            await asyncio.sleep(interval_sec)
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Job de fundo %s falhou", name)
+                self._record_failure(name, e)
+            stats["runs"] += 1
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._run(name, job, interval)) for name, job, interval in self._jobs]
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        for name, hook in self._hooks:
+            key = f"shutdown:{name}"
+            try:
+                hook()
+            except Exception as e:
+                logger.exception("Hook de shutdown %s falhou", name)
+                self._record_failure(key, e)
+            self._stats[key]["runs"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {name: dict(stats) for name, stats in self._stats.items()}
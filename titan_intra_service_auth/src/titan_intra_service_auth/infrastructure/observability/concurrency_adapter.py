@@ -2,14 +2,22 @@
 """
 Adapter: ConcurrencyAdapter — implements ConcurrencyPort with asyncio.Semaphore + ThreadPoolExecutor.
 Pipeline multi-lane: pool dedicado a crypto (ECDSA libera GIL em C); semáforo controla fila in-memory.
-Elias Andrade — Replika AI Solutions
+Com admission (CoDelAdmissionController), a fila do semáforo tem prazo e rejeita cedo (OverloadedError).
+Com limiter (VegasConcurrencyLimit), o número de slots acompanha o tempo de slot medido.
+O slot só volta quando a thread termina fn — quem desiste de esperar (timeout/cancel) não o libera.
+Elias Andrade — Replika AI Solutions — Micro-revisão 000000003
 """
 
 import asyncio
+import contextvars
+import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, TypeVar
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 from titan_intra_service_auth.application.ports.concurrency_port import ConcurrencyPort
+from titan_intra_service_auth.application.ports.stage_trace_port import StageTrace, current_trace
+from titan_intra_service_auth.infrastructure.observability.adaptive_limit import VegasConcurrencyLimit
+from titan_intra_service_auth.infrastructure.observability.admission_controller import CoDelAdmissionController
 
 T = TypeVar("T")
 
@@ -18,18 +26,179 @@ class ConcurrencyAdapter(ConcurrencyPort):
     """
     Pipeline único: acquire slot (semáforo) → run_in_executor(pool, fn) → release slot.
     Crypto (ECDSA) é CPU-bound e libera GIL; N threads em paralelo. Sem fila duplicada.
+    Contadores de fila (waiting/in_use/peak) só são tocados no event loop — sem lock.
+    execution_mode="process": o CryptoPort despacha a assinatura para processos signer
+    (ProcessPoolSignerAdapter); as threads só aguardam o resultado, o semáforo segue igual.
+    Request amostrado (StageTrace ativo): marca <stage>_slot_wait, <stage>_queue (fila do
+    executor, marcada já na thread) e <stage>_resume (volta ao event loop); fn roda no
+    contexto copiado, então os mark_stage dela caem no mesmo trace.
+    Admission (opcional): com a lane cheia, admit() pode rejeitar antes de enfileirar; a espera
+    por slot tem prazo (queue_timeout) e estourá-lo também rejeita. Slot livre na chegada
+    não paga nada além de um locked().
+    Slot preso à thread: a devolução é done-callback do future do executor e o await passa
+    por asyncio.shield — wait_for/cancel de quem chamou larga o resultado, não o slot (senão
+    threads ocupadas + slots novos = concorrência sem teto com o backend lento).
+    slot_timeout (opcional): prazo só para a espera por slot (asyncio.TimeoutError); iniciado,
+    fn vai até o fim — para escritas que não podem virar "falhou" depois de gravar.
+    Limiter (opcional): cada slot devolvido alimenta o limiter com o tempo de slot e o tempo
+    de execução de fn na thread (referência sem fila); o limite
+    novo vale na hora — crescer libera permissões no semáforo, encolher retém as próximas
+    devolvidas (dívida) em vez de interromper quem já está rodando.
     """
 
-    def __init__(self, num_threads: int, semaphore_slots: int | None = None) -> None:
-        slots = semaphore_slots or num_threads * 2
+    def __init__(
+        self,
+        num_threads: int,
+        semaphore_slots: int | None = None,
+        thread_name_prefix: str = "titan-crypto-",
+        execution_mode: str = "thread",
+        stage_name: str = "crypto",
+        admission: Optional[CoDelAdmissionController] = None,
+        limiter: Optional[VegasConcurrencyLimit] = None,
+    ) -> None:
+        slots = limiter.limit if limiter is not None else semaphore_slots or num_threads * 2
+        self._num_threads = num_threads
+        self._slots = slots
+        self._limiter = limiter
+        # Permissões a reter nas próximas devoluções (limite encolheu com slots em uso)
+        self._shrink_debt = 0
+        self._execution_mode = execution_mode
+        self._stage_slot_wait = f"{stage_name}_slot_wait"
+        self._stage_queue = f"{stage_name}_queue"
+        self._stage_resume = f"{stage_name}_resume"
         self._pool = ThreadPoolExecutor(
             max_workers=num_threads,
-            thread_name_prefix="titan-crypto-",
+            thread_name_prefix=thread_name_prefix,
         )
         self._semaphore = asyncio.Semaphore(slots)
+        self._admission = admission
+        self._waiting = 0
+        self._in_use = 0
+        self._peak_waiting = 0
+        self._completed = 0
 
-    async def run_with_slot(self, fn: Callable[[], T]) -> T:
-        async with self._semaphore:
-            # get_running_loop() é obrigatório em contexto async (evita bug no Windows/Proactor)
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(self._pool, fn)
+    async def run_with_slot(self, fn: Callable[[], T], slot_timeout: Optional[float] = None) -> T:
+        admission = self._admission
+        limiter = self._limiter
+        if admission is not None and self._semaphore.locked():
+            admission.admit(self._waiting, self._slots)
+        self._waiting += 1
+        if self._waiting > self._peak_waiting:
+            self._peak_waiting = self._waiting
+        try:
+            if admission is not None:
+                await self._acquire_admitted(admission, slot_timeout)
+            elif slot_timeout is None:
+                await self._semaphore.acquire()
+            else:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=slot_timeout)
+        finally:
+            self._waiting -= 1
+        self._in_use += 1
+        started = time.perf_counter() if admission is not None or limiter is not None else 0.0
+        # Tempo de execução de fn na thread (sem a fila do executor): referência do limiter
+        service = [0.0]
+        if limiter is not None:
+            fn = self._timed(fn, service)
+        # get_running_loop() é obrigatório em contexto async (evita bug no Windows/Proactor)
+        loop = asyncio.get_running_loop()
+        trace = current_trace()
+        try:
+            if trace is None:
+                future = loop.run_in_executor(self._pool, fn)
+            else:
+                trace.mark(self._stage_slot_wait)
+                ctx = contextvars.copy_context()
+                future = loop.run_in_executor(self._pool, ctx.run, self._run_traced, trace, fn)
+        except BaseException:
+            self._release_slot(None, started, service)
+            raise
+        future.add_done_callback(lambda done: self._release_slot(done, started, service))
+        result = await asyncio.shield(future)
+        if trace is not None:
+            trace.mark(self._stage_resume)
+        return result
+
+    def _release_slot(self, future: Optional["asyncio.Future[Any]"], started: float, service: List[float]) -> None:
+        """Done-callback do future do executor (no event loop): devolve o slot e alimenta admission/limiter."""
+        if future is not None and not future.cancelled():
+            # Quem esperava pode ter desistido: marca a exceção como lida (sem "never retrieved")
+            future.exception()
+        in_use = self._in_use
+        self._in_use -= 1
+        self._completed += 1
+        if self._shrink_debt:
+            self._shrink_debt -= 1
+        else:
+            self._semaphore.release()
+        if started:
+            held = time.perf_counter() - started
+            if self._admission is not None:
+                self._admission.on_complete(held)
+            if self._limiter is not None:
+                self._resize(self._limiter.on_sample(held, service[0] or held, in_use))
+
+    @staticmethod
+    def _timed(fn: Callable[[], T], out: List[float]) -> Callable[[], T]:
+        def run() -> T:
+            t0 = time.perf_counter()
+            try:
+                return fn()
+            finally:
+                out[0] = time.perf_counter() - t0
+
+        return run
+
+    def _resize(self, limit: int) -> None:
+        delta = limit - self._slots
+        if delta == 0:
+            return
+        self._slots = limit
+        if delta < 0:
+            self._shrink_debt -= delta
+            return
+        # Crescer: primeiro cancela dívida pendente, o resto vira permissão nova
+        cancelled = min(self._shrink_debt, delta)
+        self._shrink_debt -= cancelled
+        for _ in range(delta - cancelled):
+            self._semaphore.release()
+
+    async def _acquire_admitted(self, admission: CoDelAdmissionController, slot_timeout: Optional[float]) -> None:
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            admission.on_dequeue(0.0)
+            return
+        t0 = time.perf_counter()
+        queue_timeout = admission.queue_timeout()
+        if slot_timeout is not None and slot_timeout < queue_timeout:
+            # Prazo do chamador vence antes do da admission: TimeoutError do chamador, não OverloadedError
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=slot_timeout)
+            finally:
+                admission.on_dequeue(time.perf_counter() - t0)
+            return
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=queue_timeout)
+        except asyncio.TimeoutError:
+            admission.on_dequeue(time.perf_counter() - t0)
+            raise admission.reject_timeout(self._waiting, self._slots) from None
+        admission.on_dequeue(time.perf_counter() - t0)
+
+    def _run_traced(self, trace: StageTrace, fn: Callable[[], T]) -> T:
+        trace.mark(self._stage_queue)
+        return fn()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot da fila/slots (para /v6/engine/stats)."""
+        return {
+            "execution_mode": self._execution_mode,
+            "threads": self._num_threads,
+            "slots_total": self._slots,
+            "slots_in_use": self._in_use,
+            "slots_available": max(0, self._slots - self._in_use),
+            "queue_depth": self._waiting,
+            "queue_peak": self._peak_waiting,
+            "completed": self._completed,
+            "admission": self._admission.get_stats() if self._admission is not None else {},
+            "adaptive_limit": self._limiter.get_stats() if self._limiter is not None else {},
+        }
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Adapter: FleetMetricsAdapter — MetricsPort com visão de todos os workers Uvicorn do host.
+Request path = LocalMetricsAdapter (shards por thread, sem lock compartilhado).
+publish() copia os totais do worker para o seu slot no MetricsSegment (mmap, sem IPC;
+job periódico + a cada snapshot); get_snapshot() soma os slots vivos → TPS e contadores
+da frota inteira em /v6/engine/stats, não só do worker que respondeu.
+circuit_breaker da frota: "OPEN" se algum worker está rejeitando (controle de admissão).
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000004
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from titan_intra_service_auth.application.ports.metrics_port import MetricsPort
+from titan_intra_service_auth.infrastructure.observability.latency_histogram import LatencyHistogram
+from titan_intra_service_auth.infrastructure.observability.metrics_segment import MetricsSegment
+from titan_intra_service_auth.infrastructure.observability.shared_metrics_adapter import LocalMetricsAdapter
+
+# Somados entre workers
+_SUM_KEYS = (
+    "http_req_total",
+    "http_req_2xx",
+    "http_req_4xx",
+    "http_req_5xx",
+    "http_active_connections",
+    "lat_sum",
+    "sec_tokens_minted",
+    "sec_blocked_attempts",
+    "q_dropped_reqs",
+)
+
+
+class FleetMetricsAdapter(MetricsPort):
+    """Métricas locais por worker + agregação de todos os workers via segmento mmap."""
+
+    def __init__(
+        self,
+        local: LocalMetricsAdapter,
+        segment: MetricsSegment,
+        stale_after_sec: float = 5.0,
+    ) -> None:
+        self._local = local
+        self._segment = segment
+        self._stale_after = stale_after_sec
+        self._segment.claim_slot()
+
+    def record_http_request(
+        self,
+        status_class: str,
+        latency_ms: float,
+        active_connections: Optional[int] = None,
+        route: Optional[str] = None,
+    ) -> None:
+        self._local.record_http_request(status_class, latency_ms, active_connections, route)
+
+    def record_mint(self, user: str, jti: str) -> None:
+        self._local.record_mint(user, jti)
+
+    def record_mint_failure(self) -> None:
+        self._local.record_mint_failure()
+
+    def record_dropped_request(self) -> None:
+        self._local.record_dropped_request()
+
+    def set_overloaded(self, lane: str, overloaded: bool) -> None:
+        self._local.set_overloaded(lane, overloaded)
+
+    def increment_active_connections(self) -> int:
+        return self._local.increment_active_connections()
+
+    def decrement_active_connections(self) -> None:
+        self._local.decrement_active_connections()
+
+    def _publish_counters(self) -> Dict[str, Any]:
+        snap = self._local.get_counters()
+        self._segment.publish(
+            {**snap, "heartbeat": time.time(), "circuit_open": int(snap["circuit_breaker"] == "OPEN")},
+            snap["latency_histogram"].to_bytes(),
+        )
+        return snap
+
+    async def publish(self) -> None:
+        """Job periódico: mantém o slot deste worker atualizado (heartbeat + totais)."""
+        self._publish_counters()
+
+    def release(self) -> None:
+        self._segment.release()
+
+    def get_counters(self) -> Dict[str, Any]:
+        """Totais da frota (slots vivos) + histograma geral da frota em "latency_histogram"."""
+        snap = self._publish_counters()
+        workers = self._segment.read_live(self._stale_after)
+        if not workers:
+            return snap
+        for key in _SUM_KEYS:
+            snap[key] = sum(w[key] for w in workers)
+        total = snap["http_req_total"]
+        snap["lat_avg"] = snap["lat_sum"] / total if total else 0.0
+        snap["lat_max"] = max(w["lat_max"] for w in workers)
+        mins = [w["lat_min"] for w in workers if w["lat_min"]]
+        snap["lat_min"] = min(mins) if mins else 0.0
+        snap["sec_signatures"] = snap["sec_tokens_minted"]
+        if any(w["circuit_open"] for w in workers):
+            snap["circuit_breaker"] = "OPEN"
+        fleet_latency = LatencyHistogram()
+        for w in workers:
+            fleet_latency.merge_counts(w["latency_counts"])
+        # Soma e pico exatos vêm dos campos do slot (merge_counts só estima pelos buckets)
+        fleet_latency.sum_us = int(snap["lat_sum"] * 1000)
+        fleet_latency.max_us = int(snap["lat_max"] * 1000)
+        snap["latency_histogram"] = fleet_latency
+        snap["engine_start_time"] = min(w["engine_start_time"] for w in workers)
+        snap["active_workers"] = len(workers)
+        snap["fleet"] = [
+            {
+                "pid": w["pid"],
+                "slot": w["slot"],
+                "requests": w["http_req_total"],
+                "tokens_minted": w["sec_tokens_minted"],
+                "active_connections": w["http_active_connections"],
+                "dropped_requests": w["q_dropped_reqs"],
+                "heartbeat_age_sec": round(time.time() - w["heartbeat"], 3),
+            }
+            for w in workers
+        ]
+        return snap
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        snap = self.get_counters()
+        snap["latency_histograms"] = self._local.latency_report()
+        if "fleet" in snap:
+            # Acumulado geral = frota; janelas e por rota = worker que respondeu
+            snap["latency_histograms"]["overall"]["cumulative"] = snap["latency_histogram"].summary_ms()
+            snap["latency_histograms"]["overall"]["cumulative_scope"] = "fleet"
+        return snap
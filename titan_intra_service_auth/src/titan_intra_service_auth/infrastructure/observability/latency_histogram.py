@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Histogramas de latência estilo HDR — log-linear, memória fixa, record O(1).
+Valores em microssegundos. Abaixo de 2^SUB_BITS µs cada valor tem bucket próprio;
+acima, cada potência de 2 é dividida em 2^(SUB_BITS-1) buckets lineares → erro
+relativo ≤ 1/2^(SUB_BITS-1) (~1.6%; o ponto médio reportado fica em ~0.8%).
+Histogramas somam bucket a bucket: merge entre threads, workers e janelas.
+WindowedLatencyHistogram mantém, além do acumulado, um anel de fatias de 5s para
+percentis das janelas de 10s e 60s (um outlier sai da janela em vez de ficar para sempre).
+A janela de W s soma a fatia corrente (parcial) e as W/5 fatias completas anteriores: cobre
+de W a W+5 s, nunca menos que W (só as W/5 mais recentes dariam de W-5 a W s).
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+_SUB_BITS = 6
+_SUB = 1 << _SUB_BITS
+_HALF = _SUB >> 1
+# Teto de 60s: acima disso o valor é contado no último bucket
+MAX_TRACKABLE_US = 60_000_000
+_MAX_SHIFT = MAX_TRACKABLE_US.bit_length() - _SUB_BITS
+NUM_BUCKETS = _SUB + _MAX_SHIFT * _HALF
+BUCKETS_NBYTES = NUM_BUCKETS * 8
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+_SLICE_SEC = 5
+_NUM_SLICES = 13  # fatia corrente + 12 × 5s completas = janela de 60s inteira
+
+
+def bucket_index(value_us: int) -> int:
+    if value_us < _SUB:
+        return value_us if value_us > 0 else 0
+    if value_us > MAX_TRACKABLE_US:
+        value_us = MAX_TRACKABLE_US
+    shift = value_us.bit_length() - _SUB_BITS
+    return _SUB + (shift - 1) * _HALF + ((value_us >> shift) - _HALF)
+
+
+def bucket_midpoint_us(index: int) -> float:
+    if index < _SUB:
+        return float(index)
+    k = index - _SUB
+    shift = k // _HALF + 1
+    lower = (k % _HALF + _HALF) << shift
+    return lower + (1 << shift) / 2
+
+
+def _percentile_label(p: float) -> str:
+    return "p" + (f"{p:g}".replace(".", "_"))
+
+
+class LatencyHistogram:
+    """Contagens por bucket (array de int64) + total/soma/máximo exatos."""
+
+    __slots__ = ("counts", "total", "sum_us", "max_us")
+
+    def __init__(self) -> None:
+        self.counts = array("q", bytes(BUCKETS_NBYTES))
+        self.total = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def record_us(self, value_us: int) -> None:
+        self.counts[bucket_index(value_us)] += 1
+        self.total += 1
+        self.sum_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def record_ms(self, value_ms: float) -> None:
+        self.record_us(int(value_ms * 1000))
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if other.total:
+            counts = self.counts
+            for i, c in enumerate(other.counts):
+                if c:
+                    counts[i] += c
+            self.total += other.total
+            self.sum_us += other.sum_us
+            if other.max_us > self.max_us:
+                self.max_us = other.max_us
+        return self
+
+    def merge_counts(self, raw: bytes) -> None:
+        """Soma contagens serializadas (to_bytes de outro processo); total/soma derivados dos buckets."""
+        other = array("q")
+        other.frombytes(raw)
+        counts = self.counts
+        for i, c in enumerate(other):
+            if c:
+                counts[i] += c
+                self.total += c
+                mid = bucket_midpoint_us(i)
+                self.sum_us += int(mid * c)
+                if mid > self.max_us:
+                    self.max_us = int(mid)
+
+    def to_bytes(self) -> bytes:
+        return self.counts.tobytes()
+
+    def percentiles_us(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> List[float]:
+        """Percentis em µs numa única passada pelos buckets."""
+        if not self.total:
+            return [0.0] * len(percentiles)
+        ranks = sorted((max(1, math.ceil(p / 100.0 * self.total)), pos) for pos, p in enumerate(percentiles))
+        out = [0.0] * len(percentiles)
+        seen = 0
+        r = 0
+        for i, c in enumerate(self.counts):
+            if not c:
+                continue
+            seen += c
+            while r < len(ranks) and ranks[r][0] <= seen:
+                out[ranks[r][1]] = min(bucket_midpoint_us(i), float(self.max_us))
+                r += 1
+            if r == len(ranks):
+                break
+        return out
+
+    def summary_ms(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        summary: Dict[str, float] = {"count": self.total}
+        for p, v in zip(percentiles, self.percentiles_us(percentiles)):
+            summary[_percentile_label(p)] = round(v / 1000, 3)
+        summary["avg"] = round(self.sum_us / self.total / 1000, 3) if self.total else 0.0
+        summary["max"] = round(self.max_us / 1000, 3)
+        return summary
+
+
+class WindowedLatencyHistogram:
+    """Acumulado + anel de fatias de 5s (janelas de 10s e 60s). Fatias alocadas sob demanda."""
+
+    __slots__ = ("cumulative", "_slices", "_slice_ids")
+
+    def __init__(self) -> None:
+        self.cumulative = LatencyHistogram()
+        self._slices: List[Optional[LatencyHistogram]] = [None] * _NUM_SLICES
+        self._slice_ids = [-1] * _NUM_SLICES
+
+    def record_ms(self, value_ms: float, now: float) -> None:
+        value_us = int(value_ms * 1000)
+        self.cumulative.record_us(value_us)
+        slice_id = int(now // _SLICE_SEC)
+        pos = slice_id % _NUM_SLICES
+        if self._slice_ids[pos] != slice_id:
+            self._slices[pos] = LatencyHistogram()
+            self._slice_ids[pos] = slice_id
+        self._slices[pos].record_us(value_us)
+
+    def window_slices(self, window_sec: float, now: float) -> Iterable[LatencyHistogram]:
+        current = int(now // _SLICE_SEC)
+        oldest = current - max(1, math.ceil(window_sec / _SLICE_SEC))
+        for sid, hist in zip(self._slice_ids, self._slices):
+            if hist is not None and oldest <= sid <= current:
+                yield hist
+
+
+def merge_windowed(
+    parts: Iterable[WindowedLatencyHistogram],
+    now: float,
+    windows: Tuple[int, ...] = (10, 60),
+) -> Tuple[LatencyHistogram, Dict[int, LatencyHistogram]]:
+    """Soma histogramas (ex.: um por thread) → (acumulado, {janela_s: histograma})."""
+    total = LatencyHistogram()
+    per_window = {w: LatencyHistogram() for w in windows}
+    for part in parts:
+        total.merge(part.cumulative)
+        for w in windows:
+            for hist in part.window_slices(w, now):
+                per_window[w].merge(hist)
+    return total, per_window
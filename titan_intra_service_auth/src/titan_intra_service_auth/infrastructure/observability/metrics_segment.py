@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Segmento de métricas em arquivo mmap — um bloco fixo por worker, sem IPC.
+Layout: header de 64 bytes (magic, versão, nº de slots) + N slots alinhados em 64 bytes
+(campos numéricos + contagens do histograma de latência acumulado do worker).
+Cada worker reivindica um slot (pid livre ou morto) e é o único escritor dele; publica
+seus totais com um seqlock (seq ímpar = escrita em andamento), então leitores de outros
+processos nunca veem um slot rasgado. O agregador soma os slots vivos.
+Arquivo mmap (e não multiprocessing.shared_memory): funciona igual em Linux e Windows,
+sobrevive ao worker que o criou e não depende do resource_tracker.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000003
+"""
+
+import mmap
+import os
+import random
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from titan_intra_service_auth.infrastructure.observability.latency_histogram import BUCKETS_NBYTES
+
+_MAGIC = b"TITANMS1"
+_LAYOUT_VERSION = 3
+_HEADER = struct.Struct("<8sII")
+_HEADER_SIZE = 64
+_DEFAULT_SLOTS = 64
+
+# (campo, formato struct) — "seq" precisa ser o primeiro (offset 0 do slot)
+SLOT_FIELDS = (
+    ("seq", "q"),
+    ("pid", "q"),
+    ("heartbeat", "d"),
+    ("engine_start_time", "d"),
+    ("http_req_total", "q"),
+    ("http_req_2xx", "q"),
+    ("http_req_4xx", "q"),
+    ("http_req_5xx", "q"),
+    ("http_active_connections", "q"),
+    ("lat_sum", "d"),
+    ("lat_min", "d"),
+    ("lat_max", "d"),
+    ("sec_tokens_minted", "q"),
+    ("sec_blocked_attempts", "q"),
+    ("q_dropped_reqs", "q"),
+    ("circuit_open", "q"),
+)
+_SLOT = struct.Struct("<" + "".join(fmt for _, fmt in SLOT_FIELDS))
+_HIST_OFFSET = _SLOT.size
+_SLOT_SIZE = (_SLOT.size + BUCKETS_NBYTES + 63) // 64 * 64
+_SEQ = struct.Struct("<q")
+_PID = struct.Struct("<q")
+_PID_OFFSET = _SEQ.size
+_FIELD_NAMES = tuple(name for name, _ in SLOT_FIELDS)
+_READ_RETRIES = 8
+
+
+class MetricsSegment:
+    """Arquivo mmap com um slot de métricas por worker (escritor único por slot)."""
+
+    def __init__(self, path: Optional[str] = None, num_slots: int = _DEFAULT_SLOTS) -> None:
+        _base = Path(__file__).resolve().parent.parent.parent.parent.parent
+        self._path = path or os.environ.get(
+            "TITAN_METRICS_SEGMENT_PATH",
+            str(_base / "data" / "metrics_segment.bin"),
+        )
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        self._num_slots = max(1, num_slots)
+        size = _HEADER_SIZE + self._num_slots * _SLOT_SIZE
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        magic, version, slots = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _LAYOUT_VERSION or slots != self._num_slots:
+            if magic == _MAGIC:
+                # Layout antigo: zera os slots (arquivo novo já vem zerado do ftruncate)
+                self._mm[:size] = bytes(size)
+            # Workers concorrentes escrevem o mesmo header — idempotente
+            _HEADER.pack_into(self._mm, 0, _MAGIC, _LAYOUT_VERSION, self._num_slots)
+        self._slot: Optional[int] = None
+        self._seq = 0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def slot(self) -> Optional[int]:
+        return self._slot
+
+    def _offset(self, slot: int) -> int:
+        return _HEADER_SIZE + slot * _SLOT_SIZE
+
+    def _slot_is_free(self, slot: int, stale_after_sec: float) -> bool:
+        values = self._read_slot(slot)
+        if values is None:
+            # seq ímpar permanente = escritor morreu no meio da escrita
+            pid = _PID.unpack_from(self._mm, self._offset(slot) + _PID_OFFSET)[0]
+            return not psutil.pid_exists(pid)
+        pid = values["pid"]
+        if pid == 0 or not psutil.pid_exists(pid):
+            return True
+        # pid reaproveitado por outro processo: slot sem heartbeat há muito tempo
+        return time.time() - values["heartbeat"] > stale_after_sec
+
+    def claim_slot(self, stale_after_sec: float = 30.0) -> int:
+        """Reivindica um slot livre: escreve o pid, espera um instante e confirma que ninguém sobrescreveu."""
+        pid = os.getpid()
+        for _ in range(5):
+            for slot in range(self._num_slots):
+                if not self._slot_is_free(slot, stale_after_sec):
+                    continue
+                off = self._offset(slot)
+                _PID.pack_into(self._mm, off + _PID_OFFSET, pid)
+                time.sleep(random.uniform(0.005, 0.02))
+                if _PID.unpack_from(self._mm, off + _PID_OFFSET)[0] != pid:
+                    continue
+                self._slot = slot
+                self._seq = _SEQ.unpack_from(self._mm, off)[0] & ~1
+                self.publish({"pid": pid, "heartbeat": time.time()}, bytes(BUCKETS_NBYTES))
+                return slot
+        raise RuntimeError(f"Sem slot livre no segmento de métricas {self._path} ({self._num_slots} slots)")
+
+    def publish(self, values: Dict[str, Any], latency_counts: Optional[bytes] = None) -> None:
+        """Escreve os totais deste worker no seu slot (seqlock: ímpar durante a escrita)."""
+        if self._slot is None:
+            return
+        off = self._offset(self._slot)
+        seq = self._seq + 1
+        _SEQ.pack_into(self._mm, off, seq)
+        row = [seq]
+        row.extend(values.get(name, 0) for name in _FIELD_NAMES[1:])
+        row[1] = os.getpid()
+        _SLOT.pack_into(self._mm, off, *row)
+        if latency_counts is not None:
+            self._mm[off + _HIST_OFFSET : off + _HIST_OFFSET + BUCKETS_NBYTES] = latency_counts
+        self._seq = seq + 1
+        _SEQ.pack_into(self._mm, off, self._seq)
+
+    def release(self) -> None:
+        """Libera o slot (shutdown limpo); slot de worker morto é reaproveitado de qualquer forma."""
+        if self._slot is None:
+            return
+        self.publish({}, bytes(BUCKETS_NBYTES))
+        _PID.pack_into(self._mm, self._offset(self._slot) + _PID_OFFSET, 0)
+        self._slot = None
+
+    def _read_slot(self, slot: int) -> Optional[Dict[str, Any]]:
+        off = self._offset(slot)
+        for _ in range(_READ_RETRIES):
+            seq_before = _SEQ.unpack_from(self._mm, off)[0]
+            if seq_before & 1:
+                continue
+            row = _SLOT.unpack_from(self._mm, off)
+            counts = self._mm[off + _HIST_OFFSET : off + _HIST_OFFSET + BUCKETS_NBYTES]
+            if _SEQ.unpack_from(self._mm, off)[0] == seq_before:
+                values = dict(zip(_FIELD_NAMES, row))
+                values["latency_counts"] = counts
+                return values
+        return None
+
+    def read_live(self, stale_after_sec: float) -> List[Dict[str, Any]]:
+        """Slots com worker vivo e heartbeat recente."""
+        now = time.time()
+        live = []
+        for slot in range(self._num_slots):
+            values = self._read_slot(slot)
+            if values is None or values["pid"] == 0:
+                continue
+            if now - values["heartbeat"] > stale_after_sec or not psutil.pid_exists(values["pid"]):
+                continue
+            values["slot"] = slot
+            live.append(values)
+        return live
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Shards de métricas por thread — caminho de request sem lock compartilhado.
+Cada thread (event loop, pool de crypto, pool de verify) escreve só no seu
+MetricsShard (__slots__, inteiros/floats simples); o lock do registro é tomado
+uma única vez por thread, na criação do shard. get_snapshot soma os shards sob
+demanda (leitura de atributos é atômica sob o GIL; o snapshot pode estar no
+máximo um incremento atrás de uma escrita concorrente).
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from titan_intra_service_auth.infrastructure.observability.latency_histogram import (
+    LatencyHistogram,
+    WindowedLatencyHistogram,
+    merge_windowed,
+)
+
+# Carimbo global para "último usuário/jti": next() em itertools.count é atômico no CPython
+_SEQ = itertools.count(1)
+
+
+class MetricsShard:
+    """Contadores de uma thread. Só a thread dona escreve."""
+
+    __slots__ = (
+        "req_total",
+        "req_2xx",
+        "req_4xx",
+        "req_5xx",
+        "lat_sum",
+        "lat_min",
+        "lat_max",
+        "minted",
+        "blocked",
+        "dropped",
+        "active_delta",
+        "last_seq",
+        "last_user",
+        "last_jti",
+        "latency_all",
+        "latency_by_route",
+    )
+
+    def __init__(self) -> None:
+        self.req_total = 0
+        self.req_2xx = 0
+        self.req_4xx = 0
+        self.req_5xx = 0
+        self.lat_sum = 0.0
+        self.lat_min = 0.0
+        self.lat_max = 0.0
+        self.minted = 0
+        self.blocked = 0
+        self.dropped = 0
+        self.active_delta = 0
+        self.last_seq = 0
+        self.last_user = "none"
+        self.last_jti = "none"
+        self.latency_all = WindowedLatencyHistogram()
+        # (rota, classe de status) -> histograma
+        self.latency_by_route: Dict[Tuple[str, str], WindowedLatencyHistogram] = {}
+
+    def record_http(self, status_class: str, latency_ms: float, route: Optional[str] = None) -> None:
+        self.req_total += 1
+        if status_class == "2xx":
+            self.req_2xx += 1
+        elif status_class == "4xx":
+            self.req_4xx += 1
+        else:
+            self.req_5xx += 1
+        self.lat_sum += latency_ms
+        if latency_ms > self.lat_max:
+            self.lat_max = latency_ms
+        if self.lat_min == 0 or latency_ms < self.lat_min:
+            self.lat_min = latency_ms
+        now = time.time()
+        self.latency_all.record_ms(latency_ms, now)
+        if route is not None:
+            key = (route, status_class)
+            hist = self.latency_by_route.get(key)
+            if hist is None:
+                hist = self.latency_by_route[key] = WindowedLatencyHistogram()
+            hist.record_ms(latency_ms, now)
+
+    def record_mint(self, user: str, jti: str) -> None:
+        self.minted += 1
+        self.last_user = user
+        self.last_jti = jti
+        self.last_seq = next(_SEQ)
+
+
+class ShardedMetrics:
+    """Registro de shards (um por thread) + merge para snapshot."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: List[MetricsShard] = []
+        self._registry_lock = threading.Lock()
+        # Gauge reportado pelo chamador (middleware conta in-flight no event loop)
+        self.reported_active = 0
+
+    def shard(self) -> MetricsShard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = MetricsShard()
+            with self._registry_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._shards)
+
+    def active_connections(self) -> int:
+        return self.reported_active + sum(s.active_delta for s in tuple(self._shards))
+
+    def merge(self) -> Dict[str, Any]:
+        """Soma os shards; retorna os campos de métricas no formato do schema."""
+        total = r2 = r4 = r5 = minted = blocked = dropped = active = 0
+        lat_sum = lat_min = lat_max = 0.0
+        last_seq, last_user, last_jti = 0, "none", "none"
+        for s in tuple(self._shards):
+            total += s.req_total
+            r2 += s.req_2xx
+            r4 += s.req_4xx
+            r5 += s.req_5xx
+            lat_sum += s.lat_sum
+            if s.lat_max > lat_max:
+                lat_max = s.lat_max
+            if s.lat_min and (lat_min == 0 or s.lat_min < lat_min):
+                lat_min = s.lat_min
+            minted += s.minted
+            blocked += s.blocked
+            dropped += s.dropped
+            active += s.active_delta
+            if s.last_seq > last_seq:
+                last_seq, last_user, last_jti = s.last_seq, s.last_user, s.last_jti
+        return {
+            "http_req_total": total,
+            "http_req_2xx": r2,
+            "http_req_4xx": r4,
+            "http_req_5xx": r5,
+            "http_active_connections": self.reported_active + active,
+            "lat_min": lat_min,
+            "lat_max": lat_max,
+            "lat_avg": lat_sum / total if total else 0.0,
+            "lat_sum": lat_sum,
+            "sec_tokens_minted": minted,
+            "sec_signatures": minted,
+            "sec_blocked_attempts": blocked,
+            "sec_last_user": last_user,
+            "sec_last_jti": last_jti,
+            "q_dropped_reqs": dropped,
+        }
+
+    def overall_latency(self) -> LatencyHistogram:
+        """Histograma acumulado de todas as rotas (soma dos shards)."""
+        total = LatencyHistogram()
+        for s in tuple(self._shards):
+            total.merge(s.latency_all.cumulative)
+        return total
+
+    def latency_report(self) -> Dict[str, Any]:
+        """Percentis acumulados + janelas 10s/60s (cada uma cobre de W a W+5 s), geral e por rota/classe de status."""
+        now = time.time()
+        shards = tuple(self._shards)
+        report = {"overall": _summarize(*merge_windowed((s.latency_all for s in shards), now))}
+        by_key: Dict[Tuple[str, str], List[WindowedLatencyHistogram]] = {}
+        for s in shards:
+            for key, hist in tuple(s.latency_by_route.items()):
+                by_key.setdefault(key, []).append(hist)
+        routes: Dict[str, Dict[str, Any]] = {}
+        for (route, status_class), parts in sorted(by_key.items()):
+            routes.setdefault(route, {})[status_class] = _summarize(*merge_windowed(parts, now))
+        report["routes"] = routes
+        return report
+
+
+def _summarize(cumulative: LatencyHistogram, windows: Dict[int, LatencyHistogram]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"cumulative": cumulative.summary_ms()}
+    for w, hist in windows.items():
+        out[f"window_{w}s"] = hist.summary_ms()
+    return out
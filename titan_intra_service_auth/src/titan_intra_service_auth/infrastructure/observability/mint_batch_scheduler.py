@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Adapter: MintBatchScheduler — micro-batching de assinaturas na frente do ConcurrencyPort.
+Sem batch, cada mint paga um acquire de semáforo, um run_in_executor e um wake-up de
+future. Aqui os payloads que chegam juntos são agrupados até max_batch_size itens ou
+max_delay_us microssegundos; o lote inteiro é assinado numa única tarefa do executor
+(CryptoPort.sign_many) e cada future individual é resolvida com o seu token.
+Troca: até max_delay_us de latência extra por muito menos overhead de agendamento.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000002
+"""
+
+import asyncio
+import bisect
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from titan_intra_service_auth.application.ports.concurrency_port import ConcurrencyPort
+from titan_intra_service_auth.application.ports.crypto_port import CryptoPort
+from titan_intra_service_auth.application.ports.sign_batcher_port import SignBatcherPort
+from titan_intra_service_auth.application.ports.stage_trace_port import clear_trace
+
+# Limites superiores dos buckets (último bucket = acima do maior limite)
+_WAIT_BOUNDS_US = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+
+def _size_bounds(max_batch_size: int) -> Tuple[int, ...]:
+    bounds = [1]
+    while bounds[-1] < max_batch_size:
+        bounds.append(min(bounds[-1] * 2, max_batch_size))
+    return tuple(bounds)
+
+
+class _FixedHistogram:
+    """Contagem por bucket fixo (le=limite). Só tocado no event loop — sem lock."""
+
+    __slots__ = ("_bounds", "_counts", "_sum", "_total")
+
+    def __init__(self, bounds: Sequence[int]) -> None:
+        self._bounds = tuple(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0
+        self._total = 0
+
+    def record(self, value: int) -> None:
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._sum += value
+        self._total += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {f"le_{b}": c for b, c in zip(self._bounds, self._counts)}
+        buckets["gt_" + str(self._bounds[-1])] = self._counts[-1]
+        return {
+            "count": self._total,
+            "avg": round(self._sum / self._total, 2) if self._total else 0.0,
+            "buckets": buckets,
+        }
+
+
+class MintBatchScheduler(SignBatcherPort):
+    """
+    submit(payload) → token. Fila pendente + timer no event loop; flush por tamanho ou prazo.
+    Cada lote ocupa um único slot do ConcurrencyPort (uma hop de executor por lote).
+    """
+
+    def __init__(
+        self,
+        crypto: CryptoPort,
+        concurrency: ConcurrencyPort,
+        max_batch_size: int = 32,
+        max_delay_us: int = 500,
+    ) -> None:
+        self._crypto = crypto
+        self._concurrency = concurrency
+        self._max_batch = max(1, max_batch_size)
+        self._max_delay_us = max(0, max_delay_us)
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future, int]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self._batches = 0
+        self._items = 0
+        self._flush_full = 0
+        self._flush_timer = 0
+        self._failures = 0
+        self._batch_size_hist = _FixedHistogram(_size_bounds(self._max_batch))
+        self._queue_wait_hist = _FixedHistogram(_WAIT_BOUNDS_US)
+
+    async def submit(self, payload: Dict[str, Any]) -> str:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((payload, future, time.perf_counter_ns()))
+        if len(self._pending) >= self._max_batch:
+            self._flush_full += 1
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay_us / 1_000_000, self._on_timer)
+        return await future
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._flush_timer += 1
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future, int]]) -> None:
+        # A task herda o contexto de quem disparou o flush; o lote não pertence a um request só
+        clear_trace()
+        # Futures já canceladas (timeout do cliente no use case) não são assinadas
+        live = [(payload, future, enq_ns) for payload, future, enq_ns in batch if not future.done()]
+        if not live:
+            return
+        payloads = [payload for payload, _, _ in live]
+        crypto = self._crypto
+
+        def do_sign() -> Tuple[int, List[Union[str, Exception]]]:
+            started_ns = time.perf_counter_ns()
+            try:
+                return started_ns, list(crypto.sign_many(payloads))
+            except Exception:
+                # Isola o item com problema: refaz um a um para não falhar o lote inteiro
+                results: List[Union[str, Exception]] = []
+                for payload in payloads:
+                    try:
+                        results.append(crypto.sign(payload))
+                    except Exception as exc:
+                        results.append(exc)
+                return started_ns, results
+
+        try:
+            started_ns, results = await self._concurrency.run_with_slot(do_sign)
+        except Exception as exc:
+            self._failures += len(live)
+            for _, future, _ in live:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self._batches += 1
+        self._items += len(live)
+        self._batch_size_hist.record(len(live))
+        for (_, future, enq_ns), result in zip(live, results):
+            self._queue_wait_hist.record(max(0, started_ns - enq_ns) // 1000)
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                self._failures += 1
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot do batcher (para /v6/engine/stats)."""
+        return {
+            "max_batch_size": self._max_batch,
+            "max_delay_us": self._max_delay_us,
+            "pending": len(self._pending),
+            "inflight_batches": len(self._inflight),
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "flush_full": self._flush_full,
+            "flush_timer": self._flush_timer,
+            "failures": self._failures,
+            "batch_size_hist": self._batch_size_hist.snapshot(),
+            "queue_wait_us_hist": self._queue_wait_hist.snapshot(),
+        }
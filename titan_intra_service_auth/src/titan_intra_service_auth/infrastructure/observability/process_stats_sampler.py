@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Amostrador de estatísticas do processo — psutil e COUNT(*) do CA fora do caminho do scrape.
+memory_full_info (lê /proc/<pid>/smaps), io_counters e os COUNT(*) no SQLite custam
+milissegundos; num scrape de 1s em N workers isso vira carga de verdade. Aqui eles
+rodam num job periódico (em thread, para não travar o event loop) e /metrics só lê
+o último resultado — junto com a idade da amostra.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000001
+"""
+
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import psutil
+
+if TYPE_CHECKING:
+    # Só para tipagem: infrastructure.ca importa observability (evita import circular)
+    from titan_intra_service_auth.infrastructure.ca.ca_repository import CARepository
+
+
+class ProcessStatsSampler:
+    """Última amostra de psutil (+ contagens do CA) deste worker."""
+
+    def __init__(self, ca_repository: Optional["CARepository"] = None) -> None:
+        self._proc = psutil.Process()
+        self._ca_repository = ca_repository
+        # Primeira chamada de cpu_percent só arma a medição (sempre retorna 0.0)
+        self._proc.cpu_percent()
+        self._sample: Dict[str, Any] = self._collect()
+
+    def _collect(self) -> Dict[str, Any]:
+        proc = self._proc
+        with proc.oneshot():
+            mem = proc.memory_full_info()
+            io = proc.io_counters()
+            ctx = proc.num_ctx_switches()
+            cpu_times = proc.cpu_times()
+            sample: Dict[str, Any] = {
+                "pid": os.getpid(),
+                "cpu_percent": proc.cpu_percent(),
+                "cpu_seconds": cpu_times.user + cpu_times.system,
+                "memory_rss_bytes": mem.rss,
+                "memory_uss_bytes": mem.uss,
+                "memory_vms_bytes": mem.vms,
+                "open_fds": getattr(proc, "num_fds", lambda: 0)(),
+                "threads": proc.num_threads(),
+                "ctx_switches_voluntary": ctx.voluntary,
+                "ctx_switches_involuntary": ctx.involuntary,
+                "io_read_bytes": io.read_bytes,
+                "io_write_bytes": io.write_bytes,
+            }
+        if self._ca_repository is not None:
+            try:
+                sample["ca_identities_active"] = self._ca_repository.count_identities(include_revoked=False)
+                sample["ca_identities_revoked"] = self._ca_repository.count_revoked()
+                sample["ca_status"] = "ok"
+            except Exception:
+                sample["ca_status"] = "error"
+        sample["sampled_at"] = time.time()
+        return sample
+
+    def sample_now(self) -> None:
+        """Coleta síncrona (quem não registra o job periódico)."""
+        self._sample = self._collect()
+
+    async def sample(self) -> None:
+        """Job periódico: coleta numa thread e troca a referência (leitores nunca veem amostra parcial)."""
+        self._sample = await asyncio.to_thread(self._collect)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Última amostra (dict imutável na prática: substituído inteiro a cada coleta)."""
+        return self._sample
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Exposição para /metrics — render barato, scrape de 1s em N workers. Dois templates:
+texto Prometheus 0.0.4 (default, PROMETHEUS_CONTENT_TYPE) e OpenMetrics 1.0.0 (família de
+counter sem _total, "# EOF"; OPENMETRICS_CONTENT_TYPE) — a rota escolhe pelo Accept.
+O texto inteiro (HELP/TYPE, nomes, labels, buckets) é montado uma única vez no __init__
+como um template com placeholders; cada scrape só coleta os valores (get_counters do
+MetricsPort, snapshot do ZKPMetricsStore, última amostra do ProcessStatsSampler, stats do
+cache de reuso de token) e faz
+um único "template % valores". Sem psutil nem SQLite no scrape.
+Histograma de latência: buckets `le` fixos derivados do histograma HDR geral (prefix-sum
+sobre os 704 buckets; fronteira exata até ~1.6%). Com o backend "segment", contadores
+HTTP/mint e latência são da frota; ZKP e processo são do worker que respondeu (label worker).
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000004
+"""
+
+import itertools
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from titan_intra_service_auth.application.ports.metrics_port import MetricsPort
+from titan_intra_service_auth.application.ports.token_cache_port import TokenCachePort
+from titan_intra_service_auth.infrastructure.observability.latency_histogram import LatencyHistogram, bucket_index
+from titan_intra_service_auth.infrastructure.observability.process_stats_sampler import ProcessStatsSampler
+from titan_intra_service_auth.infrastructure.zkp_metrics import ZKPMetricsStore
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Fronteiras do histograma HTTP (segundos)
+_LATENCY_BOUNDS_SEC = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_BOUND_INDEXES = tuple(bucket_index(int(b * 1_000_000)) for b in _LATENCY_BOUNDS_SEC)
+
+# Contexto de um scrape: (counters, zkp, process, token_cache)
+_Ctx = Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]
+_Getter = Callable[[_Ctx], Any]
+
+
+def _m(key: str) -> _Getter:
+    return lambda ctx: ctx[0].get(key, 0)
+
+
+def _z(key: str) -> _Getter:
+    return lambda ctx: ctx[1].get(key, 0)
+
+
+def _p(key: str) -> _Getter:
+    return lambda ctx: ctx[2].get(key, 0)
+
+
+def _c(key: str) -> _Getter:
+    return lambda ctx: ctx[3].get(key, 0)
+
+
+class _TemplateBuilder:
+    """Acumula linhas do texto de exposição; valores viram %s e seus getters, na mesma ordem."""
+
+    def __init__(self, openmetrics: bool) -> None:
+        self.openmetrics = openmetrics
+        self.lines: List[str] = []
+        self.getters: List[_Getter] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> None:
+        # OpenMetrics: família de counter sem o sufixo _total; Prometheus 0.0.4: com
+        family = name[: -len("_total")] if self.openmetrics and kind == "counter" else name
+        self.lines.append(f"# HELP {family} {help_text}")
+        self.lines.append(f"# TYPE {family} {kind}")
+
+    def sample(self, name: str, getter: _Getter, labels: str = "") -> None:
+        self.lines.append(f"{name}{{{labels}}} %s" if labels else f"{name} %s")
+        self.getters.append(getter)
+
+    def build(self) -> Tuple[str, Tuple[_Getter, ...]]:
+        if self.openmetrics:
+            self.lines.append("# EOF")
+        # % literal em HELP não pode virar placeholder
+        text = "\n".join(line if line.endswith(" %s") else line.replace("%", "%%") for line in self.lines)
+        return text + "\n", tuple(self.getters)
+
+
+class PrometheusExporter:
+    """Renderiza /metrics a partir de templates pré-montados (OpenMetrics e Prometheus 0.0.4)."""
+
+    def __init__(
+        self,
+        metrics: MetricsPort,
+        zkp_metrics: Optional[ZKPMetricsStore] = None,
+        process_stats: Optional[ProcessStatsSampler] = None,
+        token_cache: Optional[TokenCachePort] = None,
+    ) -> None:
+        self._metrics = metrics
+        self._zkp = zkp_metrics
+        self._process = process_stats
+        self._token_cache = token_cache
+        self._templates = {flavour: self._build_template(flavour) for flavour in (True, False)}
+
+    def _build_template(self, openmetrics: bool) -> Tuple[str, Tuple[_Getter, ...]]:
+        t = _TemplateBuilder(openmetrics)
+        worker = f'worker="{os.getpid()}"'
+
+        t.family("titan_http_requests_total", "counter", "HTTP requests by status class.")
+        for code in ("2xx", "4xx", "5xx"):
+            t.sample("titan_http_requests_total", _m(f"http_req_{code}"), f'code="{code}"')
+        t.family("titan_http_request_duration_seconds", "histogram", "HTTP request latency (all routes).")
+        for i, bound in enumerate(_LATENCY_BOUNDS_SEC):
+            t.sample(
+                "titan_http_request_duration_seconds_bucket",
+                lambda ctx, i=i: ctx[0]["_latency_buckets"][i],
+                f'le="{bound:g}"',
+            )
+        t.sample("titan_http_request_duration_seconds_bucket", lambda ctx: ctx[0]["_latency_count"], 'le="+Inf"')
+        t.sample("titan_http_request_duration_seconds_count", lambda ctx: ctx[0]["_latency_count"])
+        t.sample("titan_http_request_duration_seconds_sum", lambda ctx: ctx[0].get("lat_sum", 0.0) / 1000)
+        t.family("titan_http_active_connections", "gauge", "In-flight HTTP requests.")
+        t.sample("titan_http_active_connections", _m("http_active_connections"))
+        t.family("titan_tokens_minted_total", "counter", "JWTs signed.")
+        t.sample("titan_tokens_minted_total", _m("sec_tokens_minted"))
+        t.family("titan_mint_failures_total", "counter", "Rejected or failed mint attempts.")
+        t.sample("titan_mint_failures_total", _m("sec_blocked_attempts"))
+        t.family("titan_requests_dropped_total", "counter", "Requests shed before processing.")
+        t.sample("titan_requests_dropped_total", _m("q_dropped_reqs"))
+        t.family("titan_circuit_breaker_open", "gauge", "1 while the circuit breaker is not CLOSED.")
+        t.sample("titan_circuit_breaker_open", lambda ctx: int(ctx[0].get("circuit_breaker") != "CLOSED"))
+        t.family("titan_active_workers", "gauge", "Workers reporting into this snapshot.")
+        t.sample("titan_active_workers", _m("active_workers"))
+        t.family("titan_engine_start_time_seconds", "gauge", "Engine start time (unix seconds).")
+        t.sample("titan_engine_start_time_seconds", _m("engine_start_time"))
+
+        if self._zkp is not None:
+            t.family("titan_zkp_identities_created_total", "counter", "ZKP identities registered by this worker.")
+            t.sample("titan_zkp_identities_created_total", _z("zkp_identities_created"), worker)
+            t.family("titan_zkp_challenges_issued_total", "counter", "ZKP challenges issued by this worker.")
+            t.sample("titan_zkp_challenges_issued_total", _z("zkp_challenges_issued"), worker)
+            t.family("titan_zkp_mints_total", "counter", "ZKP mints by result (this worker).")
+            t.sample("titan_zkp_mints_total", _z("zkp_mints_success"), f'{worker},result="success"')
+            t.sample("titan_zkp_mints_total", _z("zkp_mints_failed"), f'{worker},result="failed"')
+
+        if self._process is not None:
+            for name, kind, key, help_text in (
+                ("titan_process_cpu_seconds_total", "counter", "cpu_seconds", "User + system CPU time."),
+                ("titan_process_cpu_percent", "gauge", "cpu_percent", "CPU percent between samples."),
+                ("titan_process_resident_memory_bytes", "gauge", "memory_rss_bytes", "Resident set size."),
+                ("titan_process_unique_memory_bytes", "gauge", "memory_uss_bytes", "Unique set size (USS)."),
+                ("titan_process_virtual_memory_bytes", "gauge", "memory_vms_bytes", "Virtual memory size."),
+                ("titan_process_open_fds", "gauge", "open_fds", "Open file descriptors."),
+                ("titan_process_threads", "gauge", "threads", "OS threads."),
+                ("titan_process_voluntary_ctx_switches_total", "counter", "ctx_switches_voluntary", "Voluntary context switches."),
+                ("titan_process_involuntary_ctx_switches_total", "counter", "ctx_switches_involuntary", "Involuntary context switches."),
+                ("titan_process_io_read_bytes_total", "counter", "io_read_bytes", "Bytes read (storage I/O)."),
+                ("titan_process_io_write_bytes_total", "counter", "io_write_bytes", "Bytes written (storage I/O)."),
+            ):
+                t.family(name, kind, help_text)
+                t.sample(name, _p(key), worker)
+            t.family("titan_process_stats_age_seconds", "gauge", "Age of the sampled process stats.")
+            t.sample("titan_process_stats_age_seconds", lambda ctx: round(time.time() - ctx[2].get("sampled_at", 0), 3), worker)
+            t.family("titan_ca_identities", "gauge", "CA identities by state (sampled).")
+            t.sample("titan_ca_identities", _p("ca_identities_active"), 'state="active"')
+            t.sample("titan_ca_identities", _p("ca_identities_revoked"), 'state="revoked"')
+
+        if self._token_cache is not None:
+            t.family("titan_mint_token_cache_lookups_total", "counter", "Mint token reuse cache lookups by result (this worker).")
+            t.sample("titan_mint_token_cache_lookups_total", _c("hits"), f'{worker},result="hit"')
+            t.sample("titan_mint_token_cache_lookups_total", _c("misses"), f'{worker},result="miss"')
+            t.family("titan_mint_token_cache_invalidations_total", "counter", "Cached tokens dropped on revocation (this worker).")
+            t.sample("titan_mint_token_cache_invalidations_total", _c("invalidations"), worker)
+            t.family("titan_mint_token_cache_entries", "gauge", "Tokens held by the mint reuse cache (this worker).")
+            t.sample("titan_mint_token_cache_entries", _c("size"), worker)
+        return t.build()
+
+    def render(self, openmetrics: bool = True) -> bytes:
+        """Texto de exposição: coleta os valores e preenche o template pré-montado."""
+        counters = self._metrics.get_counters()
+        hist = counters.get("latency_histogram")
+        if isinstance(hist, LatencyHistogram):
+            cumulative = list(itertools.accumulate(hist.counts))
+            counters["_latency_buckets"] = [cumulative[i] for i in _BOUND_INDEXES]
+            counters["_latency_count"] = hist.total
+        else:
+            counters["_latency_buckets"] = [0] * len(_BOUND_INDEXES)
+            counters["_latency_count"] = counters.get("http_req_total", 0)
+        ctx: _Ctx = (
+            counters,
+            self._zkp.get_snapshot() if self._zkp is not None else {},
+            self._process.snapshot() if self._process is not None else {},
+            self._token_cache.get_stats() if self._token_cache is not None else {},
+        )
+        template, getters = self._templates[openmetrics]
+        return (template % tuple(g(ctx) for g in getters)).encode()
@@ -1,19 +1,38 @@
 # -*- coding: utf-8 -*-
 """
 Adapter: SharedMetricsAdapter — implements MetricsPort using multiprocessing.Manager dict + Lock.
-Buffer local para record_mint reduz IPC/lock entre processos (máxima performance).
-Elias Andrade — Replika AI Solutions
+Caminho de request sem lock compartilhado: cada thread escreve no próprio MetricsShard;
+snapshot soma os shards (Local) ou publica deltas no Manager dict (Shared).
+circuit_breaker: "OPEN" enquanto alguma lane do controle de admissão rejeita requests;
+fora disso, histerese por conexões ativas (CLOSED / UNDER_LOAD).
+Elias Andrade — Replika AI Solutions — Micro-revisão 000000004
 """
 
 import threading
 import time
 from multiprocessing import Manager
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Set
 
 from titan_intra_service_auth.application.ports.metrics_port import MetricsPort
-
-# Tamanho do buffer antes de flush no Manager (reduz contenção em multi-processo)
-_MINT_FLUSH_THRESHOLD = 5
+from titan_intra_service_auth.infrastructure.observability.latency_histogram import LatencyHistogram
+from titan_intra_service_auth.infrastructure.observability.metrics_shards import ShardedMetrics
+
+# Circuit breaker com histerese: abre acima de _CB_OPEN_ABOVE conexões, fecha abaixo de _CB_CLOSE_BELOW
+_CB_OPEN_ABOVE = 18000
+_CB_CLOSE_BELOW = 5000
+# Campos somáveis publicados como delta no Manager dict
+_ADDITIVE_KEYS = (
+    "http_req_total",
+    "http_req_2xx",
+    "http_req_4xx",
+    "http_req_5xx",
+    "http_active_connections",
+    "lat_sum",
+    "sec_tokens_minted",
+    "sec_signatures",
+    "sec_blocked_attempts",
+    "q_dropped_reqs",
+)
 
 
 def _schema_dict(version: str, num_workers: int) -> Dict[str, Any]:
@@ -55,170 +74,169 @@ def create_local_metrics_adapter(version: str, num_workers: int) -> "LocalMetric
     return LocalMetricsAdapter(version, num_workers)
 
 
-def _do_flush_into(d: Dict[str, Any], lock: Any, n: int, u: str, j: str) -> None:
-    """Atualiza dict sob lock com n mints (evita re-entrar em _local_lock)."""
-    if n <= 0:
-        return
-    with lock:
-        d["sec_tokens_minted"] = d["sec_tokens_minted"] + n
-        d["sec_signatures"] = d["sec_signatures"] + n
-        d["sec_last_user"] = u
-        d["sec_last_jti"] = j
+def _next_circuit_state(current: str, active: int, overloaded: bool = False) -> str:
+    if overloaded:
+        return "OPEN"
+    if active > _CB_OPEN_ABOVE:
+        return "UNDER_LOAD"
+    if active < _CB_CLOSE_BELOW or current == "OPEN":
+        return "CLOSED"
+    return current
 
 
 class LocalMetricsAdapter(MetricsPort):
     """
-    Métricas por processo (sem Manager): cada worker tem seu próprio dict + Lock.
+    Métricas por processo (sem Manager): contadores em shards por thread.
     Usado quando UVCORN_WORKERS > 1 no Windows (spawn não serializa Manager).
     Mesma interface que SharedMetricsAdapter; /stats reflete só este worker.
-    SEM DEADLOCK: flush nunca adquire _local_lock de dentro de record_mint.
+    Request path: só atributos do shard da thread atual — nenhum lock compartilhado.
     """
 
     def __init__(self, version: str, num_workers: int) -> None:
         self._d = _schema_dict(version, num_workers)
-        self._lock = threading.Lock()
-        self._local_mint_buffer = 0
-        self._local_lock = threading.Lock()
-        self._last_user = "none"
-        self._last_jti = "none"
-
-    def _flush_mint_buffer(self) -> None:
-        """Lê buffer sob _local_lock, depois atualiza dict (nunca segura os dois)."""
-        with self._local_lock:
-            n = self._local_mint_buffer
-            u, j = self._last_user, self._last_jti
-            self._local_mint_buffer = 0
-        _do_flush_into(self._d, self._lock, n, u, j)
-
-    def record_http_request(self, status_class: str, latency_ms: float) -> None:
-        with self._lock:
-            self._d["http_req_total"] = self._d["http_req_total"] + 1
-            if status_class == "2xx":
-                self._d["http_req_2xx"] = self._d["http_req_2xx"] + 1
-            elif status_class == "4xx":
-                self._d["http_req_4xx"] = self._d["http_req_4xx"] + 1
-            else:
-                self._d["http_req_5xx"] = self._d["http_req_5xx"] + 1
-            self._d["lat_sum"] = self._d["lat_sum"] + latency_ms
-            total = self._d["http_req_total"]
-            self._d["lat_avg"] = self._d["lat_sum"] / total
-            if latency_ms > self._d["lat_max"]:
-                self._d["lat_max"] = latency_ms
-            if self._d["lat_min"] == 0 or latency_ms < self._d["lat_min"]:
-                self._d["lat_min"] = latency_ms
-            if self._d["http_active_connections"] < 5000:
-                self._d["circuit_breaker"] = "CLOSED"
+        self._shards = ShardedMetrics()
+        self._circuit = "CLOSED"
+        self._overloaded_lanes: Set[str] = set()
+
+    def record_http_request(
+        self,
+        status_class: str,
+        latency_ms: float,
+        active_connections: Optional[int] = None,
+        route: Optional[str] = None,
+    ) -> None:
+        if active_connections is not None:
+            self._shards.reported_active = active_connections
+        self._shards.shard().record_http(status_class, latency_ms, route)
 
     def record_mint(self, user: str, jti: str) -> None:
-        need_flush = False
-        n, u, j = 0, "none", "none"
-        with self._local_lock:
-            self._local_mint_buffer += 1
-            self._last_user = user
-            self._last_jti = jti
-            if self._local_mint_buffer >= _MINT_FLUSH_THRESHOLD:
-                n = self._local_mint_buffer
-                u, j = self._last_user, self._last_jti
-                self._local_mint_buffer = 0
-                need_flush = True
-        if need_flush:
-            _do_flush_into(self._d, self._lock, n, u, j)
+        self._shards.shard().record_mint(user, jti)
 
     def record_mint_failure(self) -> None:
-        with self._lock:
-            self._d["sec_blocked_attempts"] = self._d["sec_blocked_attempts"] + 1
+        self._shards.shard().blocked += 1
+
+    def record_dropped_request(self) -> None:
+        self._shards.shard().dropped += 1
+
+    def set_overloaded(self, lane: str, overloaded: bool) -> None:
+        if overloaded:
+            self._overloaded_lanes.add(lane)
+        else:
+            self._overloaded_lanes.discard(lane)
+
+    def get_counters(self) -> Dict[str, Any]:
+        snap = dict(self._d)
+        snap.update(self._shards.merge())
+        self._circuit = _next_circuit_state(
+            self._circuit, snap["http_active_connections"], bool(self._overloaded_lanes)
+        )
+        snap["circuit_breaker"] = self._circuit
+        snap["metrics_shards"] = self._shards.num_shards
+        snap["latency_histogram"] = self._shards.overall_latency()
+        return snap
 
     def get_snapshot(self) -> Dict[str, Any]:
-        self._flush_mint_buffer()
-        with self._lock:
-            return dict(self._d)
+        snap = self.get_counters()
+        snap["latency_histograms"] = self.latency_report()
+        return snap
+
+    def latency_report(self) -> Dict[str, Any]:
+        """Percentis (acumulado + janelas), geral e por rota, deste worker."""
+        return self._shards.latency_report()
+
+    def overall_latency(self) -> LatencyHistogram:
+        """Histograma acumulado de todas as rotas deste worker (para agregação entre workers)."""
+        return self._shards.overall_latency()
 
     def increment_active_connections(self) -> int:
-        with self._lock:
-            self._d["http_active_connections"] = self._d["http_active_connections"] + 1
-            active = self._d["http_active_connections"]
-            if active > 18000:
-                self._d["circuit_breaker"] = "UNDER_LOAD"
-            return active
+        self._shards.shard().active_delta += 1
+        return self._shards.active_connections()
 
     def decrement_active_connections(self) -> None:
-        with self._lock:
-            self._d["http_active_connections"] = self._d["http_active_connections"] - 1
+        self._shards.shard().active_delta -= 1
 
 
 class SharedMetricsAdapter(MetricsPort):
     """
     Implementa MetricsPort com memória compartilhada (Manager).
-    Buffer local para record_mint: acumula N mints e faz um único flush (menos lock/IPC).
-    SEM DEADLOCK: flush nunca adquire _local_lock de dentro de record_mint.
+    Request path escreve só em shards locais; flush() publica os deltas deste processo
+    no Manager dict sob o lock compartilhado (chamado no snapshot ou por job periódico).
     """
 
     def __init__(self, shared_dict: Dict[str, Any], lock: Any) -> None:
         self._d = shared_dict
         self._lock = lock
-        self._local_mint_buffer = 0
-        self._local_lock = threading.Lock()
-        self._last_user = "none"
-        self._last_jti = "none"
-
-    def _flush_mint_buffer(self) -> None:
-        with self._local_lock:
-            n = self._local_mint_buffer
-            u, j = self._last_user, self._last_jti
-            self._local_mint_buffer = 0
-        _do_flush_into(self._d, self._lock, n, u, j)
-
-    def record_http_request(self, status_class: str, latency_ms: float) -> None:
-        with self._lock:
-            self._d["http_req_total"] = self._d["http_req_total"] + 1
-            if status_class == "2xx":
-                self._d["http_req_2xx"] = self._d["http_req_2xx"] + 1
-            elif status_class == "4xx":
-                self._d["http_req_4xx"] = self._d["http_req_4xx"] + 1
-            else:
-                self._d["http_req_5xx"] = self._d["http_req_5xx"] + 1
-            self._d["lat_sum"] = self._d["lat_sum"] + latency_ms
-            total = self._d["http_req_total"]
-            self._d["lat_avg"] = self._d["lat_sum"] / total
-            if latency_ms > self._d["lat_max"]:
-                self._d["lat_max"] = latency_ms
-            if self._d["lat_min"] == 0 or latency_ms < self._d["lat_min"]:
-                self._d["lat_min"] = latency_ms
-            if self._d["http_active_connections"] < 5000:
-                self._d["circuit_breaker"] = "CLOSED"
+        self._shards = ShardedMetrics()
+        self._published = self._shards.merge()
+        self._flush_lock = threading.Lock()
+        self._overloaded_lanes: Set[str] = set()
+
+    def record_http_request(
+        self,
+        status_class: str,
+        latency_ms: float,
+        active_connections: Optional[int] = None,
+        route: Optional[str] = None,
+    ) -> None:
+        if active_connections is not None:
+            self._shards.reported_active = active_connections
+        self._shards.shard().record_http(status_class, latency_ms, route)
 
     def record_mint(self, user: str, jti: str) -> None:
-        need_flush = False
-        n, u, j = 0, "none", "none"
-        with self._local_lock:
-            self._local_mint_buffer += 1
-            self._last_user = user
-            self._last_jti = jti
-            if self._local_mint_buffer >= _MINT_FLUSH_THRESHOLD:
-                n = self._local_mint_buffer
-                u, j = self._last_user, self._last_jti
-                self._local_mint_buffer = 0
-                need_flush = True
-        if need_flush:
-            _do_flush_into(self._d, self._lock, n, u, j)
+        self._shards.shard().record_mint(user, jti)
 
     def record_mint_failure(self) -> None:
+        self._shards.shard().blocked += 1
+
+    def record_dropped_request(self) -> None:
+        self._shards.shard().dropped += 1
+
+    def set_overloaded(self, lane: str, overloaded: bool) -> None:
+        if overloaded:
+            self._overloaded_lanes.add(lane)
+        else:
+            self._overloaded_lanes.discard(lane)
+
+    def flush(self) -> None:
+        """Publica no Manager dict o que mudou desde o último flush (fora do caminho de request)."""
+        with self._flush_lock:
+            merged = self._shards.merge()
+            prev = self._published
+            with self._lock:
+                for key in _ADDITIVE_KEYS:
+                    delta = merged[key] - prev[key]
+                    if delta:
+                        self._d[key] = self._d[key] + delta
+                total = self._d["http_req_total"]
+                self._d["lat_avg"] = self._d["lat_sum"] / total if total else 0.0
+                if merged["lat_max"] > self._d["lat_max"]:
+                    self._d["lat_max"] = merged["lat_max"]
+                if merged["lat_min"] and (self._d["lat_min"] == 0 or merged["lat_min"] < self._d["lat_min"]):
+                    self._d["lat_min"] = merged["lat_min"]
+                if merged["sec_tokens_minted"] != prev["sec_tokens_minted"]:
+                    self._d["sec_last_user"] = merged["sec_last_user"]
+                    self._d["sec_last_jti"] = merged["sec_last_jti"]
+                self._d["circuit_breaker"] = _next_circuit_state(
+                    self._d["circuit_breaker"], self._d["http_active_connections"], bool(self._overloaded_lanes)
+                )
+            self._published = merged
+
+    def get_counters(self) -> Dict[str, Any]:
+        self.flush()
         with self._lock:
-            self._d["sec_blocked_attempts"] = self._d["sec_blocked_attempts"] + 1
+            snap = dict(self._d)
+        # Histogramas: visão deste processo (não publicados no Manager dict)
+        snap["latency_histogram"] = self._shards.overall_latency()
+        return snap
 
     def get_snapshot(self) -> Dict[str, Any]:
-        self._flush_mint_buffer()
-        with self._lock:
-            return dict(self._d)
+        snap = self.get_counters()
+        snap["latency_histograms"] = self._shards.latency_report()
+        return snap
 
     def increment_active_connections(self) -> int:
-        with self._lock:
-            self._d["http_active_connections"] = self._d["http_active_connections"] + 1
-            active = self._d["http_active_connections"]
-            if active > 18000:
-                self._d["circuit_breaker"] = "UNDER_LOAD"
-            return active
+        self._shards.shard().active_delta += 1
+        return self._shards.active_connections()
 
     def decrement_active_connections(self) -> None:
-        with self._lock:
-            self._d["http_active_connections"] = self._d["http_active_connections"] - 1
+        self._shards.shard().active_delta -= 1
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Stage timings do request — onde vai o tempo de um mint (parse, challenge, pubkey,
+ECDSA verify, espera de slot, fila do executor, assinatura, serialização).
+O middleware abre um StageTrace para 1 em cada N requests (amostragem por contador,
+sem random no caminho quente) e, no http.response.start, soma cada estágio num
+histograma por (rota, estágio). Só o event loop grava → sem lock nem shards.
+Opcional: header Server-Timing com os estágios do próprio request (debug no DevTools/curl);
+com ele ligado, o cliente pode forçar a amostragem de um request com X-Titan-Timing: 1.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000001
+"""
+
+import itertools
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from titan_intra_service_auth.application.ports.stage_trace_port import StageTrace
+from titan_intra_service_auth.infrastructure.observability.latency_histogram import (
+    WindowedLatencyHistogram,
+    merge_windowed,
+)
+
+_HDR_FORCE = b"x-titan-timing"
+
+
+class StageTimingRecorder:
+    """Amostragem de StageTrace + histogramas por (rota, estágio)."""
+
+    def __init__(self, sample_rate: float, server_timing: bool = False) -> None:
+        # Taxa → "1 em cada N" (0 desliga a amostragem; Server-Timing forçado continua valendo)
+        self._sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self._every = round(1 / self._sample_rate) if self._sample_rate > 0 else 0
+        self._counter = itertools.count()
+        self._server_timing = server_timing
+        # rota -> {estágio: histograma}; estágios em ordem de primeira aparição (= ordem do pipeline)
+        self._routes: Dict[str, Dict[str, WindowedLatencyHistogram]] = {}
+        self._sampled = 0
+
+    @property
+    def server_timing(self) -> bool:
+        return self._server_timing
+
+    def start(self, headers: List[Tuple[bytes, bytes]]) -> Optional[StageTrace]:
+        """StageTrace para este request, ou None quando não amostrado."""
+        if self._server_timing and any(name == _HDR_FORCE for name, _ in headers):
+            return StageTrace()
+        if self._every and next(self._counter) % self._every == 0:
+            return StageTrace()
+        return None
+
+    def record(self, route: str, trace: StageTrace) -> None:
+        """Soma os estágios do request nos histogramas da rota (chamado no event loop)."""
+        self._sampled += 1
+        now = time.time()
+        stages = self._routes.get(route)
+        if stages is None:
+            stages = self._routes[route] = {}
+        for name, duration_ns in trace.stages:
+            hist = stages.get(name)
+            if hist is None:
+                hist = stages[name] = WindowedLatencyHistogram()
+            hist.record_ms(duration_ns / 1e6, now)
+
+    @staticmethod
+    def server_timing_value(trace: StageTrace) -> bytes:
+        """Header Server-Timing: "json_parse;dur=0.021, ecdsa_verify;dur=0.180, ..." (ms)."""
+        return ", ".join(f"{name};dur={ns / 1e6:.3f}" for name, ns in trace.stages).encode("latin-1")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Percentis por estágio (acumulado + janela de 60s) de cada rota amostrada."""
+        now = time.time()
+        routes: Dict[str, Dict[str, Any]] = {}
+        for route, stages in sorted(self._routes.items()):
+            out = routes[route] = {}
+            for name, hist in tuple(stages.items()):
+                cumulative, windows = merge_windowed((hist,), now, windows=(60,))
+                out[name] = {"cumulative": cumulative.summary_ms(), "window_60s": windows[60].summary_ms()}
+        return {
+            "sample_rate": self._sample_rate,
+            "sampled_requests": self._sampled,
+            "server_timing_header": self._server_timing,
+            "routes": routes,
+        }
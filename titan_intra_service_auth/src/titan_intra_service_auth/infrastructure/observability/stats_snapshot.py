@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshot em cache do /v6/engine/stats — JSON pré-serializado + ETag.
+Dashboards fazem polling de 1s (várias abas); montar o stats (merge de métricas,
+percentis, serialização) a cada GET compete com o tráfego de mint. Aqui um job de fundo
+reconstrói os bytes a cada intervalo; o GET só devolve a referência atual e, se o
+cliente já tem essa geração (If-None-Match), responde 304 sem corpo.
+Sem leitores há um tempo, o job para de reconstruir; o primeiro GET depois disso
+encontra o snapshot vencido e o reconstrói na hora.
+O job reconstrói numa thread (asyncio.to_thread): o build lê stats com I/O (contador do
+challenge store SQLite, contadores do CA) e esperar o pool deles no event loop travaria o mint.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000003
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+
+    def dumps_json(obj: Dict[str, Any]) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    _encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def dumps_json(obj: Dict[str, Any]) -> bytes:
+        return _encoder.encode(obj).encode()
+
+
+# Sem GET há mais de N intervalos → job de fundo pausa
+_IDLE_INTERVALS = 10
+
+
+class CachedStatsSnapshot:
+    """Corpo JSON + ETag do stats, reconstruídos em background (refresh_interval_sec=0 → a cada GET)."""
+
+    def __init__(self, build: Callable[[], Dict[str, Any]], refresh_interval_sec: float = 1.0) -> None:
+        self._build = build
+        self._interval = max(0.0, refresh_interval_sec)
+        # Um GET aceita snapshot de até 2 intervalos (job atrasado); acima disso reconstrói inline
+        self._max_age = self._interval * 2
+        self._etag_prefix = f"{os.getpid():x}{secrets.token_hex(2)}-"
+        # Rebuild do job (thread) e rebuild inline (loop) podem coincidir: geração + troca sob lock
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._data: Dict[str, Any] = {}
+        self._body: Optional[bytes] = None
+        self._etag = ""
+        self._built_at = 0.0
+        self._last_access = 0.0
+        self._builds = 0
+        self._builds_inline = 0
+        self._not_modified = 0
+        self._build_ms_last = 0.0
+
+    @property
+    def refresh_interval_sec(self) -> float:
+        return self._interval
+
+    def _rebuild(self) -> None:
+        t0 = time.perf_counter()
+        data = self._build()
+        body = dumps_json(data)
+        with self._lock:
+            self._generation += 1
+            # Troca atômica das referências: GET concorrente vê o par anterior ou o novo
+            self._data, self._body, self._etag = data, body, f'"{self._etag_prefix}{self._generation:x}"'
+            self._built_at = time.time()
+            self._builds += 1
+            self._build_ms_last = (time.perf_counter() - t0) * 1000
+
+    def _fresh(self) -> None:
+        now = time.time()
+        self._last_access = now
+        if self._body is None or now - self._built_at > self._max_age:
+            self._builds_inline += 1
+            self._rebuild()
+
+    def get(self) -> Tuple[bytes, str]:
+        """(corpo JSON, ETag) atuais; reconstrói na hora se vencido."""
+        self._fresh()
+        with self._lock:
+            return self._body, self._etag
+
+    def get_data(self) -> Tuple[Dict[str, Any], int]:
+        """(dict do snapshot, geração) — para quem deriva outros formatos (ex.: stream de deltas)."""
+        self._fresh()
+        with self._lock:
+            return self._data, self._generation
+
+    def record_not_modified(self) -> None:
+        self._not_modified += 1
+
+    async def refresh(self) -> None:
+        """Job periódico: reconstrói (fora do event loop) só enquanto alguém está lendo."""
+        if time.time() - self._last_access <= self._interval * _IDLE_INTERVALS:
+            await asyncio.to_thread(self._rebuild)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "refresh_interval_sec": self._interval,
+            "generation": self._generation,
+            "builds": self._builds,
+            "builds_inline": self._builds_inline,
+            "not_modified_responses": self._not_modified,
+            "last_build_ms": round(self._build_ms_last, 3),
+        }
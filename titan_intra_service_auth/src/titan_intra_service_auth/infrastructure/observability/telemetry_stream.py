@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Stream de telemetria (Server-Sent Events) — um produtor, N dashboards.
+Polling de 1s por aba = N requests, N passagens de middleware e N leituras do stats.
+Aqui uma única task produtora lê o snapshot do stats a cada intervalo, calcula o delta
+em relação ao frame anterior, serializa uma vez e entrega os mesmos bytes a todos os
+inscritos. Quem entra recebe primeiro o snapshot completo (event: snapshot), depois só
+deltas (event: delta; chave com null = removida). Inscrito lento (fila cheia) é
+desligado — o EventSource reconecta e recomeça de um snapshot completo. Limite de
+inscritos simultâneos; sem inscritos, a task produtora para.
+Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
+Micro-revisão: 000000001
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Set, Tuple
+
+from titan_intra_service_auth.infrastructure.observability.stats_snapshot import dumps_json
+
+# Reconexão sugerida ao EventSource (ms)
+_RETRY_MS = 2000
+_KEEPALIVE = b": keep-alive\n\n"
+
+
+def json_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta recursivo de dicts: chaves novas/alteradas, null para removidas; listas trocadas inteiras."""
+    delta: Dict[str, Any] = {}
+    for key, value in new.items():
+        if key not in old:
+            delta[key] = value
+            continue
+        previous = old[key]
+        if previous == value:
+            continue
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = json_delta(previous, value)
+            if nested:
+                delta[key] = nested
+        else:
+            delta[key] = value
+    for key in old:
+        if key not in new:
+            delta[key] = None
+    return delta
+
+
+def _frame(event: str, generation: int, payload: Dict[str, Any]) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (generation, event.encode(), dumps_json(payload))
+
+
+class _Subscriber:
+    __slots__ = ("frames", "wakeup", "dropped")
+
+    def __init__(self) -> None:
+        self.frames: Deque[bytes] = deque()
+        self.wakeup = asyncio.Event()
+        self.dropped = False
+
+
+class TelemetryBroadcaster:
+    """Produtor único de frames SSE; cada inscrito tem fila própria de até queue_size frames."""
+
+    def __init__(
+        self,
+        source: Callable[[], Tuple[Dict[str, Any], int]],
+        interval_sec: float = 1.0,
+        max_subscribers: int = 64,
+        queue_size: int = 8,
+    ) -> None:
+        self._source = source
+        self._interval = max(0.05, interval_sec)
+        self._max_subscribers = max(1, max_subscribers)
+        self._queue_size = max(1, queue_size)
+        self._subscribers: Set[_Subscriber] = set()
+        self._producer: Optional[asyncio.Task] = None
+        self._last: Dict[str, Any] = {}
+        self._last_generation = -1
+        # Snapshot completo do último frame, serializado sob demanda (só quando alguém entra)
+        self._full_frame: Optional[bytes] = None
+        self._frames_sent = 0
+        self._bytes_sent = 0
+        self._dropped = 0
+        self._rejected = 0
+
+    def _current_full_frame(self) -> bytes:
+        if self._full_frame is None:
+            # Com inscritos ativos, o snapshot tem de ser o estado que eles já têm (base do próximo delta)
+            if self._last_generation < 0 or not self._subscribers:
+                self._last, self._last_generation = self._source()
+            self._full_frame = _frame("snapshot", self._last_generation, self._last)
+        return self._full_frame
+
+    def _deliver(self, sub: _Subscriber, frame: bytes) -> None:
+        if sub.dropped:
+            return
+        if len(sub.frames) >= self._queue_size:
+            # Cliente não está drenando: desliga em vez de acumular memória
+            sub.dropped = True
+            self._dropped += 1
+            self._subscribers.discard(sub)
+        else:
+            sub.frames.append(frame)
+            self._frames_sent += 1
+            self._bytes_sent += len(frame)
+        sub.wakeup.set()
+
+    async def _produce(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self._interval)
+            data, generation = self._source()
+            if generation == self._last_generation:
+                frame = _KEEPALIVE
+            else:
+                delta = json_delta(self._last, data)
+                self._last, self._last_generation = data, generation
+                self._full_frame = None
+                frame = _frame("delta", generation, delta) if delta else _KEEPALIVE
+            for sub in tuple(self._subscribers):
+                self._deliver(sub, frame)
+
+    def subscribe(self) -> Optional[_Subscriber]:
+        """Novo inscrito já com o snapshot completo na fila; None se o limite foi atingido."""
+        if len(self._subscribers) >= self._max_subscribers:
+            self._rejected += 1
+            return None
+        sub = _Subscriber()
+        sub.frames.append(b"retry: %d\n\n" % _RETRY_MS)
+        sub.frames.append(self._current_full_frame())
+        sub.wakeup.set()
+        self._subscribers.add(sub)
+        if self._producer is None or self._producer.done():
+            self._producer = asyncio.get_running_loop().create_task(self._produce())
+        return sub
+
+    def unsubscribe(self, sub: _Subscriber) -> None:
+        self._subscribers.discard(sub)
+
+    async def frames(self, sub: _Subscriber) -> AsyncIterator[bytes]:
+        """Corpo do StreamingResponse: drena a fila do inscrito até ele ser desligado."""
+        try:
+            while True:
+                await sub.wakeup.wait()
+                sub.wakeup.clear()
+                while sub.frames:
+                    yield sub.frames.popleft()
+                if sub.dropped:
+                    return
+        finally:
+            self.unsubscribe(sub)
+
+    def close(self) -> None:
+        """Shutdown: derruba os inscritos e cancela o produtor."""
+        for sub in tuple(self._subscribers):
+            sub.dropped = True
+            sub.wakeup.set()
+        self._subscribers.clear()
+        if self._producer is not None:
+            self._producer.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self._max_subscribers,
+            "interval_sec": self._interval,
+            "frames_sent": self._frames_sent,
+            "bytes_sent": self._bytes_sent,
+            "dropped_slow_subscribers": self._dropped,
+            "rejected_over_limit": self._rejected,
+        }
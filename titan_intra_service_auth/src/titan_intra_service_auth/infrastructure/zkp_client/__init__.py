@@ -6,9 +6,13 @@ Geração de chaves, assinatura de nonces. Para uso em stress testers,
 microserviços e clientes que consomem a API ZKP.
 
 Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
-Micro-revisão: 000000001
+Micro-revisão: 000000002
 """
 
-from titan_intra_service_auth.infrastructure.zkp_client.keygen import generate_identity_keys, sign_nonce
+from titan_intra_service_auth.infrastructure.zkp_client.keygen import (
+    generate_identity_keys,
+    sign_epoch_proof,
+    sign_nonce,
+)
 
-__all__ = ["generate_identity_keys", "sign_nonce"]
+__all__ = ["generate_identity_keys", "sign_epoch_proof", "sign_nonce"]
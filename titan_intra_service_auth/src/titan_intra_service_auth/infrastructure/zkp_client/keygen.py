@@ -3,18 +3,21 @@
 🔐 KEYGEN — Geração de Chaves ECDSA e Assinatura de Nonces
 ==========================================================
 Utilitário para clientes: gera par P-256, assina nonce com SHA-256.
+sign_epoch_proof: proof de época para o mint em uma ida (sem GET /v6/zkp/challenge).
 Compatível com o CA (ca_service.verify_signature).
 
 Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
-Micro-revisão: 000000001
+Micro-revisão: 000000002
 """
 
 import base64
+import secrets
 from dataclasses import dataclass
 from typing import Tuple
 
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
+from titan_intra_service_auth.infrastructure.challenge_store.epoch_proof import epoch_proof_message
 
 
 @dataclass
@@ -70,3 +73,13 @@ def sign_nonce(private_key_pem: str, nonce: str) -> str:
     nonce_bytes = nonce.encode() if isinstance(nonce, str) else nonce
     signature = private_key.sign(nonce_bytes, ec.ECDSA(hashes.SHA256()))
     return base64.urlsafe_b64encode(signature).decode().rstrip("=")
+
+
+def sign_epoch_proof(private_key_pem: str, identity_id: str, epoch: int) -> Tuple[str, str]:
+    """
+    Proof de época: gera o random do cliente e assina identity_id|epoch|random.
+    Retorna (nonce, signature) para POST /v6/zkp/mint com {"identity_id", "epoch", "nonce", "signature"}.
+    epoch vem de GET /v6/zkp/epoch (ou floor(tempo / epoch_sec) com o relógio ajustado ao servidor).
+    """
+    nonce = secrets.token_urlsafe(24)
+    return nonce, sign_nonce(private_key_pem, epoch_proof_message(identity_id, epoch, nonce))
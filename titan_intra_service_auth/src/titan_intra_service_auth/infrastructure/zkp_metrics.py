@@ -6,12 +6,12 @@ Contadores para identidades criadas, challenges emitidos, mints ZKP (sucesso/fal
 Usado por zkp_routes e stats_routes para observabilidade ZKP.
 
 Autor: Elias Andrade — Arquiteto de Soluções — Replika AI — Maringá Paraná
-Micro-revisão: 000000001
+Micro-revisão: 000000003
 """
 
 import threading
 import time
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 
 class ZKPMetricsStore:
@@ -37,11 +37,25 @@ class ZKPMetricsStore:
             self._identities_created += 1
             self._last_identity_id = identity_id[:36] if identity_id else "none"
 
+    def record_identities_created(self, identity_ids: List[str]) -> None:
+        """Lote de identidades criadas (um lock para o lote todo)."""
+        if not identity_ids:
+            return
+        with self._lock:
+            self._identities_created += len(identity_ids)
+            self._last_identity_id = identity_ids[-1][:36]
+
     def record_challenge_issued(self) -> None:
         with self._lock:
             self._challenges_issued += 1
             self._last_challenge_ts = time.time()
 
+    def record_challenges_issued(self, count: int) -> None:
+        """Lote de challenges emitidos (/v6/zkp/challenge/batch)."""
+        with self._lock:
+            self._challenges_issued += count
+            self._last_challenge_ts = time.time()
+
     def record_mint_success(self) -> None:
         with self._lock:
             self._mints_success += 1
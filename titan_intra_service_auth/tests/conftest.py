@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Importar a camada HTTP monta o app do worker (fastapi_app): o CA dele vai para um banco temporário."""
+
+import os
+import tempfile
+
+os.environ.setdefault("TITAN_CA_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="titan-tests-"), "ca_zkp.db"))
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Limite Vegas: cresce e encolhe dentro de [min, max]; a lane devolve exatamente o limite novo em slots."""
+
+import asyncio
+import threading
+
+from titan_intra_service_auth.infrastructure.observability import ConcurrencyAdapter, VegasConcurrencyLimit
+
+
+def _limit(**kwargs):
+    # Uma decisão por amostra
+    return VegasConcurrencyLimit(window_sec=0, min_window_samples=1, **kwargs)
+
+
+def test_grows_without_queue_up_to_max():
+    limit = _limit(initial_limit=4, max_limit=6)
+    for _ in range(10):
+        limit.on_sample(0.01, 0.01, limit.limit)
+    assert limit.limit == 6
+    assert limit.get_stats()["increases"] == 2
+
+
+def test_does_not_grow_when_app_limited():
+    limit = _limit(initial_limit=8)
+    for _ in range(5):
+        limit.on_sample(0.01, 0.01, 1)
+    assert limit.limit == 8
+    assert limit.get_stats()["app_limited_windows"] == 5
+
+
+def test_shrinks_with_queue_down_to_min():
+    limit = _limit(initial_limit=40, min_limit=8)
+    limit.on_sample(0.01, 0.01, 40)  # referência sem fila: 10 ms
+    history = []
+    for _ in range(20):
+        # Slot 100× mais lento que a execução na thread: quase tudo é fila
+        history.append(limit.on_sample(1.0, 0.01, 40))
+    assert history == sorted(history, reverse=True)
+    assert limit.limit == 8 == min(history)
+
+
+class _ScriptedLimit:
+    """Limiter de teste: on_sample devolve o próximo limite do roteiro (ou repete o último)."""
+
+    def __init__(self, initial, script):
+        self.limit = initial
+        self._script = list(script)
+
+    def on_sample(self, rtt_sec, service_sec, inflight):
+        if self._script:
+            self.limit = self._script.pop(0)
+        return self.limit
+
+    def get_stats(self):
+        return {"limit": self.limit}
+
+
+def _peak_concurrency(adapter, tasks):
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def work():
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        threading.Event().wait(0.02)
+        with lock:
+            running[0] -= 1
+
+    async def scenario():
+        await asyncio.gather(*(adapter.run_with_slot(work) for _ in range(tasks)))
+
+    asyncio.run(scenario())
+    return running[1]
+
+
+def test_shrink_debt_never_over_releases():
+    # 4 slots em uso quando o limite cai para 1: 3 devoluções ficam retidas (dívida)
+    adapter = ConcurrencyAdapter(num_threads=8, limiter=_ScriptedLimit(4, [1]))
+    assert _peak_concurrency(adapter, 4) == 4
+    assert adapter.get_stats()["slots_total"] == 1
+    assert _peak_concurrency(adapter, 6) == 1
+
+
+def test_growth_cancels_pending_debt_first():
+    # Cai de 4 para 1 (dívida 3 com slots ainda em uso) e volta a 3 antes de quitar
+    adapter = ConcurrencyAdapter(num_threads=8, limiter=_ScriptedLimit(4, [1, 3]))
+    assert _peak_concurrency(adapter, 4) == 4
+    assert adapter.get_stats()["slots_total"] == 3
+    assert _peak_concurrency(adapter, 8) == 3
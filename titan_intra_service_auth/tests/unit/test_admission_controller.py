@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Admissão CoDel: rejeição na chegada (fila cheia / atraso estimado), modo sobrecarga e a lane real."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from titan_intra_service_auth.application.ports.concurrency_port import OverloadedError
+from titan_intra_service_auth.infrastructure.observability import CoDelAdmissionController, ConcurrencyAdapter
+
+
+def test_admits_while_estimated_delay_fits():
+    controller = CoDelAdmissionController(target_ms=25, interval_ms=250)
+    controller.admit(waiting=100, slots=1)  # sem amostra de serviço ainda: atraso estimado 0
+    controller.on_complete(0.1)
+    # (9 + 1) × 100 ms / 4 slots = 250 ms = queue_timeout fora da sobrecarga
+    controller.admit(waiting=9, slots=4)
+
+
+def test_rejects_when_estimated_delay_exceeds_wait():
+    controller = CoDelAdmissionController(target_ms=25, interval_ms=250)
+    controller.on_complete(0.1)
+    with pytest.raises(OverloadedError) as exc:
+        controller.admit(waiting=10, slots=4)
+    assert (exc.value.reason, exc.value.retry_after_sec) == ("queue_delay", 1)
+    controller.on_complete(2.5)  # EWMA: 0.1 + 0.05 × 2.4 = 0.22 s
+    with pytest.raises(OverloadedError) as exc:
+        controller.admit(waiting=9, slots=1)
+    # Retry-After = atraso estimado arredondado para cima: 10 × 0.22 s → 3 s
+    assert exc.value.retry_after_sec == 3
+    assert controller.get_stats()["rejected_queue_delay"] == 2
+
+
+def test_rejects_when_queue_is_full():
+    controller = CoDelAdmissionController(max_queue=2)
+    controller.admit(waiting=1, slots=1)
+    with pytest.raises(OverloadedError) as exc:
+        controller.admit(waiting=2, slots=1)
+    assert exc.value.reason == "queue_full"
+    assert controller.get_stats()["rejected_queue_full"] == 1
+
+
+def test_persistent_queue_enters_and_leaves_overload():
+    transitions = []
+    controller = CoDelAdmissionController(target_ms=1, interval_ms=10, on_state_change=transitions.append)
+    for sojourn in (0.005, 0.005, 0.0):
+        time.sleep(0.011)
+        controller.on_dequeue(sojourn)
+        if sojourn:
+            controller.on_dequeue(sojourn)
+    # 1º intervalo termina com mínimo 0 (boot); 2º todo acima do alvo → sobrecarga; 3º drena
+    assert transitions == [True, False]
+    assert controller.queue_timeout() == pytest.approx(0.01)
+    assert controller.get_stats()["overload_episodes"] == 1
+
+
+def test_full_lane_sheds_before_queueing():
+    release = threading.Event()
+    controller = CoDelAdmissionController(target_ms=25, interval_ms=250)
+    controller.on_complete(1.0)
+    adapter = ConcurrencyAdapter(num_threads=1, semaphore_slots=1, admission=controller)
+
+    async def scenario():
+        busy = asyncio.ensure_future(adapter.run_with_slot(lambda: release.wait(5)))
+        await asyncio.sleep(0.01)
+        with pytest.raises(OverloadedError) as exc:
+            await adapter.run_with_slot(lambda: True)
+        release.set()
+        await busy
+        return exc.value
+
+    error = asyncio.run(scenario())
+    assert (error.reason, error.retry_after_sec) == ("queue_delay", 1)
+    assert adapter.get_stats()["queue_depth"] == 0
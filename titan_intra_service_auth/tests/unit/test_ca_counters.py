@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Contadores de identidades mantidos por trigger (total / revogadas) e reconcile_counters."""
+
+import sqlite3
+
+import pytest
+
+from titan_intra_service_auth.infrastructure.ca import CARepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    # counters_max_age_sec=0: toda leitura relê identity_counters (vê escritas de outras conexões)
+    repository = CARepository(str(tmp_path / "ca.db"), pool_size=2, counters_max_age_sec=0)
+    yield repository
+    repository.close()
+
+
+def _register(repo, n, prefix="pem"):
+    return [repo.register(f"{prefix}-{i}")[0] for i in range(n)]
+
+
+def test_register_and_revoke_keep_counters(repo):
+    ids = _register(repo, 5)
+    assert repo.revoke(ids[0])
+    assert not repo.revoke(ids[0])
+    assert repo.count_identities(include_revoked=True) == 5
+    assert repo.count_identities() == 4
+    assert repo.count_revoked() == 1
+
+
+def test_register_many_counts_only_new_rows(repo):
+    repo.register_many([("pem-a", "access_root"), ("pem-b", "access_root")])
+    repo.register_many([("pem-a", "access_root"), ("pem-c", "access_root")])
+    assert repo.count_identities(include_revoked=True) == 3
+
+
+def test_triggers_track_writes_from_other_connections(repo, tmp_path):
+    ids = _register(repo, 4)
+    repo.revoke(ids[0])
+    # Outro processo (ex.: ca_server) escrevendo direto no arquivo
+    with sqlite3.connect(str(tmp_path / "ca.db")) as conn:
+        conn.execute("DELETE FROM identities WHERE identity_id = ?", (ids[0],))
+        conn.execute("DELETE FROM identities WHERE identity_id = ?", (ids[1],))
+        conn.execute("UPDATE identities SET revoked = 1 WHERE identity_id = ?", (ids[2],))
+    assert repo.get_counters() == {"total": 2, "revoked": 1}
+
+
+def test_reconcile_counters_repairs_drift(repo, tmp_path):
+    _register(repo, 3)
+    with sqlite3.connect(str(tmp_path / "ca.db")) as conn:
+        conn.execute("UPDATE identity_counters SET value = 10 WHERE name = 'total'")
+        conn.execute("UPDATE identity_counters SET value = -1 WHERE name = 'revoked'")
+    result = repo.reconcile_counters()
+    assert result == {"total": 3, "revoked": 0, "drift_total": 7, "drift_revoked": -1}
+    assert repo.get_counters() == {"total": 3, "revoked": 0}
+    assert repo.reconcile_counters()["drift_total"] == 0
+
+
+def test_counters_seeded_for_existing_database(tmp_path):
+    db_path = str(tmp_path / "ca.db")
+    first = CARepository(db_path, pool_size=1)
+    ids = _register(first, 3)
+    first.revoke(ids[1])
+    first.close()
+    # Banco anterior aos contadores: sem linhas em identity_counters → semeado por scan na abertura
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM identity_counters")
+    reopened = CARepository(db_path, pool_size=1, counters_max_age_sec=0)
+    assert reopened.get_counters() == {"total": 3, "revoked": 1}
+    reopened.close()
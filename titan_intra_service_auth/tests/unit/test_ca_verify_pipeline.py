@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Pipeline de verify: timeout vira 503 (VerifyTimeoutError) e o slot só volta quando a thread termina."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from titan_intra_service_auth.infrastructure.ca import CAVerifyPipeline, VerifyTimeoutError
+from titan_intra_service_auth.infrastructure.challenge_store import InMemoryChallengeStore
+from titan_intra_service_auth.infrastructure.http.routes.zkp_routes import register_zkp_routes
+from titan_intra_service_auth.infrastructure.zkp_metrics import ZKPMetricsStore
+
+
+class _SlowCA:
+    """CAService de teste: leituras presas até release; escrita leva write_sec."""
+
+    def __init__(self, write_sec=0.0):
+        self.release = threading.Event()
+        self.write_sec = write_sec
+        self.registered = []
+
+    def is_authorized(self, identity_id):
+        self.release.wait(5)
+        return True
+
+    def verify_signature(self, identity_id, nonce, signature_b64):
+        self.release.wait(5)
+        return True
+
+    def register_identity(self, pubkey_pem, scope="access_root"):
+        time.sleep(self.write_sec)
+        self.registered.append(pubkey_pem)
+        return "id-1", "fp-1"
+
+
+class _Metrics:
+    def __init__(self):
+        self.dropped = 0
+
+    def record_dropped_request(self):
+        self.dropped += 1
+
+    def record_mint_failure(self):
+        pass
+
+
+def _pipeline(ca, timeout_sec=0.05):
+    return CAVerifyPipeline(ca, num_threads=1, semaphore_slots=1, timeout_sec=timeout_sec)
+
+
+def _wait_idle(pipeline):
+    deadline = time.monotonic() + 5
+    while pipeline.get_stats()["slots_in_use"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pipeline.get_stats()["slots_in_use"] == 0
+
+
+def test_timeout_keeps_slot_until_thread_finishes():
+    ca = _SlowCA()
+    pipeline = _pipeline(ca)
+
+    async def scenario():
+        with pytest.raises(VerifyTimeoutError):
+            await pipeline.is_authorized("id-1")
+        # Quem esperava desistiu, a thread segue presa no CA: o slot continua ocupado
+        assert pipeline.get_stats()["slots_in_use"] == 1
+        with pytest.raises(VerifyTimeoutError):
+            await pipeline.verify_signature("id-1", "n", "s")
+        ca.release.set()
+        await asyncio.to_thread(_wait_idle, pipeline)
+        assert await pipeline.is_authorized("id-1")
+
+    asyncio.run(scenario())
+    stats = pipeline.get_stats()
+    assert (stats["timeouts"], stats["completed"]) == (2, 2)
+
+
+def test_started_write_runs_past_timeout():
+    ca = _SlowCA(write_sec=0.15)
+    pipeline = _pipeline(ca)
+    assert asyncio.run(pipeline.register_identity("pem")) == ("id-1", "fp-1")
+    assert pipeline.get_stats()["timeouts"] == 0
+
+
+def test_write_times_out_only_waiting_for_slot():
+    ca = _SlowCA()
+    pipeline = _pipeline(ca)
+
+    async def scenario():
+        with pytest.raises(VerifyTimeoutError):
+            await pipeline.is_authorized("id-1")
+        with pytest.raises(VerifyTimeoutError):
+            await pipeline.register_identity("pem")
+        ca.release.set()
+        await asyncio.to_thread(_wait_idle, pipeline)
+
+    asyncio.run(scenario())
+    assert ca.registered == []
+
+
+def test_routes_answer_503_without_freeing_the_slot():
+    ca = _SlowCA()
+    pipeline = _pipeline(ca)
+    metrics = _Metrics()
+    router = APIRouter()
+    register_zkp_routes(
+        router,
+        ca_service=ca,
+        verify_pipeline=pipeline,
+        challenge_store=InMemoryChallengeStore(),
+        mint_use_case=None,
+        metrics=metrics,
+        zkp_metrics=ZKPMetricsStore(),
+    )
+    app = FastAPI()
+    app.include_router(router)
+
+    with TestClient(app) as client:
+        response = client.get("/v6/zkp/challenge", params={"identity_id": "id-1"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert pipeline.get_stats()["slots_in_use"] == 1
+        # Slot ainda preso: o registro não consegue slot no prazo e também vira 503
+        assert client.post("/v6/zkp/identity", json={"pubkey_pem": "pem"}).status_code == 503
+        ca.release.set()
+        _wait_idle(pipeline)
+        assert client.post("/v6/zkp/identity", json={"pubkey_pem": "pem"}).status_code == 201
+    assert ca.registered == ["pem"]
+    assert metrics.dropped == 2
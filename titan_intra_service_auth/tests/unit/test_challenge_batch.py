@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Lote de challenges: teto de pendentes por identity (memória, SQLite, rotas) e nonces independentes."""
+
+import asyncio
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from titan_intra_service_auth.infrastructure.challenge_store import (
+    InMemoryChallengeStore,
+    SignedChallengeCodec,
+    SQLiteChallengeStore,
+    new_challenges,
+)
+from titan_intra_service_auth.infrastructure.http.routes.zkp_routes import register_zkp_routes
+from titan_intra_service_auth.infrastructure.zkp_metrics import ZKPMetricsStore
+
+
+def _put_many(store, identity_id, count, cap):
+    return asyncio.run(store.put_many(identity_id, new_challenges(count), cap))
+
+
+def test_new_challenges_are_unique():
+    challenges = new_challenges(64)
+    assert len({cid for cid, _ in challenges}) == len({nonce for _, nonce in challenges}) == 64
+    assert all(len(nonce) == 43 for _, nonce in challenges)
+
+
+def test_memory_store_caps_outstanding_per_identity():
+    store = InMemoryChallengeStore(ttl_sec=60)
+    challenges = new_challenges(5)
+    assert asyncio.run(store.put_many("id-1", challenges, 3)) == 3
+    assert _put_many(store, "id-1", 2, 3) == 0
+    assert _put_many(store, "id-2", 2, 3) == 2
+    # Challenge resgatado libera espaço; o lote gravado é o prefixo
+    assert asyncio.run(store.pop(challenges[0][0])) == ("id-1", challenges[0][1])
+    assert asyncio.run(store.pop(challenges[3][0])) is None
+    assert _put_many(store, "id-1", 2, 3) == 1
+    assert store.get_stats()["batch_capped"] == 3
+
+
+def test_sqlite_cap_holds_across_instances(tmp_path):
+    db_path = str(tmp_path / "challenges.db")
+    worker_1 = SQLiteChallengeStore(db_path, ttl_sec=60, num_threads=2)
+    worker_2 = SQLiteChallengeStore(db_path, ttl_sec=60, num_threads=2)
+
+    async def scenario():
+        return await asyncio.gather(*(worker.put_many("id-1", new_challenges(3), 4) for worker in (worker_1, worker_2)))
+
+    assert sorted(asyncio.run(scenario())) == [1, 3]
+    assert _put_many(worker_1, "id-1", 1, 4) == 0
+
+
+def test_signed_batch_challenges_are_independent():
+    codec = SignedChallengeCodec(b"k" * 32, ttl_sec=60)
+    challenges = codec.issue_many("id-1", 8)
+    assert len({cid for cid, _ in challenges}) == 8
+    assert all(asyncio.run(codec.verify(cid, "id-1", nonce)) for cid, nonce in challenges)
+
+
+class _AllowAll:
+    async def is_authorized(self, identity_id):
+        return True
+
+
+def test_routes_share_the_per_identity_cap():
+    router = APIRouter()
+    register_zkp_routes(
+        router,
+        ca_service=None,
+        verify_pipeline=_AllowAll(),
+        challenge_store=InMemoryChallengeStore(ttl_sec=60),
+        mint_use_case=None,
+        metrics=None,
+        zkp_metrics=ZKPMetricsStore(),
+        challenge_max_per_identity=3,
+    )
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    batch = client.get("/v6/zkp/challenge/batch", params={"identity_id": "id-1", "n": 2})
+    assert batch.json()["issued"] == 2
+    assert client.get("/v6/zkp/challenge", params={"identity_id": "id-1"}).status_code == 200
+    full = client.get("/v6/zkp/challenge", params={"identity_id": "id-1"})
+    assert full.status_code == 429 and full.headers["Retry-After"] == "1"
+    assert client.get("/v6/zkp/challenge/batch", params={"identity_id": "id-1", "n": 1}).status_code == 429
+    assert client.get("/v6/zkp/challenge", params={"identity_id": "id-2"}).status_code == 200
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Proofs de época: janela de skew, tamanho do random e replay (Bloom e guard SQLite)."""
+
+import asyncio
+
+from titan_intra_service_auth.infrastructure.challenge_store import EpochProofVerifier, SQLiteReplayGuard
+from titan_intra_service_auth.infrastructure.challenge_store.epoch_proof import epoch_proof_message
+
+RANDOM = "r" * 24
+
+
+def _mark(verifier, message, epoch):
+    return asyncio.run(verifier.mark_used(message, epoch))
+
+
+def test_message_within_skew_window():
+    verifier = EpochProofVerifier(epoch_sec=30, max_skew_epochs=1)
+    epoch = verifier.current_epoch()
+    for e in (epoch - 1, epoch, epoch + 1):
+        assert verifier.message_if_fresh("id-1", e, RANDOM) == epoch_proof_message("id-1", e, RANDOM)
+
+
+def test_message_outside_skew_window_is_expired():
+    verifier = EpochProofVerifier(epoch_sec=30, max_skew_epochs=1)
+    epoch = verifier.current_epoch()
+    assert verifier.message_if_fresh("id-1", epoch - 2, RANDOM) is None
+    assert verifier.message_if_fresh("id-1", epoch + 2, RANDOM) is None
+    assert verifier.get_stats()["rejected_skew"] == 2
+
+
+def test_random_length_is_bounded():
+    verifier = EpochProofVerifier(epoch_sec=30, max_skew_epochs=1)
+    epoch = verifier.current_epoch()
+    assert verifier.message_if_fresh("id-1", epoch, "short") is None
+    assert verifier.message_if_fresh("id-1", epoch, "x" * 129) is None
+    assert verifier.get_stats()["rejected_random"] == 2
+
+
+def test_message_has_domain_separation():
+    assert epoch_proof_message("id-1", 7, RANDOM) == f"titan-zkp-epoch-v1|id-1|7|{RANDOM}"
+
+
+def test_proof_is_accepted_once():
+    verifier = EpochProofVerifier(epoch_sec=30, max_skew_epochs=1)
+    epoch = verifier.current_epoch()
+    message = verifier.message_if_fresh("id-1", epoch, RANDOM)
+    assert _mark(verifier, message, epoch)
+    assert not _mark(verifier, message, epoch)
+    assert _mark(verifier, verifier.message_if_fresh("id-1", epoch, "s" * 24), epoch)
+    stats = verifier.get_stats()
+    assert (stats["accepted"], stats["rejected_replay"]) == (2, 1)
+
+
+def test_shared_guard_blocks_replay_on_another_worker(tmp_path):
+    db_path = str(tmp_path / "challenges.db")
+    worker_1 = EpochProofVerifier(epoch_sec=30, replay_filter=SQLiteReplayGuard(db_path))
+    worker_2 = EpochProofVerifier(epoch_sec=30, replay_filter=SQLiteReplayGuard(db_path))
+    epoch = worker_1.current_epoch()
+    message = worker_1.message_if_fresh("id-1", epoch, RANDOM)
+    assert _mark(worker_1, message, epoch)
+    assert not _mark(worker_2, message, epoch)
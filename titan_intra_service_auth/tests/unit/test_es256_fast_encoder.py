@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Encoder ES256 do fast path: verificável por PyJWT e com o mesmo header que jwt.encode."""
+
+import base64
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from titan_intra_service_auth.domain import TokenMintingDomainService
+from titan_intra_service_auth.infrastructure.crypto import EcdsaSignerAdapter, Es256JwsEncoder
+
+DECODE_OPTIONS = {"verify_aud": False}
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return ec.generate_private_key(ec.SECP256R1())
+
+
+def _payload():
+    service = TokenMintingDomainService(issuer="titan-test", exp_hours=1, default_scope="access_root")
+    return service.build_claim(user="svc-1", scope="access_root").to_jwt_payload()
+
+
+def _segment(token, index):
+    raw = token.split(".")[index]
+    return base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4))
+
+
+def test_token_verifies_with_pyjwt(private_key):
+    payload = _payload()
+    token = Es256JwsEncoder(private_key).encode(payload)
+    claims = jwt.decode(token, private_key.public_key(), algorithms=["ES256"], options=DECODE_OPTIONS)
+    assert claims == jwt.decode(
+        jwt.encode(payload, private_key, algorithm="ES256"),
+        private_key.public_key(),
+        algorithms=["ES256"],
+        options=DECODE_OPTIONS,
+    )
+    assert (claims["sub"], claims["iss"]) == ("svc-1", "titan-test")
+    # Assinatura JWS: r||s crus de 32 bytes cada, não DER
+    assert len(_segment(token, 2)) == 64
+
+
+def test_header_is_identical_to_pyjwt(private_key):
+    payload = _payload()
+    fast = Es256JwsEncoder(private_key).encode(payload)
+    slow = jwt.encode(payload, private_key, algorithm="ES256")
+    assert fast.split(".")[0] == slow.split(".")[0]
+    assert jwt.get_unverified_header(fast) == {"alg": "ES256", "typ": "JWT"}
+
+
+def test_rejects_non_p256_key():
+    with pytest.raises(ValueError):
+        Es256JwsEncoder(ec.generate_private_key(ec.SECP384R1()))
+
+
+def test_signer_fast_and_pyjwt_paths_verify_with_public_key():
+    for fast_path in (True, False):
+        signer = EcdsaSignerAdapter(fast_path=fast_path)
+        token = signer.sign(_payload())
+        assert jwt.decode(token, signer.public_key_pem, algorithms=["ES256"], options=DECODE_OPTIONS)["sub"] == "svc-1"
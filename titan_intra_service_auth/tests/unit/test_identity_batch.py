@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Registro em lote: PEM inválido ou duplicado falha só o próprio item; a transação não tem prazo."""
+
+import asyncio
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from titan_intra_service_auth.infrastructure.ca import CARepository, CAService, CAVerifyPipeline
+from titan_intra_service_auth.infrastructure.ca.identity_batch import register_identities_batch
+
+
+def _pem():
+    return (
+        ec.generate_private_key(ec.SECP256R1())
+        .public_key()
+        .public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+        .decode()
+    )
+
+
+@pytest.fixture
+def ca(tmp_path):
+    repository = CARepository(str(tmp_path / "ca.db"), pool_size=2)
+    yield CAService(repository=repository)
+    repository.close()
+
+
+async def _inline(fn):
+    return fn()
+
+
+def test_results_per_item_in_input_order(ca):
+    registered, fresh_a, fresh_b = _pem(), _pem(), _pem()
+    ca.register_identity(registered)
+    entries = [
+        (fresh_a, "access_root"),
+        ("not a pem", "access_root"),
+        (fresh_a, "access_root"),  # repetido dentro do lote
+        (fresh_b, "svc"),
+        (registered, "access_root"),  # já estava no CA
+    ]
+    results = asyncio.run(register_identities_batch(ca, entries, _inline, chunk_size=2))
+    assert ["error" in r for r in results] == [False, True, True, False, True]
+    assert results[1]["error"].startswith("Pubkey inválida")
+    assert "já registrada" in results[2]["error"] and "já registrada" in results[4]["error"]
+    assert results[3]["scope"] == "svc"
+    assert ca.is_authorized(results[0]["identity_id"]) and ca.is_authorized(results[3]["identity_id"])
+
+
+def test_validation_runs_in_chunks(ca):
+    calls = []
+
+    async def run(fn):
+        calls.append(fn)
+        return fn()
+
+    entries = [(_pem(), "access_root") for _ in range(5)]
+    results = asyncio.run(register_identities_batch(ca, entries, run, chunk_size=2))
+    # 3 fatias de validação + a transação
+    assert len(calls) == 4
+    assert not any("error" in r for r in results)
+
+
+class _SlowWriteCA(CAService):
+    def register_identities(self, entries, errors=None):
+        time.sleep(0.15)
+        return super().register_identities(entries, errors)
+
+
+def test_started_batch_write_is_not_timed_out(tmp_path):
+    repository = CARepository(str(tmp_path / "ca.db"), pool_size=2)
+    pipeline = CAVerifyPipeline(_SlowWriteCA(repository=repository), num_threads=2, timeout_sec=0.05)
+    results = asyncio.run(pipeline.register_identities([(_pem(), "access_root")]))
+    assert "identity_id" in results[0]
+    assert pipeline.get_stats()["timeouts"] == 0
+    assert repository.count_identities() == 1
+    repository.close()
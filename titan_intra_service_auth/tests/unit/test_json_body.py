@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Corpo JSON das rotas quentes: teto de bytes (413) e decode tipado para dataclass (422)."""
+
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from titan_intra_service_auth.infrastructure.http.json_body import BodyDecodeError, decode, decode_object, read_body
+from titan_intra_service_auth.infrastructure.http.schemas import AuthMintBody, ZKPMintBody
+
+MINT = b'{"identity_id": "id-1", "nonce": "n", "signature": "s"}'
+
+
+def _request(chunks, content_length=None):
+    headers = [] if content_length is None else [(b"content-length", str(content_length).encode())]
+    messages = [{"type": "http.request", "body": c, "more_body": i < len(chunks) - 1} for i, c in enumerate(chunks)]
+
+    async def receive():
+        return messages.pop(0)
+
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers}, receive)
+
+
+def _read(chunks, max_bytes, content_length=None):
+    return asyncio.run(read_body(_request(chunks, content_length), max_bytes))
+
+
+def test_decode_required_and_default_fields():
+    body = decode(MINT, ZKPMintBody)
+    assert (body.identity_id, body.nonce, body.signature) == ("id-1", "n", "s")
+    assert (body.challenge_id, body.epoch, body.scope) == (None, None, "access_root")
+
+
+def test_decode_null_means_absent():
+    body = decode(b'{"user": null, "scope": "s"}', AuthMintBody)
+    assert (body.user, body.scope, body.entropy) == ("guest_user", "s", None)
+
+
+@pytest.mark.parametrize(
+    "raw, detail",
+    [
+        (b"{not json", "JSON inválido"),
+        (b"[1, 2]", "Esperado um objeto JSON"),
+        (b'{"nonce": "n", "signature": "s"}', "identity_id é obrigatório"),
+        (b'{"identity_id": 1, "nonce": "n", "signature": "s"}', "identity_id deve ser str"),
+        # bool é subclasse de int, mas não vale como época
+        (b'{"identity_id": "i", "nonce": "n", "signature": "s", "epoch": true}', "epoch deve ser int"),
+        (b'{"identity_id": "i", "nonce": "n", "signature": "s", "epoch": "7"}', "epoch deve ser int"),
+    ],
+)
+def test_decode_rejects_with_422(raw, detail):
+    with pytest.raises(BodyDecodeError) as exc:
+        decode(raw, ZKPMintBody)
+    assert exc.value.status_code == 422
+    assert str(exc.value) == detail
+
+
+def test_decode_object_for_batch_items():
+    assert decode_object({"user": "svc"}, AuthMintBody).user == "svc"
+    with pytest.raises(BodyDecodeError):
+        decode_object("svc", AuthMintBody)
+
+
+def test_read_body_joins_chunks_within_limit():
+    assert _read([MINT[:10], MINT[10:]], max_bytes=len(MINT)) == MINT
+
+
+def test_read_body_rejects_declared_length_over_limit():
+    with pytest.raises(BodyDecodeError) as exc:
+        _read([MINT], max_bytes=16, content_length=len(MINT))
+    assert exc.value.status_code == 413
+
+
+def test_read_body_rejects_streamed_body_over_limit():
+    # Sem Content-Length (chunked): corta ao passar do teto
+    with pytest.raises(BodyDecodeError) as exc:
+        _read([b"x" * 10, b"x" * 10, b"x" * 10], max_bytes=16)
+    assert exc.value.status_code == 413
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Histogramas de latência: buckets log-lineares, percentis e merge (threads / workers)."""
+
+import pytest
+
+from titan_intra_service_auth.infrastructure.observability.latency_histogram import (
+    MAX_TRACKABLE_US,
+    NUM_BUCKETS,
+    LatencyHistogram,
+    WindowedLatencyHistogram,
+    bucket_index,
+    bucket_midpoint_us,
+)
+
+
+def _histogram(values_us):
+    hist = LatencyHistogram()
+    for v in values_us:
+        hist.record_us(v)
+    return hist
+
+
+def test_small_values_have_exact_buckets():
+    for v in range(64):
+        assert bucket_midpoint_us(bucket_index(v)) == v
+
+
+def test_bucket_index_is_monotonic_and_bounded():
+    previous = 0
+    for v in range(0, 2_000_000, 97):
+        idx = bucket_index(v)
+        assert previous <= idx < NUM_BUCKETS
+        previous = idx
+    assert bucket_index(MAX_TRACKABLE_US * 10) == bucket_index(MAX_TRACKABLE_US) < NUM_BUCKETS
+
+
+@pytest.mark.parametrize("value_us", [64, 100, 1_000, 12_345, 250_000, 5_000_000, MAX_TRACKABLE_US])
+def test_midpoint_relative_error_within_bound(value_us):
+    mid = bucket_midpoint_us(bucket_index(value_us))
+    assert abs(mid - value_us) / value_us <= 1 / 32
+
+
+def test_percentiles_of_uniform_distribution():
+    hist = _histogram(range(1, 10_001))
+    p50, p90, p99, p999 = hist.percentiles_us()
+    assert p50 == pytest.approx(5_000, rel=0.02)
+    assert p90 == pytest.approx(9_000, rel=0.02)
+    assert p99 == pytest.approx(9_900, rel=0.02)
+    assert p999 <= hist.max_us == 10_000
+
+
+def test_percentile_never_exceeds_recorded_max():
+    hist = _histogram([1_000] * 99 + [70_000])
+    assert hist.percentiles_us([100.0]) == [70_000.0]
+    assert hist.percentiles_us([50.0])[0] == pytest.approx(1_000, rel=0.02)
+
+
+def test_empty_histogram_summary():
+    hist = LatencyHistogram()
+    assert hist.percentiles_us() == [0.0, 0.0, 0.0, 0.0]
+    assert hist.summary_ms() == {"count": 0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "p99_9": 0.0, "avg": 0.0, "max": 0.0}
+
+
+def test_merge_equals_recording_everything_in_one_histogram():
+    a_values = list(range(10, 5_000, 7))
+    b_values = list(range(3_000, 90_000, 113))
+    merged = _histogram(a_values).merge(_histogram(b_values))
+    single = _histogram(a_values + b_values)
+    assert list(merged.counts) == list(single.counts)
+    assert (merged.total, merged.sum_us, merged.max_us) == (single.total, single.sum_us, single.max_us)
+    assert merged.percentiles_us() == single.percentiles_us()
+
+
+def test_merge_counts_from_serialized_buckets():
+    source = _histogram(range(50, 200_000, 331))
+    target = LatencyHistogram()
+    target.merge_counts(source.to_bytes())
+    assert list(target.counts) == list(source.counts)
+    assert target.total == source.total
+    # Soma e máximo derivados dos pontos médios: aproximados, dentro do erro do bucket
+    assert target.sum_us == pytest.approx(source.sum_us, rel=1 / 32)
+    assert target.max_us == pytest.approx(source.max_us, rel=1 / 32)
+    assert target.percentiles_us([50.0, 99.0]) == pytest.approx(source.percentiles_us([50.0, 99.0]), rel=1 / 32)
+
+
+def test_merge_counts_accumulates_across_workers():
+    target = LatencyHistogram()
+    for _ in range(3):
+        target.merge_counts(_histogram([1_000, 2_000]).to_bytes())
+    assert target.total == 6
+    assert target.counts[bucket_index(1_000)] == 3
+
+
+def _window_total(windowed, window_sec, now):
+    return sum(hist.total for hist in windowed.window_slices(window_sec, now))
+
+
+@pytest.mark.parametrize("window_sec", [10, 60])
+def test_window_covers_at_least_its_length(window_sec):
+    windowed = WindowedLatencyHistogram()
+    windowed.record_ms(1.0, now=1000.0)
+    # Qualquer ponto da fatia corrente: a amostra de window_sec atrás ainda conta
+    for elapsed in (0.0, window_sec - 0.1, window_sec):
+        assert _window_total(windowed, window_sec, 1000.0 + elapsed) == 1
+    # Fatias inteiras: passa de janela + 5 s, sai
+    assert _window_total(windowed, window_sec, 1000.0 + window_sec + 5.0) == 0
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Store de challenges em memória: TTL real, sweep em lotes e descarte do mais antigo acima do teto."""
+
+import asyncio
+import time
+
+from titan_intra_service_auth.infrastructure.challenge_store import InMemoryChallengeStore
+
+
+def _put(store, *challenge_ids):
+    for challenge_id in challenge_ids:
+        asyncio.run(store.put(challenge_id, "id-1", f"n-{challenge_id}"))
+
+
+def _pop(store, challenge_id):
+    return asyncio.run(store.pop(challenge_id))
+
+
+def test_challenge_is_redeemed_once():
+    store = InMemoryChallengeStore(ttl_sec=60)
+    _put(store, "c-1")
+    assert _pop(store, "c-1") == ("id-1", "n-c-1")
+    assert _pop(store, "c-1") is None
+
+
+def test_expired_challenge_is_not_returned():
+    store = InMemoryChallengeStore(ttl_sec=0.05)
+    _put(store, "c-1")
+    time.sleep(0.06)
+    assert _pop(store, "c-1") is None
+    assert store.get_stats()["expired"] == 1
+
+
+def test_sweep_removes_only_expired():
+    store = InMemoryChallengeStore(ttl_sec=0.05)
+    _put(store, "old-1", "old-2")
+    time.sleep(0.06)
+    _put(store, "live")
+    # put() já drena a cabeça expirada; o sweep não acha mais nada
+    assert asyncio.run(store.sweep_expired()) == 0
+    stats = store.get_stats()
+    assert (stats["size"], stats["expired"]) == (1, 2)
+    assert _pop(store, "live") == ("id-1", "n-live")
+
+
+def test_over_capacity_evicts_oldest():
+    store = InMemoryChallengeStore(max_challenges=3, ttl_sec=60)
+    _put(store, "c-0", "c-1", "c-2", "c-3", "c-4")
+    assert _pop(store, "c-0") is None
+    assert _pop(store, "c-1") is None
+    assert _pop(store, "c-4") == ("id-1", "n-c-4")
+    stats = store.get_stats()
+    assert (stats["size"], stats["evicted_under_pressure"]) == (2, 2)
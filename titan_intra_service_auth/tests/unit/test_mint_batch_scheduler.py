@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Micro-batching do mint: toda future resolve — com token, com o erro do próprio item ou do lote."""
+
+import asyncio
+
+from titan_intra_service_auth.application.ports.concurrency_port import ConcurrencyPort
+from titan_intra_service_auth.application.ports.crypto_port import CryptoPort
+from titan_intra_service_auth.infrastructure.observability import ConcurrencyAdapter, MintBatchScheduler
+
+
+class _Crypto(CryptoPort):
+    """Token = "tok-<i>"; bad_items falham em sign(); fail_batch derruba sign_many."""
+
+    def __init__(self, bad_items=(), fail_batch=False):
+        self.bad_items = set(bad_items)
+        self.fail_batch = fail_batch
+        self.signed = []
+
+    def sign(self, payload):
+        if payload["i"] in self.bad_items:
+            raise ValueError(f"bad payload {payload['i']}")
+        self.signed.append(payload["i"])
+        return f"tok-{payload['i']}"
+
+    def sign_many(self, payloads):
+        if self.fail_batch:
+            raise RuntimeError("batch failed")
+        return super().sign_many(payloads)
+
+
+class _FailingConcurrency(ConcurrencyPort):
+    async def run_with_slot(self, fn):
+        raise RuntimeError("no slot")
+
+
+def _submit_all(scheduler, count):
+    async def scenario():
+        return await asyncio.gather(
+            *(scheduler.submit({"i": i}) for i in range(count)),
+            return_exceptions=True,
+        )
+
+    return asyncio.run(scenario())
+
+
+def test_every_future_gets_its_own_token():
+    scheduler = MintBatchScheduler(_Crypto(), ConcurrencyAdapter(num_threads=2), max_batch_size=4, max_delay_us=200)
+    assert _submit_all(scheduler, 10) == [f"tok-{i}" for i in range(10)]
+    stats = scheduler.get_stats()
+    # 4 + 4 cheios, os 2 restantes saem pelo timer
+    assert (stats["items"], stats["batches"], stats["flush_full"], stats["flush_timer"]) == (10, 3, 2, 1)
+    assert stats["pending"] == stats["failures"] == 0
+
+
+def test_failing_item_fails_only_its_future():
+    crypto = _Crypto(bad_items={2}, fail_batch=True)
+    scheduler = MintBatchScheduler(crypto, ConcurrencyAdapter(num_threads=2), max_batch_size=4)
+    results = _submit_all(scheduler, 4)
+    assert [r for i, r in enumerate(results) if i != 2] == ["tok-0", "tok-1", "tok-3"]
+    assert isinstance(results[2], ValueError)
+    assert scheduler.get_stats()["failures"] == 1
+
+
+def test_slot_failure_fails_the_whole_batch():
+    scheduler = MintBatchScheduler(_Crypto(), _FailingConcurrency(), max_batch_size=3)
+    results = _submit_all(scheduler, 3)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert scheduler.get_stats()["failures"] == 3
+
+
+def test_cancelled_submit_is_not_signed():
+    crypto = _Crypto()
+    scheduler = MintBatchScheduler(crypto, ConcurrencyAdapter(num_threads=1), max_batch_size=8, max_delay_us=1000)
+
+    async def scenario():
+        gone = asyncio.ensure_future(scheduler.submit({"i": 0}))
+        kept = asyncio.ensure_future(scheduler.submit({"i": 1}))
+        await asyncio.sleep(0)
+        gone.cancel()
+        return await kept
+
+    assert asyncio.run(scenario()) == "tok-1"
+    assert crypto.signed == [1]
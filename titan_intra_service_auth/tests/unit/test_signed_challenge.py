@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Challenges assinados (HMAC): autenticidade, prazo e replay — com Bloom e com o guard SQLite."""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import time
+
+from titan_intra_service_auth.infrastructure.challenge_store import SQLiteReplayGuard, SignedChallengeCodec
+
+SECRET = b"k" * 32
+
+
+def _verify(codec, challenge_id, identity_id, nonce):
+    return asyncio.run(codec.verify(challenge_id, identity_id, nonce))
+
+
+def test_issued_challenge_verifies_once():
+    codec = SignedChallengeCodec(SECRET, ttl_sec=60)
+    challenge_id, nonce = codec.issue("id-1")
+    assert SignedChallengeCodec.is_signed(challenge_id)
+    assert _verify(codec, challenge_id, "id-1", nonce)
+    assert not _verify(codec, challenge_id, "id-1", nonce)
+    stats = codec.get_stats()
+    assert (stats["accepted"], stats["rejected_replay"]) == (1, 1)
+
+
+def test_rejects_other_identity_nonce_or_secret():
+    codec = SignedChallengeCodec(SECRET, ttl_sec=60)
+    challenge_id, nonce = codec.issue("id-1")
+    assert not _verify(codec, challenge_id, "id-2", nonce)
+    assert not _verify(codec, challenge_id, "id-1", nonce + "x")
+    assert not _verify(SignedChallengeCodec(b"o" * 32, ttl_sec=60), challenge_id, "id-1", nonce)
+    assert not _verify(codec, "s1.garbage", "id-1", nonce)
+    assert codec.get_stats()["rejected_mac"] == 3
+    # Rejeições não consomem o challenge
+    assert _verify(codec, challenge_id, "id-1", nonce)
+
+
+def test_expired_challenge_is_rejected():
+    codec = SignedChallengeCodec(SECRET, ttl_sec=0)
+    challenge_id, nonce = codec.issue("id-1")
+    assert not _verify(codec, challenge_id, "id-1", nonce)
+    assert codec.get_stats()["rejected_expired"] == 1
+
+
+def test_exp_beyond_ttl_is_rejected():
+    # Mac válido para um exp que o servidor nunca emitiria (segredo vazado / relógio adiantado)
+    codec = SignedChallengeCodec(SECRET, ttl_sec=60)
+    exp = int(time.time()) + 3600
+    mac = hmac.new(SECRET, f"id-1|nonce|{exp}".encode(), hashlib.sha256).digest()
+    challenge_id = f"s1.{exp}.{base64.urlsafe_b64encode(mac).decode().rstrip('=')}"
+    assert not _verify(codec, challenge_id, "id-1", "nonce")
+    assert codec.get_stats()["rejected_expired"] == 1
+
+
+def test_shared_guard_blocks_replay_on_another_worker(tmp_path):
+    # Dois codecs = dois workers com o mesmo segredo e o mesmo arquivo de guard
+    db_path = str(tmp_path / "challenges.db")
+    worker_1 = SignedChallengeCodec(SECRET, ttl_sec=60, replay_filter=SQLiteReplayGuard(db_path))
+    worker_2 = SignedChallengeCodec(SECRET, ttl_sec=60, replay_filter=SQLiteReplayGuard(db_path))
+    challenge_id, nonce = worker_1.issue("id-1")
+    assert _verify(worker_1, challenge_id, "id-1", nonce)
+    assert not _verify(worker_2, challenge_id, "id-1", nonce)
+    assert worker_2.get_stats()["replay_filter"]["replays_blocked"] == 1
+
+
+def test_shared_guard_sweeps_only_expired_keys(tmp_path):
+    guard = SQLiteReplayGuard(str(tmp_path / "challenges.db"))
+    now = time.time()
+    assert guard.add_if_absent(b"old", now - 1)
+    assert guard.add_if_absent(b"live", now + 60)
+    assert asyncio.run(guard.sweep_expired()) == 1
+    assert not guard.add_if_absent(b"live", now + 60)
+    assert guard.add_if_absent(b"old", now + 60)
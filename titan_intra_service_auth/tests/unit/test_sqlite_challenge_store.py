@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Store SQLite de challenges: pop-once entre instâncias (um por worker) sobre o mesmo arquivo."""
+
+import asyncio
+import time
+
+import pytest
+
+from titan_intra_service_auth.infrastructure.challenge_store import SQLiteChallengeStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "challenges.db")
+
+
+def test_pop_returns_challenge_once_across_instances(db_path):
+    worker_1 = SQLiteChallengeStore(db_path, num_threads=2)
+    worker_2 = SQLiteChallengeStore(db_path, num_threads=2)
+
+    async def scenario():
+        await worker_1.put("c-1", "id-1", "n-1")
+        return await asyncio.gather(worker_1.pop("c-1"), worker_2.pop("c-1"))
+
+    assert sorted(asyncio.run(scenario()), key=lambda r: r is None) == [("id-1", "n-1"), None]
+
+
+def test_concurrent_pops_redeem_each_challenge_once(db_path):
+    workers = [SQLiteChallengeStore(db_path, num_threads=4) for _ in range(2)]
+    challenge_ids = [f"c-{i}" for i in range(50)]
+
+    async def scenario():
+        await asyncio.gather(*(workers[i % 2].put(cid, "id-1", cid) for i, cid in enumerate(challenge_ids)))
+        return await asyncio.gather(*(worker.pop(cid) for cid in challenge_ids for worker in workers))
+
+    hits = [result for result in asyncio.run(scenario()) if result is not None]
+    assert sorted(nonce for _, nonce in hits) == sorted(challenge_ids)
+    stats = [worker.get_stats() for worker in workers]
+    assert sum(s["pops_hit"] for s in stats) == 50
+    assert sum(s["pops_miss"] for s in stats) == 50
+
+
+def test_unknown_challenge_is_a_miss(db_path):
+    store = SQLiteChallengeStore(db_path, num_threads=1)
+    assert asyncio.run(store.pop("missing")) is None
+    assert store.get_stats()["pops_miss"] == 1
+
+
+def test_expired_challenge_is_not_returned(db_path):
+    store = SQLiteChallengeStore(db_path, ttl_sec=0.05, num_threads=1)
+    asyncio.run(store.put("c-1", "id-1", "n-1"))
+    time.sleep(0.06)
+    assert asyncio.run(store.pop("c-1")) is None
+    assert store.get_stats()["expired"] == 1
+
+
+def test_sweep_removes_expired_and_keeps_size(db_path):
+    store = SQLiteChallengeStore(db_path, ttl_sec=0.05, num_threads=1)
+    for challenge_id in ("old-1", "old-2"):
+        asyncio.run(store.put(challenge_id, "id-1", "n"))
+    time.sleep(0.06)
+    live = SQLiteChallengeStore(db_path, ttl_sec=60, num_threads=1)
+    asyncio.run(live.put("live", "id-1", "n"))
+    assert asyncio.run(store.sweep_expired()) == 2
+    # Tamanho vem do contador mantido por trigger, visto igual por qualquer instância
+    assert store.get_stats()["size"] == live.get_stats()["size"] == 1
+    assert asyncio.run(store.pop("live")) == ("id-1", "n")
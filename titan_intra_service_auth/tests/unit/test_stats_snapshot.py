@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Snapshot do stats: ETag por geração, rebuild do job fora do event loop e pausa sem leitores."""
+
+import asyncio
+import json
+import threading
+
+from titan_intra_service_auth.infrastructure.observability import CachedStatsSnapshot
+
+
+def _snapshot(interval=1.0):
+    threads = []
+
+    def build():
+        threads.append(threading.get_ident())
+        return {"builds": len(threads)}
+
+    return CachedStatsSnapshot(build, refresh_interval_sec=interval), threads
+
+
+def test_get_reuses_body_until_next_generation():
+    snapshot, _ = _snapshot()
+    body, etag = snapshot.get()
+    assert json.loads(body) == {"builds": 1}
+    assert snapshot.get() == (body, etag)
+    asyncio.run(snapshot.refresh())
+    new_body, new_etag = snapshot.get()
+    assert json.loads(new_body) == {"builds": 2} and new_etag != etag
+
+
+def test_refresh_builds_off_the_event_loop_thread():
+    snapshot, threads = _snapshot()
+    snapshot.get()
+
+    async def refresh():
+        await snapshot.refresh()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(refresh())
+    assert threads[-1] != loop_thread
+
+
+def test_refresh_pauses_without_readers():
+    snapshot, threads = _snapshot(interval=0.0)
+    asyncio.run(snapshot.refresh())
+    assert threads == []
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Cache de reuso de token: hit dentro dos limites e miss depois de revogação (local ou de outro processo)."""
+
+import time
+
+import pytest
+
+from titan_intra_service_auth.infrastructure.ca import CARepository
+from titan_intra_service_auth.infrastructure.crypto import TokenReuseCache
+
+
+def _exp(seconds):
+    return int(time.time()) + seconds
+
+
+def _store(cache, subject, scope="access_root", token="tok", exp_in=7200):
+    cache.store(subject, scope, token, _exp(exp_in), cache.generation())
+
+
+def test_hit_returns_token_and_remaining_lifetime():
+    cache = TokenReuseCache(max_age_sec=60, min_remaining_sec=3600)
+    _store(cache, "id-1")
+    token, remaining = cache.lookup("id-1", "access_root")
+    assert token == "tok" and 7190 <= remaining <= 7200
+    assert cache.lookup("id-1", "other") is None
+    assert (cache.get_stats()["hits"], cache.get_stats()["misses"]) == (1, 1)
+
+
+def test_token_near_expiry_or_too_old_is_not_reused():
+    cache = TokenReuseCache(max_age_sec=0.05, min_remaining_sec=3600)
+    _store(cache, "near-exp", exp_in=1800)
+    assert cache.lookup("near-exp", "access_root") is None
+    _store(cache, "old")
+    time.sleep(0.06)
+    assert cache.lookup("old", "access_root") is None
+    assert cache.get_stats()["expirations"] == 2
+
+
+def test_store_after_invalidation_is_dropped():
+    cache = TokenReuseCache()
+    generation = cache.generation()  # lido antes de assinar
+    cache.invalidate_subject("id-1")  # revogação durante a assinatura
+    cache.store("id-1", "access_root", "tok", _exp(7200), generation)
+    assert cache.lookup("id-1", "access_root") is None
+    assert cache.get_stats()["stale_stores"] == 1
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repository = CARepository(str(tmp_path / "ca.db"), pool_size=2)
+    yield repository
+    repository.close()
+
+
+def _wired_cache(repo):
+    # Mesma ligação do fastapi_app: listener de revogação do CARepository
+    cache = TokenReuseCache()
+    repo.add_revocation_listener(cache.invalidate_subject)
+    return cache
+
+
+def test_miss_after_revocation_in_this_process(repo):
+    cache = _wired_cache(repo)
+    identity_id, _ = repo.register("pem-1")
+    for scope in ("access_root", "svc"):
+        _store(cache, identity_id, scope)
+    assert repo.revoke(identity_id)
+    assert cache.lookup(identity_id, "access_root") is None
+    assert cache.lookup(identity_id, "svc") is None
+    assert cache.get_stats()["invalidations"] == 2
+
+
+def test_miss_after_revocation_by_another_process(repo, tmp_path):
+    cache = _wired_cache(repo)
+    identity_id, _ = repo.register("pem-1")
+    _store(cache, identity_id)
+    # Outro worker / ca_server revoga no mesmo arquivo; este processo só vê no poll
+    other = CARepository(str(tmp_path / "ca.db"), pool_size=1)
+    assert other.revoke(identity_id)
+    other.close()
+    assert cache.lookup(identity_id, "access_root") is not None
+    assert repo.poll_revocations() == [identity_id]
+    assert cache.lookup(identity_id, "access_root") is None